@@ -5,6 +5,8 @@ NapCat-QCE Python SDK 基本用法示例
 演示如何使用 SDK 进行基本操作。
 """
 
+from itertools import islice
+
 from napcat_qce import connect, ChatType
 
 
@@ -16,27 +18,28 @@ def main():
         print("无法连接到 NapCat-QCE 服务器")
         return
 
-    # 获取系统信息
-    info = client.system.get_info()
+    # 并行获取系统信息、群组和好友列表
+    bootstrap = client.prefetch_bootstrap()
+    info = bootstrap.info
     print(f"已登录: {info.self_nick} ({info.self_uin})")
 
     # 获取群组列表
     print("\n群组列表:")
-    for group in client.groups.get_all()[:5]:
+    for group in bootstrap.groups[:5]:
         print(f"  {group.group_name} ({group.group_code}) - {group.member_count}人")
 
     # 获取好友列表
     print("\n好友列表:")
-    for friend in client.friends.get_all()[:5]:
+    for friend in bootstrap.friends[:5]:
         name = friend.remark or friend.nick
         print(f"  {name} ({friend.uin})")
 
     # 获取最近消息
-    groups = client.groups.get_all()
+    groups = bootstrap.groups
     if groups:
         print(f"\n[{groups[0].group_name}] 最近消息:")
-        result = client.messages.fetch(ChatType.GROUP, groups[0].group_code, limit=3)
-        for msg in result["messages"]:
+        messages = client.messages.iter(ChatType.GROUP, groups[0].group_code, page_size=3)
+        for msg in islice(messages, 3):
             sender = msg.sender_member_name or msg.sender_name or "未知"
             print(f"  [{sender}]: (ID: {msg.msg_id})")
 
@@ -45,15 +45,18 @@ def example_batch_export():
         print("无法连接到服务器")
         return
 
-    info = client.system.get_info()
+    # 并行预取，好友列表会被缓存，供 batch_export 解析 QQ 号时使用
+    bootstrap = client.prefetch_bootstrap()
+    info = bootstrap.info
     print(f"已登录: {info.self_nick} ({info.self_uin})")
 
-    # 构建目标列表
+    # 构建目标列表（只解析配置中的号码对应的名称）
+    names = client.resolve_names(GROUP_IDS + FRIEND_IDS)
     targets = []
     for gid in GROUP_IDS:
-        targets.append({"type": "group", "id": gid})
+        targets.append({"type": "group", "id": gid, "name": names.get(gid, (None,))[0]})
     for fid in FRIEND_IDS:
-        targets.append({"type": "friend", "id": fid})
+        targets.append({"type": "friend", "id": fid, "name": names.get(fid, (None,))[0]})
 
     if not targets:
         print("请先配置 GROUP_IDS 或 FRIEND_IDS")
@@ -121,12 +124,12 @@ def interactive_export():
         print("无法连接")
         return
 
-    info = client.system.get_info()
-    print(f"已连接: {info.self_nick}")
+    bootstrap = client.prefetch_bootstrap()
+    print(f"已连接: {bootstrap.info.self_nick}")
 
     # 显示列表
-    groups = client.groups.get_all()
-    friends = client.friends.get_all()
+    groups = bootstrap.groups
+    friends = bootstrap.friends
 
     print(f"\n群组 ({len(groups)} 个):")
     for i, g in enumerate(groups[:10], 1):
@@ -141,26 +144,33 @@ def interactive_export():
     days = int(input("最近多少天 (默认7): ").strip() or "7")
     fmt = input("格式 (HTML/JSON/TXT/EXCEL, 默认HTML): ").strip().upper() or "HTML"
 
-    # 构建目标
+    # 构建目标（复用上面已获取的列表，直接带上会话名称）
     if ids_input:
-        target_ids = [id.strip() for id in ids_input.split(",")]
-        group_codes = {g.group_code for g in groups}
+        # 去掉空项和重复项（如 "a,,b,a"）
+        raw_ids = [id.strip() for id in ids_input.split(",")]
+        target_ids = list(dict.fromkeys(id for id in raw_ids if id))
+        skipped = len([id for id in raw_ids if id]) - len(target_ids)
+        if skipped:
+            print(f"已忽略 {skipped} 个重复的号码")
+        group_names = {g.group_code: g.group_name for g in groups}
+        friend_names = {f.uin: f.remark or f.nick for f in friends}
         targets = []
         for tid in target_ids:
-            if tid in group_codes:
-                targets.append({"type": "group", "id": tid})
+            if tid in group_names:
+                targets.append({"type": "group", "id": tid, "name": group_names[tid]})
             else:
-                targets.append({"type": "friend", "id": tid})
+                targets.append({"type": "friend", "id": tid, "name": friend_names.get(tid)})
     else:
-        targets = [{"type": "group", "id": g.group_code} for g in groups]
+        targets = [{"type": "group", "id": g.group_code, "name": g.group_name} for g in groups]
 
-    # 导出
+    # 导出（传入好友列表，避免再次获取）
     results = client.batch_export(
         targets=targets,
         format=fmt,
         days=days,
         on_progress=lambda id, task: print(f"  {task.session_name}: {task.message_count} 条"),
         on_error=lambda id, e: print(f"  {id}: 失败 - {e}"),
+        friends=friends,
     )
 
     print(f"\n完成! 成功: {results['success']}, 失败: {results['failed']}")
@@ -5,7 +5,7 @@ NapCat-QCE Python SDK 导出聊天记录示例
 演示如何导出聊天记录到各种格式。
 """
 
-from napcat_qce import connect, MessageFilter, ExportOptions
+from napcat_qce import connect, ChatType, MessageFilter, ExportOptions, ProgressPrinter
 
 
 def main():
@@ -28,51 +28,41 @@ def main():
         group = groups[0]
         print(f"\n使用群组: {group.group_name}")
 
-        # 演示1: 基本导出
-        print("\n" + "=" * 40)
-        print("演示1: 基本导出")
-        print("=" * 40)
-        task = client.export_group(group.group_code)
-        print(f"完成! {task.message_count} 条消息 -> {task.file_name}")
+        # 先一次性提交所有演示任务（wait=False 立即返回），服务端并行处理，
+        # 之后再逐个等待结果
+        demos = [
+            # 演示1: 基本导出
+            ("基本导出", client.export_group(group.group_code, wait=False)),
+            # 演示2: 导出最近7天
+            ("导出最近7天", client.export_group(group.group_code, days=7, wait=False)),
+            # 演示3: 导出为JSON
+            ("导出为JSON", client.export_group(
+                group.group_code, format="JSON", days=3, wait=False,
+            )),
+            # 演示4: 使用自定义筛选器
+            ("自定义筛选（最近24小时）", client.export_group(
+                group.group_code,
+                filter=MessageFilter.last_hours(24),
+                wait=False,
+            )),
+            # 演示5: 纯文字导出（不含图片）
+            ("纯文字导出", client.messages.quick_export(
+                chat_type=ChatType.GROUP,
+                peer_uid=group.group_code,
+                days=7,
+                options=ExportOptions.text_only(),
+                wait=False,
+            )),
+        ]
 
-        # 演示2: 导出最近7天
-        print("\n" + "=" * 40)
-        print("演示2: 导出最近7天")
-        print("=" * 40)
-        task = client.export_group(group.group_code, days=7)
-        print(f"完成! {task.message_count} 条消息")
-
-        # 演示3: 导出为JSON
-        print("\n" + "=" * 40)
-        print("演示3: 导出为JSON")
-        print("=" * 40)
-        task = client.export_group(group.group_code, format="JSON", days=3)
-        print(f"完成! {task.message_count} 条消息")
-
-        # 演示4: 使用自定义筛选器
-        print("\n" + "=" * 40)
-        print("演示4: 自定义筛选（最近24小时）")
-        print("=" * 40)
-        task = client.export_group(
-            group.group_code,
-            filter=MessageFilter.last_hours(24),
-        )
-        print(f"完成! {task.message_count} 条消息")
-
-        # 演示5: 纯文字导出（不含图片）
-        print("\n" + "=" * 40)
-        print("演示5: 纯文字导出")
-        print("=" * 40)
-        task = client.messages.quick_export(
-            chat_type=2,
-            peer_uid=group.group_code,
-            days=7,
-            options=ExportOptions(
-                filter_pure_image_messages=True,
-                include_resource_links=False,
-            ),
-        )
-        print(f"完成! {task.message_count} 条消息")
+        printer = ProgressPrinter()
+        for i, (title, pending) in enumerate(demos, 1):
+            print("\n" + "=" * 40)
+            print(f"演示{i}: {title}")
+            print("=" * 40)
+            task = pending.result(on_progress=printer.track)
+            printer.finish()
+            print(f"完成! {task.message_count} 条消息 -> {task.file_name}")
 
         print("\n所有演示完成!")
 
@@ -13,6 +13,7 @@ from napcat_qce import (
     set_export_format,
     get_export_config,
     ExportConfig,
+    ProgressPrinter,
 )
 
 
@@ -100,7 +101,8 @@ def example_full_workflow():
         group = groups[0]
         print(f"导出: {group.group_name}")
 
-        task = client.export_group(group.group_code, days=7)
+        with ProgressPrinter() as printer:
+            task = client.export_group(group.group_code, days=7, on_progress=printer.track)
         print(f"完成! {task.message_count} 条消息 -> {task.file_name}")
 
 
@@ -61,12 +61,15 @@ def main():
         print(f"输出目录: {OUTPUT_DIR}")
     print()
 
-    # 构建导出目标列表
-    targets = []
-    for group_id in GROUPS_TO_EXPORT:
-        targets.append({"type": "group", "id": group_id})
-    for friend_id in FRIENDS_TO_EXPORT:
-        targets.append({"type": "friend", "id": friend_id})
+    # 构建导出目标列表（只查询要导出的群，没有群聊目标时不发请求）
+    groups = client.groups.get_by_ids(GROUPS_TO_EXPORT) if GROUPS_TO_EXPORT else {}
+    group_names = {code: group.group_name for code, group in groups.items()}
+    targets = (
+        [{"type": "group", "id": gid, "name": group_names.get(gid)} for gid in GROUPS_TO_EXPORT]
+        + [{"type": "friend", "id": fid} for fid in FRIENDS_TO_EXPORT]
+    )
+    for group_id in set(GROUPS_TO_EXPORT) - set(group_names):
+        print(f"  警告: 未找到群 {group_id}")
 
     # 批量导出
     results = client.batch_export(
@@ -33,19 +33,22 @@ def main():
 
         # 查看现有定时任务
         print("\n现有定时任务:")
-        exports = client.scheduled_exports.get_all()
+        exports = client.scheduled_exports.get_all(include_history=5)
         if not exports:
             print("  暂无")
         else:
             for e in exports:
                 status = "启用" if e.enabled else "禁用"
                 print(f"  {e.name} ({status}) - {e.schedule_type.value} {e.execute_time}")
+                for h in e.history:
+                    result = "成功" if h.get("success") else "失败"
+                    print(f"    {h.get('executedAt', '未知')} - {result}")
 
         # 创建每日备份任务
         print("\n创建每日备份任务...")
         config = ScheduledExportConfig(
             name=f"每日备份-{group.group_name}",
-            peer=Peer(chat_type=ChatType.GROUP.value, peer_uid=group.group_code),
+            peer=Peer(chat_type=ChatType.GROUP, peer_uid=group.group_code),
             schedule_type=ScheduleType.DAILY,
             execute_time="06:00",
             time_range_type=TimeRangeType.YESTERDAY,
@@ -6,6 +6,7 @@ NapCat-QCE Python SDK WebSocket 监控示例
 需要安装: pip install websocket-client
 """
 
+import threading
 import time
 
 try:
@@ -14,7 +15,46 @@ try:
 except ImportError:
     HAS_WEBSOCKET = False
 
-from napcat_qce import connect, ChatType
+from napcat_qce import connect, ChatType, ProgressPrinter
+
+# 各示例共用的 WebSocket 连接，菜单中连续运行多个示例时无需重新握手
+_shared_ws = None
+
+
+def get_monitor_ws(host="localhost", port=40653):
+    """获取共享的 WebSocket 连接，未连接时新建，连接失败返回 None"""
+    global _shared_ws
+    if _shared_ws is not None and _shared_ws.is_connected:
+        return _shared_ws
+
+    close_monitor_ws()
+    ws = WebSocketClient(host=host, port=port, auto_reconnect=True)
+    # 握手完成即返回，最多等待 5 秒
+    if not ws.connect(blocking=False, timeout=5):
+        ws.disconnect()
+        return None
+    _shared_ws = ws
+    return ws
+
+
+def close_monitor_ws():
+    """断开共享连接（可重复调用）"""
+    global _shared_ws
+    if _shared_ws is not None:
+        _shared_ws.disconnect()
+        _shared_ws = None
+
+
+def attach_handlers(ws, handlers):
+    """在共享连接上注册一组事件处理器，返回用于注销它们的函数"""
+    for event_type, handler in handlers.items():
+        ws.on(event_type, handler)
+
+    def detach():
+        for event_type, handler in handlers.items():
+            ws.off(event_type, handler)
+
+    return detach
 
 
 def example_websocket_client():
@@ -23,37 +63,49 @@ def example_websocket_client():
     print("WebSocket 客户端")
     print("=" * 40)
 
-    ws = WebSocketClient(host="localhost", port=40653, auto_reconnect=True)
+    # 进度事件可能非常密集，只记录状态，由 printer 最多每 100ms 刷新一次
+    printer = ProgressPrinter()
+    # 任务 ID 的显示前缀，每个任务只生成一次
+    prefixes = {}
 
-    @ws.on("connected")
-    def on_connected(data):
-        print(f"已连接: {data.get('message')}")
+    def prefix(data):
+        tid = data.get("taskId", "")
+        text = prefixes.get(tid)
+        if text is None:
+            text = prefixes[tid] = f"[{tid[:8]}]"
+        return text
 
-    @ws.on("export_progress")
     def on_progress(data):
-        print(f"进度: {data.get('progress')}% - {data.get('messageCount')} 条")
+        printer.update(data.get("taskId", ""), data.get("progress", 0), data.get("messageCount", 0))
 
-    @ws.on("export_complete")
     def on_complete(data):
-        print(f"完成! {data.get('messageCount')} 条 -> {data.get('fileName')}")
+        printer.finish()
+        print(f"{prefix(data)} 完成! {data.get('messageCount')} 条 -> {data.get('fileName')}")
 
-    @ws.on("export_error")
     def on_error(data):
-        print(f"失败: {data.get('error')}")
-
-    ws.connect(blocking=False)
-    time.sleep(1)
-
-    if ws.is_connected:
-        print("\n等待事件... (Ctrl+C 退出)")
-        try:
-            while True:
-                time.sleep(1)
-        except KeyboardInterrupt:
-            pass
+        printer.finish()
+        print(f"{prefix(data)} 失败: {data.get('error')}")
 
-    ws.disconnect()
-    print("已断开")
+    ws = get_monitor_ws()
+    if ws is None:
+        print("连接超时")
+        return
+    print(f"已连接: {ws.ws_url}")
+
+    detach = attach_handlers(ws, {
+        "export_progress": on_progress,
+        "export_complete": on_complete,
+        "export_error": on_error,
+    })
+    print("\n等待事件... (Ctrl+C 返回)")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        detach()
+        printer.finish()
 
 
 def example_progress_monitor():
@@ -77,18 +129,21 @@ def example_progress_monitor():
 
     with ExportProgressMonitor(host="localhost", port=40653) as monitor:
         task = client.messages.export(
-            chat_type=ChatType.GROUP.value,
+            chat_type=ChatType.GROUP,
             peer_uid=group.group_code,
             format="HTML",
         )
 
+        printer = ProgressPrinter()
         result = monitor.wait_for_task(
             task.id,
             timeout=600,
-            on_progress=lambda s: print(f"\r进度: {s.get('progress')}%", end=""),
+            on_progress=lambda s: printer.update(
+                task.id, s.get("progress", 0), s.get("message_count", 0), group.group_name,
+            ),
         )
 
-        print()
+        printer.finish()
         if result.get("status") == "completed":
             print(f"完成! {result.get('message_count')} 条")
         else:
@@ -113,52 +168,75 @@ def example_multiple_tasks():
         print("需要至少2个群组")
         return
 
-    ws = WebSocketClient(host="localhost", port=40653)
     task_status = {}
+    # 主线程创建任务时 WebSocket 线程可能正在处理事件，读写 task_status 时加锁
+    status_lock = threading.Lock()
+    # 所有任务完成时由事件处理器置位，主线程无需轮询
+    all_done = threading.Event()
+
+    def check_all_done():
+        with status_lock:
+            snapshot = list(task_status.values())
+        if len(snapshot) == len(groups) and all(s["done"] for s in snapshot):
+            all_done.set()
+
+    # 合并各任务的进度回调，统一按固定频率刷新
+    printer = ProgressPrinter()
 
-    @ws.on("export_progress")
     def on_progress(data):
         tid = data.get("taskId")
-        if tid in task_status:
-            task_status[tid]["progress"] = data.get("progress", 0)
-            # 显示进度
-            print("\r" + " ".join(
-                f"[{s['name'][:8]}:{s['progress']}%]"
-                for s in task_status.values()
-            ), end="", flush=True)
-
-    @ws.on("export_complete")
+        with status_lock:
+            status = task_status.get(tid)
+            if status is None:
+                return
+            status["progress"] = data.get("progress", 0)
+        printer.update(tid, status["progress"], data.get("messageCount", 0), status["name"])
+
     def on_complete(data):
         tid = data.get("taskId")
-        if tid in task_status:
-            task_status[tid]["done"] = True
-            print(f"\n完成: {task_status[tid]['name']}")
-
-    ws.connect(blocking=False)
-    time.sleep(1)
+        with status_lock:
+            status = task_status.get(tid)
+            if status is None:
+                return
+            status["progress"] = 100
+            status["done"] = True
+        printer.update(tid, 100, data.get("messageCount", 0), status["name"])
+        check_all_done()
+
+    ws = get_monitor_ws()
+    if ws is None:
+        print("WebSocket 连接超时")
+        client.close()
+        return
+    detach = attach_handlers(ws, {
+        "export_progress": on_progress,
+        "export_complete": on_complete,
+    })
 
     # 创建任务
     for group in groups:
         task = client.messages.export(
-            chat_type=ChatType.GROUP.value,
+            chat_type=ChatType.GROUP,
             peer_uid=group.group_code,
             format="HTML",
         )
-        task_status[task.id] = {"name": group.group_name, "progress": 0, "done": False}
+        with status_lock:
+            task_status[task.id] = {"name": group.group_name, "progress": 0, "done": False}
         print(f"创建: {group.group_name}")
 
     # 等待完成
     print("\n等待完成...")
-    for _ in range(600):
-        if all(s["done"] for s in task_status.values()):
-            break
-        time.sleep(1)
+    check_all_done()
+    all_done.wait(timeout=600)
+    detach()
 
+    printer.finish()
     print("\n结果:")
-    for s in task_status.values():
+    with status_lock:
+        snapshot = list(task_status.values())
+    for s in snapshot:
         print(f"  {'✓' if s['done'] else '○'} {s['name']}: {s['progress']}%")
 
-    ws.disconnect()
     client.close()
 
 
@@ -167,21 +245,29 @@ def main():
         print("请先安装: pip install websocket-client")
         return
 
-    print("WebSocket 监控示例")
-    print("1. 监听所有事件")
-    print("2. 监控单个任务")
-    print("3. 多任务监控")
-
-    choice = input("\n选择 (1-3): ").strip()
-
-    if choice == "1":
-        example_websocket_client()
-    elif choice == "2":
-        example_progress_monitor()
-    elif choice == "3":
-        example_multiple_tasks()
-    else:
-        print("无效选择")
+    examples = {
+        "1": example_websocket_client,
+        "2": example_progress_monitor,
+        "3": example_multiple_tasks,
+    }
+
+    try:
+        while True:
+            print("\nWebSocket 监控示例")
+            print("1. 监听所有事件")
+            print("2. 监控单个任务")
+            print("3. 多任务监控")
+
+            choice = input("\n选择 (1-3，直接回车退出): ").strip()
+            if not choice:
+                break
+            example = examples.get(choice)
+            if example is None:
+                print("无效选择")
+                continue
+            example()
+    finally:
+        close_monitor_ws()
 
 
 if __name__ == "__main__":
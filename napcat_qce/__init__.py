@@ -25,73 +25,164 @@ GitHub: https://github.com/shuakami/qq-chat-exporter
 __version__ = "1.0.0"
 __author__ = "NapCat-QCE Contributors"
 
-from .client import NapCatQCE
-from .auto_token import (
-    AutoTokenClient,
-    connect,
-    auto_discover_token,
-    get_token_from_config,
-    get_config_dir,
-)
-from .launcher import (
-    NapCatQCELauncher,
-    start_napcat_qce,
-    run_with_napcat,
-    find_napcat_qce_path,
-    find_qq_path,
-)
-from .config import (
-    ExportConfig,
-    ConfigManager,
-    get_config_manager,
-    get_export_config,
-    set_export_dir,
-    set_export_format,
-)
-from .types import (
-    # 枚举类型
-    ChatType,
-    ExportFormat,
-    TaskStatus,
-    ResourceType,
-    ResourceStatus,
-    ScheduleType,
-    TimeRangeType,
+import importlib
+from typing import TYPE_CHECKING
+
+# 子模块按需导入：只使用 ChatType 等类型时无需加载 requests 等依赖
+_SUBMODULE_EXPORTS = {
+    ".client": ("NapCatQCE", "PendingExport"),
+    ".auto_token": (
+        "AutoTokenClient",
+        "connect",
+        "auto_discover_token",
+        "get_token_from_config",
+        "get_config_dir",
+        "clear_config_cache",
+    ),
+    ".launcher": (
+        "NapCatQCELauncher",
+        "start_napcat_qce",
+        "run_with_napcat",
+        "find_napcat_qce_path",
+        "find_qq_path",
+        "reset_path_cache",
+    ),
+    ".config": (
+        "ExportConfig",
+        "ConfigManager",
+        "get_config_manager",
+        "get_export_config",
+        "set_export_dir",
+        "set_export_format",
+    ),
+    ".types": (
+        "ChatType",
+        "ExportFormat",
+        "TaskStatus",
+        "ResourceType",
+        "ResourceStatus",
+        "ScheduleType",
+        "TimeRangeType",
+        "Peer",
+        "Group",
+        "GroupMember",
+        "Friend",
+        "UserInfo",
+        "Message",
+        "ExportTask",
+        "ScheduledExport",
+        "StickerPack",
+        "ExportFile",
+        "SystemInfo",
+        "MessageFilter",
+        "ExportOptions",
+        "ScheduledExportConfig",
+    ),
+    ".utils": ("ProgressPrinter", "RateLimiter"),
+    ".exceptions": (
+        "NapCatQCEError",
+        "AuthenticationError",
+        "ValidationError",
+        "APIError",
+        "NetworkError",
+        "TaskNotFoundError",
+    ),
+}
+
+_LAZY_ATTRS = {
+    name: module
+    for module, names in _SUBMODULE_EXPORTS.items()
+    for name in names
+}
+
+if TYPE_CHECKING:
+    from .client import NapCatQCE, PendingExport
+    from .auto_token import (
+        AutoTokenClient,
+        connect,
+        auto_discover_token,
+        get_token_from_config,
+        get_config_dir,
+        clear_config_cache,
+    )
+    from .launcher import (
+        NapCatQCELauncher,
+        start_napcat_qce,
+        run_with_napcat,
+        find_napcat_qce_path,
+        find_qq_path,
+        reset_path_cache,
+    )
+    from .config import (
+        ExportConfig,
+        ConfigManager,
+        get_config_manager,
+        get_export_config,
+        set_export_dir,
+        set_export_format,
+    )
+    from .types import (
+        # 枚举类型
+        ChatType,
+        ExportFormat,
+        TaskStatus,
+        ResourceType,
+        ResourceStatus,
+        ScheduleType,
+        TimeRangeType,
+
+        # 数据类型
+        Peer,
+        Group,
+        GroupMember,
+        Friend,
+        UserInfo,
+        Message,
+        ExportTask,
+        ScheduledExport,
+        StickerPack,
+        ExportFile,
+        SystemInfo,
+
+        # 配置类型
+        MessageFilter,
+        ExportOptions,
+        ScheduledExportConfig,
+    )
+    from .utils import ProgressPrinter, RateLimiter
+    from .exceptions import (
+        NapCatQCEError,
+        AuthenticationError,
+        ValidationError,
+        APIError,
+        NetworkError,
+        TaskNotFoundError,
+    )
 
-    # 数据类型
-    Group,
-    GroupMember,
-    Friend,
-    UserInfo,
-    Message,
-    ExportTask,
-    ScheduledExport,
-    StickerPack,
-    ExportFile,
-    SystemInfo,
 
-    # 配置类型
-    MessageFilter,
-    ExportOptions,
-    ScheduledExportConfig,
-)
-from .exceptions import (
-    NapCatQCEError,
-    AuthenticationError,
-    ValidationError,
-    APIError,
-    NetworkError,
-    TaskNotFoundError,
-)
+def __getattr__(name: str):
+    module = _LAZY_ATTRS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRS))
+
 
 __all__ = [
     # 主客户端
     "NapCatQCE",
+    "PendingExport",
     "AutoTokenClient",
     "connect",
     "auto_discover_token",
     "get_token_from_config",
     "get_config_dir",
+    "clear_config_cache",
 
     # 启动器
     "NapCatQCELauncher",
@@ -99,6 +190,7 @@ __all__ = [
     "run_with_napcat",
     "find_napcat_qce_path",
     "find_qq_path",
+    "reset_path_cache",
 
     # 配置管理
     "ExportConfig",
@@ -108,6 +200,10 @@ __all__ = [
     "set_export_dir",
     "set_export_format",
 
+    # 工具
+    "ProgressPrinter",
+    "RateLimiter",
+
     # 枚举类型
     "ChatType",
     "ExportFormat",
@@ -118,6 +214,7 @@ __all__ = [
     "TimeRangeType",
 
     # 数据类型
+    "Peer",
     "Group",
     "GroupMember",
     "Friend",
@@ -0,0 +1,874 @@
+"""
+NapCat-QCE 异步客户端
+====================
+
+基于 aiohttp 的异步客户端，适合同时导出大量聊天记录。
+需要安装: pip install napcat-qce[async]
+"""
+
+import asyncio
+import os
+import time
+from typing import Optional, Dict, Any, List, Callable, AsyncGenerator, Sequence
+
+try:
+    import aiohttp
+    HAS_AIOHTTP = True
+except ImportError:
+    HAS_AIOHTTP = False
+
+from .types import (
+    ChatType,
+    TaskStatus,
+    Group,
+    GroupMember,
+    Friend,
+    Message,
+    ExportTask,
+    SystemInfo,
+    MessageFilter,
+    ExportOptions,
+)
+from .exceptions import (
+    AuthenticationError,
+    APIError,
+    NetworkError,
+)
+from .client import (
+    TasksAPI,
+    _BOOL_STR,
+    _unwrap_response,
+    _move_export_file,
+    _default_export_dir,
+    _normalize_chat_type,
+    _normalize_format,
+)
+from .utils import LazyList, RateLimiter, json_dumps, json_loads
+
+
+class AsyncBaseAPI:
+    """异步 API 基类"""
+
+    def __init__(self, client: "AsyncNapCatQCE"):
+        self._client = client
+
+    async def _request(
+        self,
+        method: str,
+        endpoint: str,
+        params: Optional[Dict[str, Any]] = None,
+        json_data: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        return await self._client._request(method, endpoint, params, json_data)
+
+    async def _get_pages(
+        self,
+        endpoint: str,
+        key: str,
+        page: int,
+        limit: int,
+        params: Optional[Dict[str, Any]] = None,
+    ) -> List[Dict[str, Any]]:
+        """从 page 开始获取分页列表的所有剩余页（同 BaseAPI._get_pages，其余页面并发请求）"""
+        async def fetch(page_no: int) -> Dict[str, Any]:
+            return await self._request(
+                "GET", endpoint, params={**(params or {}), "page": page_no, "limit": limit},
+            )
+
+        data = await fetch(page)
+        items = list(data.get(key) or ())
+        total_pages = data.get("totalPages")
+        if isinstance(total_pages, int) and total_pages > page:
+            results = await asyncio.gather(*(fetch(p) for p in range(page + 1, total_pages + 1)))
+            for result in results:
+                items.extend(result.get(key) or ())
+            return items
+
+        batch = items
+        while batch and data.get("hasNext", len(batch) >= limit) and total_pages is None:
+            page += 1
+            data = await fetch(page)
+            next_batch = data.get(key) or []
+            # 服务端忽略分页参数时每页内容相同，此时停止
+            if next_batch == batch:
+                break
+            batch = next_batch
+            items.extend(batch)
+        return items
+
+
+class AsyncGroupsAPI(AsyncBaseAPI):
+    """群组 API（异步）"""
+
+    async def get_all(
+        self,
+        page: int = 1,
+        limit: int = 999,
+        force_refresh: bool = False,
+    ) -> List[Group]:
+        """
+        获取所有群组
+
+        群组多于 limit 个时自动获取后续页面。
+
+        Args:
+            page: 起始页码
+            limit: 每页数量
+            force_refresh: 是否强制刷新
+
+        Returns:
+            群组列表
+        """
+        groups_data = await self._get_pages(
+            "/api/groups",
+            "groups",
+            page,
+            limit,
+            params={"forceRefresh": _BOOL_STR[bool(force_refresh)]},
+        )
+        return list(map(Group.from_dict, groups_data))
+
+    async def get(self, group_code: str, force_refresh: bool = False) -> Dict[str, Any]:
+        """
+        获取群组详情
+
+        Args:
+            group_code: 群号
+            force_refresh: 是否强制刷新
+
+        Returns:
+            群组详细信息
+        """
+        return await self._request(
+            "GET",
+            f"/api/groups/{group_code}",
+            params={"forceRefresh": _BOOL_STR[bool(force_refresh)]},
+        )
+
+    async def get_by_ids(
+        self,
+        group_codes: List[str],
+        max_concurrency: int = 20,
+    ) -> Dict[str, Group]:
+        """
+        按群号并发获取群组信息
+
+        逐个查询失败的群号改为从 get_all 的结果中查找（同 GroupsAPI.get_by_ids）。
+
+        Args:
+            group_codes: 群号列表
+            max_concurrency: 同时进行的请求数上限
+
+        Returns:
+            {群号: 群组}，未找到的群号不包含在结果中
+        """
+        wanted = list(dict.fromkeys(group_codes))
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def get_one(code: str) -> Optional[Group]:
+            async with semaphore:
+                try:
+                    group = Group.from_dict(await self.get(code))
+                except APIError:
+                    return None
+            return group if group.group_code == code else None
+
+        groups = await asyncio.gather(*(get_one(code) for code in wanted))
+        found = {g.group_code: g for g in groups if g is not None}
+        if len(found) < len(wanted):
+            missing = set(wanted) - set(found)
+            for group in await self.get_all():
+                if group.group_code in missing:
+                    found[group.group_code] = group
+        return found
+
+    async def get_members(
+        self,
+        group_code: str,
+        force_refresh: bool = False,
+    ) -> List[GroupMember]:
+        """
+        获取群成员列表
+
+        Args:
+            group_code: 群号
+            force_refresh: 是否强制刷新
+
+        Returns:
+            群成员列表
+        """
+        data = await self._request(
+            "GET",
+            f"/api/groups/{group_code}/members",
+            params={"forceRefresh": _BOOL_STR[bool(force_refresh)]},
+        )
+        # API 直接返回成员数组
+        if isinstance(data, list):
+            return list(map(GroupMember.from_dict, data))
+        return []
+
+
+class AsyncFriendsAPI(AsyncBaseAPI):
+    """好友 API（异步）"""
+
+    async def get_all(self, page: int = 1, limit: int = 999) -> List[Friend]:
+        """
+        获取所有好友
+
+        好友多于 limit 个时自动获取后续页面。
+
+        Args:
+            page: 起始页码
+            limit: 每页数量
+
+        Returns:
+            好友列表
+        """
+        friends_data = await self._get_pages("/api/friends", "friends", page, limit)
+        return list(map(Friend.from_dict, friends_data))
+
+
+class AsyncMessagesAPI(AsyncBaseAPI):
+    """消息 API（异步）"""
+
+    async def fetch(
+        self,
+        chat_type,  # int 或 ChatType
+        peer_uid: str,
+        filter: Optional[MessageFilter] = None,
+        batch_size: int = 5000,
+        page: int = 1,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        批量获取消息
+
+        Args:
+            chat_type: 聊天类型 (ChatType.PRIVATE, ChatType.GROUP 或 1, 2)
+            peer_uid: 对方 UID 或群号
+            filter: 消息筛选条件
+            batch_size: 批量大小
+            page: 页码
+            limit: 每页数量
+            cursor: 上一页返回的 next_cursor；服务端支持游标分页时按游标续取，忽略 page
+
+        Returns:
+            包含消息列表和分页信息的字典；服务端支持游标分页时 next_cursor
+            为下一页的游标，否则为 None
+        """
+        peer = {"chatType": _normalize_chat_type(chat_type), "peerUid": peer_uid}
+        return await self._fetch_page(peer, filter, batch_size, page, limit, cursor)
+
+    async def _fetch_page(
+        self,
+        peer: Dict[str, Any],
+        filter: Optional[MessageFilter],
+        batch_size: int,
+        page: int,
+        limit: int,
+        cursor: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """按已构建的会话参数请求一页消息，逐页请求时会话参数只需构建一次"""
+        body = {
+            "peer": peer,
+            "batchSize": batch_size,
+            "page": page,
+            "limit": limit,
+        }
+        if filter:
+            body["filter"] = filter.to_dict()
+        if cursor is not None:
+            body["cursor"] = cursor
+
+        data = await self._request("POST", "/api/messages/fetch", json_data=body)
+
+        return {
+            "messages": list(map(Message.from_dict, data.get("messages") or ())),
+            "total_count": data.get("totalCount", 0),
+            "current_page": data.get("currentPage", 1),
+            "total_pages": data.get("totalPages", 1),
+            "has_next": data.get("hasNext", False),
+            "cache_hit": data.get("cacheHit", False),
+            "next_cursor": data.get("nextCursor"),
+        }
+
+    async def fetch_all(
+        self,
+        chat_type,  # int 或 ChatType
+        peer_uid: str,
+        filter: Optional[MessageFilter] = None,
+        batch_size: int = 5000,
+        page_size: int = 1000,
+    ) -> AsyncGenerator[List[Message], None]:
+        """
+        获取所有消息（异步生成器）
+
+        产出当前页之前就开始请求下一页；提前停止迭代时取消未完成的预取。
+        服务端返回游标（nextCursor）时改用游标分页：每页开销与所在位置无关，
+        遍历期间有新消息到达也不会导致页面错位。
+
+        Args:
+            chat_type: 聊天类型 (ChatType.PRIVATE, ChatType.GROUP 或 1, 2)
+            peer_uid: 对方 UID 或群号
+            filter: 消息筛选条件
+            batch_size: 批量大小
+            page_size: 每页请求的消息数
+
+        Yields:
+            消息列表（每页）
+
+        Example:
+            >>> async for messages in client.messages.fetch_all(ChatType.GROUP, "123456789"):
+            ...     print(len(messages))
+        """
+        # 各页的会话参数相同，只构建一次
+        peer = {"chatType": _normalize_chat_type(chat_type), "peerUid": peer_uid}
+
+        def fetch_page(page: int, cursor: Optional[str] = None):
+            return self._fetch_page(peer, filter, batch_size, page, page_size, cursor)
+
+        page = 1
+        result = await fetch_page(page)
+        # 首页带有 next_cursor 时说明服务端支持游标分页，之后按游标续取
+        use_cursor = result["next_cursor"] is not None
+        pending: Optional["asyncio.Task"] = None
+        try:
+            while True:
+                cursor = result["next_cursor"]
+                if (cursor is not None) if use_cursor else result["has_next"]:
+                    pending = asyncio.ensure_future(fetch_page(page + 1, cursor))
+
+                messages = result["messages"]
+                if messages:
+                    yield messages
+
+                if pending is None:
+                    break
+                result = await pending
+                pending = None
+                page += 1
+        finally:
+            if pending is not None:
+                pending.cancel()
+
+    async def export(
+        self,
+        chat_type,  # int 或 ChatType
+        peer_uid: str,
+        format = "JSON",  # str 或 ExportFormat
+        filter: Optional[MessageFilter] = None,
+        options: Optional[ExportOptions] = None,
+        session_name: Optional[str] = None,
+    ) -> ExportTask:
+        """
+        创建导出任务
+
+        Args:
+            chat_type: 聊天类型 (ChatType.PRIVATE, ChatType.GROUP 或 1, 2)
+            peer_uid: 对方 UID 或群号
+            format: 导出格式 (ExportFormat.HTML 或 "HTML", "JSON", "TXT", "EXCEL")
+            filter: 消息筛选条件
+            options: 导出选项
+            session_name: 会话名称（可选）
+
+        Returns:
+            导出任务
+        """
+        peer = {"chatType": _normalize_chat_type(chat_type), "peerUid": peer_uid}
+        body: Dict[str, Any] = {
+            "peer": peer,
+            "format": _normalize_format(format),
+        }
+        if filter:
+            body["filter"] = filter.to_dict()
+        if options:
+            body["options"] = options.to_dict()
+        if session_name:
+            body["sessionName"] = session_name
+
+        data = await self._request("POST", "/api/messages/export", json_data=body)
+        return ExportTask.from_dict(data)
+
+
+class AsyncTasksAPI(AsyncBaseAPI):
+    """任务 API（异步）"""
+
+    async def get_all(self) -> Sequence[ExportTask]:
+        """
+        获取所有导出任务
+
+        Returns:
+            任务列表（只读，访问某一项时才构建对应的任务对象，见 TasksAPI.get_all）
+        """
+        data = await self._request("GET", "/api/tasks")
+        return LazyList(data.get("tasks") or [], ExportTask.from_dict)
+
+    async def get(self, task_id: str) -> ExportTask:
+        """
+        获取指定任务
+
+        Args:
+            task_id: 任务 ID
+
+        Returns:
+            任务详情
+        """
+        data = await self._request("GET", f"/api/tasks/{task_id}")
+        return ExportTask.from_dict(data)
+
+    async def delete(self, task_id: str) -> bool:
+        """
+        删除任务
+
+        Args:
+            task_id: 任务 ID
+
+        Returns:
+            是否成功
+        """
+        await self._request("DELETE", f"/api/tasks/{task_id}")
+        return True
+
+    async def wait_for_completion(
+        self,
+        task_id: str,
+        timeout: float = 300,
+        poll_interval: float = 2,
+        on_progress: Optional[Callable[[ExportTask], None]] = None,
+        max_poll_interval: Optional[float] = TasksAPI.MAX_POLL_INTERVAL,
+    ) -> ExportTask:
+        """
+        等待任务完成
+
+        Args:
+            task_id: 任务 ID
+            timeout: 超时时间（秒）
+            poll_interval: 有进展时的最大轮询间隔（秒），间隔从 0.1 秒开始按 1.5 倍递增
+            on_progress: 进度回调函数
+            max_poll_interval: 进度不变时的最大轮询间隔（秒），为 None 时与 poll_interval 相同
+
+        Returns:
+            完成的任务
+
+        Raises:
+            TimeoutError: 超时
+            APIError: 任务失败
+        """
+        start_time = time.monotonic()
+        interval = min(TasksAPI.POLL_MIN_INTERVAL, poll_interval)
+        previous = None
+        while True:
+            task = await self.get(task_id)
+
+            if on_progress:
+                on_progress(task)
+
+            if task.status == TaskStatus.COMPLETED:
+                return task
+            elif task.status == TaskStatus.FAILED:
+                raise APIError(
+                    message=f"任务失败: {task.error}",
+                    code="TASK_FAILED",
+                    details={"task_id": task_id, "error": task.error},
+                )
+            elif task.status == TaskStatus.CANCELLED:
+                raise APIError(
+                    message="任务已取消",
+                    code="TASK_CANCELLED",
+                    details={"task_id": task_id},
+                )
+
+            if time.monotonic() - start_time > timeout:
+                raise TimeoutError(f"等待任务完成超时: {task_id}")
+
+            await asyncio.sleep(interval)
+            interval = TasksAPI._next_poll_interval(
+                interval, task.progress != previous, poll_interval, max_poll_interval,
+            )
+            previous = task.progress
+
+
+class AsyncSystemAPI(AsyncBaseAPI):
+    """系统 API（异步）"""
+
+    async def get_info(self) -> SystemInfo:
+        """
+        获取系统信息
+
+        Returns:
+            系统信息
+        """
+        data = await self._request("GET", "/api/system/info")
+        return SystemInfo.from_dict(data)
+
+    async def get_status(self) -> Dict[str, Any]:
+        """
+        获取系统状态
+
+        Returns:
+            系统状态
+        """
+        return await self._request("GET", "/api/system/status")
+
+    async def health_check(self) -> Dict[str, Any]:
+        """
+        健康检查
+
+        Returns:
+            健康状态
+        """
+        return await self._request("GET", "/health")
+
+
+class AsyncNapCatQCE:
+    """
+    NapCat-QCE 异步客户端
+
+    接口与 NapCatQCE 保持一致，所有 API 方法均为协程。
+
+    Example:
+        >>> async with AsyncNapCatQCE(token="your_token") as client:
+        ...     results = await client.batch_export([
+        ...         {"type": "group", "id": "123456789"},
+        ...         {"type": "group", "id": "987654321"},
+        ...     ], days=7, max_concurrency=4)
+    """
+
+    DEFAULT_HOST = "localhost"
+    DEFAULT_PORT = 40653
+
+    # 空闲连接保持时间（秒）；导出轮询间隔最长数秒，保持连接可省去重复握手
+    KEEPALIVE_TIMEOUT = 60
+
+    # API 模块在首次访问时创建（见 __getattr__）
+    _API_CLASSES: Dict[str, type] = {
+        "groups": AsyncGroupsAPI,
+        "friends": AsyncFriendsAPI,
+        "messages": AsyncMessagesAPI,
+        "tasks": AsyncTasksAPI,
+        "system": AsyncSystemAPI,
+    }
+
+    groups: AsyncGroupsAPI
+    friends: AsyncFriendsAPI
+    messages: AsyncMessagesAPI
+    tasks: AsyncTasksAPI
+    system: AsyncSystemAPI
+
+    def __init__(
+        self,
+        token: Optional[str] = None,
+        host: str = DEFAULT_HOST,
+        port: int = DEFAULT_PORT,
+        timeout: float = 30.0,
+        connection_limit: int = 100,
+        rpm: Optional[float] = None,
+    ):
+        """
+        初始化异步客户端
+
+        Args:
+            token: 访问令牌
+            host: 服务器地址
+            port: 服务器端口
+            timeout: 请求超时时间（秒）
+            connection_limit: 同时打开的最大连接数
+            rpm: 每分钟最多发送的请求数（令牌桶限流），为 None 时不限制
+        """
+        if not HAS_AIOHTTP:
+            raise ImportError(
+                "aiohttp 库未安装。请运行: pip install napcat-qce[async]"
+            )
+
+        self.host = host
+        self.port = port
+        self.token = token
+        self.timeout = timeout
+        self.connection_limit = connection_limit
+        self._rate_limiter = RateLimiter(rpm) if rpm else None
+
+        self.base_url = f"http://{host}:{port}"
+
+        # session 在首次请求时创建（需要运行中的事件循环）
+        self._session: Optional["aiohttp.ClientSession"] = None
+
+    def __getattr__(self, name: str) -> Any:
+        """首次访问 API 模块时创建实例，之后直接从实例属性读取"""
+        cls = AsyncNapCatQCE._API_CLASSES.get(name)
+        if cls is None:
+            raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
+        return self.__dict__.setdefault(name, cls(self))
+
+    def __dir__(self) -> List[str]:
+        return sorted(set(super().__dir__()) | set(AsyncNapCatQCE._API_CLASSES))
+
+    def _get_session(self) -> "aiohttp.ClientSession":
+        """获取（必要时创建）aiohttp session"""
+        if self._session is None or self._session.closed:
+            headers = {}
+            if self.token:
+                headers["Authorization"] = f"Bearer {self.token}"
+            self._session = aiohttp.ClientSession(
+                headers=headers,
+                connector=aiohttp.TCPConnector(
+                    limit=self.connection_limit,
+                    keepalive_timeout=self.KEEPALIVE_TIMEOUT,
+                ),
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+            )
+        return self._session
+
+    async def _request(
+        self,
+        method: str,
+        endpoint: str,
+        params: Optional[Dict[str, Any]] = None,
+        json_data: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """
+        发送 HTTP 请求
+
+        Args:
+            method: HTTP 方法
+            endpoint: API 端点
+            params: 查询参数
+            json_data: JSON 请求体
+
+        Returns:
+            响应数据
+
+        Raises:
+            AuthenticationError: 认证失败
+            ValidationError: 参数验证失败
+            APIError: API 调用失败
+            NetworkError: 网络错误
+        """
+        # 直接拼接，无需 urljoin 解析；兼容不以 "/" 开头的端点
+        if endpoint[:1] == "/":
+            url = self.base_url + endpoint
+        else:
+            url = self.base_url + "/" + endpoint
+        session = self._get_session()
+        payload = None
+        headers = None
+        if json_data is not None:
+            payload = json_dumps(json_data)
+            headers = {"Content-Type": "application/json"}
+
+        if self._rate_limiter is not None:
+            await self._rate_limiter.acquire_async()
+
+        try:
+            async with session.request(
+                method, url, params=params, data=payload, headers=headers,
+            ) as response:
+                status_code = response.status
+                body = await response.read()
+        except aiohttp.ClientConnectionError as e:
+            raise NetworkError(f"无法连接到服务器: {self.base_url}") from e
+        except asyncio.TimeoutError as e:
+            raise NetworkError(f"请求超时: {url}") from e
+        except aiohttp.ClientError as e:
+            raise NetworkError(f"请求失败: {e}") from e
+
+        # 处理响应
+        if status_code == 401:
+            raise AuthenticationError("认证失败，请检查访问令牌")
+        elif status_code == 403:
+            raise AuthenticationError("访问被拒绝，令牌无效或已过期")
+
+        try:
+            data = json_loads(body)
+        except ValueError:
+            if status_code >= 400:
+                raise APIError(
+                    message=f"服务器返回错误: {status_code}",
+                    status_code=status_code,
+                )
+            return {}
+
+        return _unwrap_response(data, status_code)
+
+    async def close(self):
+        """关闭客户端连接"""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def __aenter__(self) -> "AsyncNapCatQCE":
+        self._get_session()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    def __repr__(self) -> str:
+        return f"AsyncNapCatQCE(host={self.host!r}, port={self.port})"
+
+    # ========================================
+    # 便捷导出方法
+    # ========================================
+
+    async def _resolve_friend_uid(
+        self,
+        friend_id: str,
+        friend_uids: Optional[Dict[str, str]] = None,
+    ) -> str:
+        """
+        将好友 QQ 号（uin）转换为 uid，已是 uid 或未找到时原样返回
+
+        friend_uids 为预先构建的 {uin: uid} 索引；未传入时重新获取好友列表。
+        """
+        if friend_id.startswith("u_"):
+            return friend_id
+
+        if friend_uids is None:
+            friend_uids = {f.uin: f.uid for f in await self.friends.get_all()}
+        return friend_uids.get(friend_id, friend_id)
+
+    async def batch_export(
+        self,
+        targets: List[Dict[str, Any]],
+        format: str = "HTML",
+        days: Optional[int] = None,
+        output_dir: Optional[str] = None,
+        max_concurrency: int = 4,
+        timeout: float = 600,
+        on_progress: Optional[Callable[[str, ExportTask], None]] = None,
+        on_error: Optional[Callable[[str, Exception], None]] = None,
+        friends: Optional[List[Friend]] = None,
+    ) -> Dict[str, Any]:
+        """
+        并发批量导出多个聊天记录
+
+        最多同时进行 max_concurrency 个导出任务，避免给服务端造成过大压力。
+        任一任务结束即移动文件并回调，不必等待其他任务。
+
+        Args:
+            targets: 导出目标列表，每项包含:
+                - type: "group" 或 "friend"
+                - id: 群号或好友QQ号
+                - name: 可选，会话名称
+            format: 导出格式
+            days: 导出最近N天
+            output_dir: 输出目录（导出完成后移动文件到此目录）
+            max_concurrency: 最大并发导出数
+            timeout: 单个任务的超时时间（秒）
+            on_progress: 完成回调 (target_id, task)
+            on_error: 错误回调 (target_id, exception)
+            friends: 已获取的好友列表（可选），用于将好友QQ号解析为 uid，
+                传入后不再重新获取
+
+        Returns:
+            结果统计: {"success": int, "failed": int, "total_messages": int,
+            "duplicates": int, "results": [...]}，重复的目标只导出一次
+        """
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+
+        # 去除重复目标，同一会话只导出一次
+        seen = set()
+        unique_targets = []
+        for target in targets:
+            key = (target.get("type", "group"), target.get("id", ""))
+            if key not in seen:
+                seen.add(key)
+                unique_targets.append(target)
+
+        results = {
+            "success": 0,
+            "failed": 0,
+            "total_messages": 0,
+            "duplicates": len(targets) - len(unique_targets),
+            "results": [],
+        }
+        targets = unique_targets
+
+        # 好友 {uin: uid} 索引，只在有好友目标使用 QQ 号时获取一次好友列表
+        friend_uids: Optional[Dict[str, str]] = None
+        if any(
+            target.get("type", "group") != "group"
+            and not target.get("id", "").startswith("u_")
+            for target in targets
+        ):
+            if friends is None:
+                friends = await self.friends.get_all()
+            friend_uids = {f.uin: f.uid for f in friends}
+
+        filter = MessageFilter.last_days(days) if days is not None else None
+        semaphore = asyncio.Semaphore(max_concurrency)
+        loop = asyncio.get_running_loop()
+        export_dir = _default_export_dir() if output_dir else None
+
+        async def export_one(index: int, target: Dict[str, Any]):
+            try:
+                async with semaphore:
+                    if target.get("type", "group") == "group":
+                        chat_type = ChatType.GROUP
+                        peer_uid = target.get("id", "")
+                    else:
+                        chat_type = ChatType.PRIVATE
+                        peer_uid = await self._resolve_friend_uid(
+                            target.get("id", ""), friend_uids,
+                        )
+
+                    task = await self.messages.export(
+                        chat_type=chat_type,
+                        peer_uid=peer_uid,
+                        format=format,
+                        filter=filter,
+                        session_name=target.get("name"),
+                    )
+                    task = await self.tasks.wait_for_completion(task.id, timeout=timeout)
+
+                output_path = None
+                if output_dir and task.file_name:
+                    # 文件移动可能涉及跨盘复制，放到线程池中执行
+                    output_path = await loop.run_in_executor(
+                        None, _move_export_file, task.file_name, output_dir, export_dir,
+                    )
+                return index, task, output_path
+            except Exception as e:
+                return index, e, None
+
+        outcomes: List[Any] = [None] * len(targets)
+        jobs = [export_one(index, target) for index, target in enumerate(targets)]
+        for job in asyncio.as_completed(jobs):
+            index, outcome, output_path = await job
+            outcomes[index] = (outcome, output_path)
+            target_id = targets[index].get("id", "")
+            if isinstance(outcome, Exception):
+                if on_error:
+                    on_error(target_id, outcome)
+            elif on_progress:
+                on_progress(target_id, outcome)
+
+        # 按目标顺序整理结果
+        for target, (outcome, output_path) in zip(targets, outcomes):
+            target_type = target.get("type", "group")
+            target_id = target.get("id", "")
+
+            if isinstance(outcome, Exception):
+                results["failed"] += 1
+                results["results"].append({
+                    "id": target_id,
+                    "type": target_type,
+                    "status": "failed",
+                    "error": str(outcome),
+                })
+                continue
+
+            task = outcome
+            results["success"] += 1
+            results["total_messages"] += task.message_count
+            results["results"].append({
+                "id": target_id,
+                "type": target_type,
+                "status": "success",
+                "message_count": task.message_count,
+                "file_name": task.file_name,
+                "output_path": output_path,
+            })
+
+        return results
@@ -5,35 +5,32 @@ NapCat-QCE 自动令牌获取
 自动从本地配置文件或服务器获取访问令牌。
 """
 
-import json
+import functools
 import os
-import platform
+import threading
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
 
 from .exceptions import AuthenticationError
+from .utils import json_loads as _json_loads
 
 
+@functools.lru_cache(maxsize=1)
 def get_config_dir() -> Path:
     """
     获取 NapCat-QCE 配置目录
 
+    Windows 为 %USERPROFILE%\.qq-chat-exporter，Linux/macOS 为 ~/.qq-chat-exporter。
+    结果会被缓存，用户目录变化后可调用 clear_config_cache() 重新计算。
+
     Returns:
         配置目录路径
     """
-    if platform.system() == "Windows":
-        # Windows: %USERPROFILE%\.qq-chat-exporter
-        user_profile = os.environ.get("USERPROFILE", "")
-        if user_profile:
-            return Path(user_profile) / ".qq-chat-exporter"
-    else:
-        # Linux/macOS: ~/.qq-chat-exporter
-        home = os.environ.get("HOME", "")
-        if home:
-            return Path(home) / ".qq-chat-exporter"
-
-    # 回退到当前目录
-    return Path(".qq-chat-exporter")
+    try:
+        return Path.home() / ".qq-chat-exporter"
+    except RuntimeError:
+        # 无法确定用户目录时回退到当前目录
+        return Path(".qq-chat-exporter")
 
 
 def get_security_config_path() -> Path:
@@ -46,25 +43,53 @@ def get_security_config_path() -> Path:
     return get_config_dir() / "security.json"
 
 
+# 已解析的配置文件: {路径: (st_mtime_ns, st_size, 配置)}
+_config_cache: Dict[Path, Tuple[int, int, Dict[str, Any]]] = {}
+_config_cache_lock = threading.Lock()
+
+
 def load_security_config() -> Optional[Dict[str, Any]]:
     """
     加载安全配置文件
 
+    解析结果按文件的修改时间和大小缓存，文件未变化时不会重复读取；
+    可调用 clear_config_cache() 清空缓存。
+
     Returns:
         配置字典，如果文件不存在则返回 None
     """
     config_path = get_security_config_path()
 
-    if not config_path.exists():
+    try:
+        st = config_path.stat()
+    except OSError:
+        with _config_cache_lock:
+            _config_cache.pop(config_path, None)
         return None
 
+    with _config_cache_lock:
+        cached = _config_cache.get(config_path)
+    if cached is not None and cached[:2] == (st.st_mtime_ns, st.st_size):
+        return dict(cached[2])
+
     try:
-        with open(config_path, "r", encoding="utf-8") as f:
-            return json.load(f)
-    except (json.JSONDecodeError, IOError) as e:
+        with open(config_path, "rb") as f:
+            config = _json_loads(f.read())
+    except (ValueError, IOError) as e:
         print(f"[AutoToken] 读取配置文件失败: {e}")
         return None
 
+    with _config_cache_lock:
+        _config_cache[config_path] = (st.st_mtime_ns, st.st_size, config)
+    return dict(config)
+
+
+def clear_config_cache():
+    """清空配置目录和 load_security_config 的缓存，下次调用时重新定位并读取配置文件"""
+    get_config_dir.cache_clear()
+    with _config_cache_lock:
+        _config_cache.clear()
+
 
 def get_token_from_config() -> Optional[str]:
     """
@@ -96,18 +121,23 @@ def auto_discover_token(
     host: str = "localhost",
     port: int = 40653,
     try_local_config: bool = True,
+    config: Optional[Dict[str, Any]] = None,
 ) -> Optional[str]:
     """
     自动发现访问令牌
 
     尝试顺序:
-    1. 从本地配置文件读取（如果 try_local_config=True）
-    2. 从环境变量 NAPCAT_QCE_TOKEN 读取
+    1. 从环境变量 NAPCAT_QCE_TOKEN 读取（设置时直接返回，不访问配置文件）
+    2. 从本地配置文件读取（如果 try_local_config=True）
+
+    配置文件的解析结果按修改时间缓存，令牌轮换后会自动读取新值；
+    也可调用 clear_config_cache() 强制重新读取。
 
     Args:
         host: 服务器地址（用于验证）
         port: 服务器端口
         try_local_config: 是否尝试从本地配置文件读取
+        config: 已加载的本地配置，传入时不再重新读取配置文件
 
     Returns:
         访问令牌，如果无法获取则返回 None
@@ -120,7 +150,10 @@ def auto_discover_token(
 
     # 2. 尝试从本地配置文件获取
     if try_local_config:
-        local_token = get_token_from_config()
+        if config is None:
+            local_token = get_token_from_config()
+        else:
+            local_token = config.get("accessToken")
         if local_token:
             print(f"[AutoToken] 从本地配置文件获取令牌: {get_security_config_path()}")
             return local_token
@@ -187,6 +220,20 @@ class AutoTokenClient:
         >>> groups = client.groups.get_all()
     """
 
+    # 客户端创建后不会再变化的 API 模块，首次访问后缓存到实例上，
+    # 之后的访问不再经过 __getattr__
+    _CACHED_ATTRS = frozenset({
+        "groups",
+        "friends",
+        "users",
+        "messages",
+        "tasks",
+        "scheduled_exports",
+        "sticker_packs",
+        "export_files",
+        "system",
+    })
+
     def __init__(
         self,
         host: Optional[str] = None,
@@ -205,10 +252,20 @@ class AutoTokenClient:
             auto_discover: 是否自动发现令牌
             **kwargs: 传递给 NapCatQCE 的其他参数
         """
-        # 尝试从配置获取服务器地址
+        # 环境变量中的令牌优先，此时只在需要服务器地址时才读取配置文件
+        if token is None and auto_discover:
+            token = auto_discover_token(try_local_config=False)
+
+        # 服务器地址和令牌都来自同一个配置文件，只读取一次
+        config: Dict[str, Any] = {}
+        if host is None or (token is None and auto_discover):
+            config = load_security_config() or {}
+
         if host is None:
-            config_host = get_server_host_from_config()
-            host = config_host if config_host else "localhost"
+            host = config.get("serverHost") or "localhost"
+
+        if token is None and auto_discover:
+            token = auto_discover_token(host, port, config=config)
 
         self._client = create_client_with_auto_token(
             host=host,
@@ -220,7 +277,12 @@ class AutoTokenClient:
 
     def __getattr__(self, name):
         """代理所有属性访问到内部客户端"""
-        return getattr(self._client, name)
+        if name == "_client":
+            raise AttributeError(name)
+        value = getattr(self._client, name)
+        if name in self._CACHED_ATTRS:
+            self.__dict__[name] = value
+        return value
 
     def __enter__(self):
         return self
@@ -239,6 +301,7 @@ def connect(
     host: Optional[str] = None,
     port: int = 40653,
     token: Optional[str] = None,
+    **kwargs,
 ) -> "AutoTokenClient":
     """
     快速连接到 NapCat-QCE 服务器
@@ -249,6 +312,7 @@ def connect(
         host: 服务器地址（None 时自动检测）
         port: 服务器端口
         token: 手动指定的令牌（可选）
+        **kwargs: 传递给 NapCatQCE 的其他参数（如 timeout、pool_size）
 
     Returns:
         客户端实例
@@ -258,4 +322,4 @@ def connect(
         >>> client = connect()
         >>> groups = client.groups.get_all()
     """
-    return AutoTokenClient(host=host, port=port, token=token)
+    return AutoTokenClient(host=host, port=port, token=token, **kwargs)
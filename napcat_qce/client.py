@@ -5,13 +5,32 @@ NapCat-QCE 主客户端
 提供与 NapCat-QCE API 交互的主要接口。
 """
 
-import json
+import gzip
+import os
+import shutil
 import time
 import threading
-from typing import Optional, Dict, Any, List, Callable, Generator
-from urllib.parse import urljoin
+import dataclasses
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Optional, Dict, Any, List, Callable, Generator, Sequence, Tuple, Union
 
 import requests
+import urllib3
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import websocket
+    HAS_WEBSOCKET = True
+except ImportError:
+    HAS_WEBSOCKET = False
+
+try:
+    import ijson
+    HAS_IJSON = True
+except ImportError:
+    HAS_IJSON = False
 
 from .types import (
     ChatType,
@@ -42,6 +61,105 @@ from .exceptions import (
     NetworkError,
     TaskNotFoundError,
 )
+from .utils import LazyList, RateLimiter, cached_with_inflight, fast_move, json_dumps, json_loads
+
+
+# 错误类型（error.type）或错误码（context.code）到异常的映射，
+# 参数为 (错误信息, 错误码, HTTP 状态码, 完整错误对象)；未列出的返回 APIError
+_ERROR_FACTORIES: Dict[str, Callable[[str, str, int, Dict[str, Any]], Exception]] = {
+    "AUTH_ERROR": lambda message, code, status_code, error: AuthenticationError(message, code),
+    "VALIDATION_ERROR": lambda message, code, status_code, error: ValidationError(message, code),
+    "TASK_NOT_FOUND": lambda message, code, status_code, error: TaskNotFoundError(
+        error.get("context", {}).get("taskId", "unknown"),
+    ),
+}
+
+
+def _api_error(message: str, code: str, status_code: int, error: Dict[str, Any]) -> Exception:
+    return APIError(message, code, status_code, error)
+
+
+def _unwrap_response(data: Dict[str, Any], status_code: int) -> Dict[str, Any]:
+    """检查 API 响应，失败时抛出对应异常，成功时返回 data 字段"""
+    if data.get("success", True):
+        return data.get("data", data)
+
+    error = data.get("error", {})
+    error_type = error.get("type", "UNKNOWN_ERROR")
+    error_code = error.get("context", {}).get("code", error_type)
+    factory = (
+        _ERROR_FACTORIES.get(error_type)
+        or _ERROR_FACTORIES.get(error_code)
+        or _api_error
+    )
+    raise factory(error.get("message", "未知错误"), error_code, status_code, error)
+
+
+# 视为本机的服务器地址
+_LOCAL_HOSTS = frozenset({"localhost", "127.0.0.1", "::1"})
+
+# 布尔查询参数的字符串形式，以 bool 值为下标取值
+_BOOL_STR = ("false", "true")
+
+
+def _default_export_dir() -> str:
+    """服务端在本机的默认导出目录"""
+    user_profile = os.environ.get("USERPROFILE", os.path.expanduser("~"))
+    return os.path.join(user_profile, ".qq-chat-exporter", "exports")
+
+
+def _move_export_file(
+    file_name: str,
+    output_dir: str,
+    export_dir: Optional[str] = None,
+) -> Optional[str]:
+    """
+    将导出文件从默认导出目录移动到 output_dir
+
+    Args:
+        file_name: 导出文件名
+        output_dir: 目标目录
+        export_dir: 源目录，批量移动时预先计算一次传入，None 时使用默认导出目录
+
+    Returns:
+        新路径，源文件不存在时返回 None
+    """
+    src_path = os.path.join(export_dir or _default_export_dir(), file_name)
+    try:
+        # 直接尝试移动，源文件存在时（常见情况）省去一次 stat
+        return fast_move(src_path, os.path.join(output_dir, file_name))
+    except FileNotFoundError:
+        if os.path.exists(src_path):
+            raise
+        return None
+
+
+# 常见取值的查找表，命中时无需类型判断和字符串转换
+# （枚举成员与其值相等且哈希相同，同一个键同时匹配枚举和原始值）
+_CHAT_TYPE_MAP: Dict[Any, int] = {
+    **{t: t.value for t in ChatType},
+    **{str(t.value): t.value for t in ChatType},
+}
+_FORMAT_MAP: Dict[Any, str] = {
+    **{f: f.value.upper() for f in ExportFormat},
+    **{f.value.upper(): f.value.upper() for f in ExportFormat},
+}
+
+
+def _normalize_chat_type(chat_type) -> int:
+    """将 ChatType 枚举或整数统一转换为整数"""
+    value = _CHAT_TYPE_MAP.get(chat_type)
+    if value is not None:
+        return value
+    return int(chat_type)
+
+
+def _normalize_format(format) -> str:
+    """将 ExportFormat 枚举或字符串统一转换为字符串"""
+    value = _FORMAT_MAP.get(format)
+    if value is not None:
+        return value
+    return str(format).upper()
 
 
 class BaseAPI:
@@ -60,10 +178,113 @@ class BaseAPI:
     ) -> Dict[str, Any]:
         return self._client._request(method, endpoint, params, json_data, **kwargs)
 
+    @property
+    def cache_ttl(self) -> float:
+        """列表缓存有效期（秒），由客户端统一配置"""
+        return self._client.cache_ttl
+
+    # 自动翻页时最多并行请求的页数
+    PAGE_WORKERS = 4
+
+    def _get_pages(
+        self,
+        endpoint: str,
+        key: str,
+        page: int,
+        limit: int,
+        params: Optional[Dict[str, Any]] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        从 page 开始获取分页列表的所有剩余页
+
+        服务端返回 totalPages 时，其余页面并行请求；否则逐页请求，
+        直到 hasNext 为假，或未返回 hasNext 且本页不足 limit 条。
+
+        Args:
+            endpoint: API 端点
+            key: 响应中列表字段名
+            page: 起始页码
+            limit: 每页数量
+            params: 其他查询参数
+
+        Returns:
+            按页序合并的原始列表项
+        """
+        def fetch(page_no: int) -> Dict[str, Any]:
+            return self._request(
+                "GET", endpoint, params={**(params or {}), "page": page_no, "limit": limit},
+            )
+
+        data = fetch(page)
+        items = list(data.get(key) or ())
+        total_pages = data.get("totalPages")
+        if isinstance(total_pages, int) and total_pages > page:
+            pages = range(page + 1, total_pages + 1)
+            with ThreadPoolExecutor(max_workers=min(self.PAGE_WORKERS, len(pages))) as executor:
+                for result in executor.map(fetch, pages):
+                    items.extend(result.get(key) or ())
+            return items
+
+        batch = items
+        while batch and data.get("hasNext", len(batch) >= limit) and total_pages is None:
+            page += 1
+            data = fetch(page)
+            next_batch = data.get(key) or []
+            # 服务端忽略分页参数时每页内容相同，此时停止
+            if next_batch == batch:
+                break
+            batch = next_batch
+            items.extend(batch)
+        return items
+
+    @staticmethod
+    def _map_concurrent(
+        func: Callable[[str], Any],
+        keys: List[str],
+        max_workers: int,
+        on_error: Optional[Callable[[str, Exception], None]],
+    ) -> Dict[str, Any]:
+        """
+        对每个键并发调用 func，按键返回结果
+
+        使用独立的线程池（不占用客户端后台线程池），各线程共享连接池中的 keep-alive 连接。
+
+        Args:
+            func: 处理单个键的函数
+            keys: 键列表（重复的只处理一次）
+            max_workers: 并发数
+            on_error: 失败回调 (key, exception)，按 keys 顺序在当前线程调用；
+                未指定时抛出第一个失败项的异常（其余键仍会处理）
+
+        Returns:
+            {键: 结果}，失败的键不包含在结果中
+        """
+        wanted = list(dict.fromkeys(keys))
+        if not wanted:
+            return {}
+
+        workers = max(1, min(max_workers, len(wanted)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(func, key) for key in wanted]
+
+        results: Dict[str, Any] = {}
+        for key, future in zip(wanted, futures):
+            try:
+                results[key] = future.result()
+            except Exception as e:
+                if on_error is None:
+                    raise
+                on_error(key, e)
+        return results
+
 
 class GroupsAPI(BaseAPI):
     """群组 API"""
 
+    # get_by_ids 逐个查询的上限，超过时改为获取完整列表
+    BY_ID_LOOKUP_LIMIT = 8
+
+    @cached_with_inflight(ttl=30, bypass="force_refresh")
     def get_all(
         self,
         page: int = 1,
@@ -73,25 +294,61 @@ class GroupsAPI(BaseAPI):
         """
         获取所有群组
 
+        结果在客户端缓存 cache_ttl 秒（默认 30），并发的相同调用只会发送一次请求。
+        群组多于 limit 个时自动获取后续页面。返回的列表是副本，
+        但其中的 Group 对象与缓存共享，请勿修改。
+
         Args:
-            page: 页码
+            page: 起始页码
             limit: 每页数量
-            force_refresh: 是否强制刷新缓存
+            force_refresh: 是否强制刷新缓存（同时跳过客户端缓存）
 
         Returns:
             群组列表
         """
-        data = self._request(
-            "GET",
+        groups_data = self._get_pages(
             "/api/groups",
-            params={
-                "page": page,
-                "limit": limit,
-                "forceRefresh": str(force_refresh).lower(),
-            },
+            "groups",
+            page,
+            limit,
+            params={"forceRefresh": _BOOL_STR[bool(force_refresh)]},
         )
-        groups_data = data.get("groups", [])
-        return [Group.from_dict(g) for g in groups_data]
+        return list(map(Group.from_dict, groups_data))
+
+    def invalidate(self):
+        """清空群组列表缓存，下次 get_all 将重新请求"""
+        GroupsAPI.get_all.invalidate(self)
+
+    def get_by_ids(self, group_codes: List[str]) -> Dict[str, Group]:
+        """
+        按群号获取群组信息
+
+        群号较少时并行查询各群详情，无需拉取完整群列表；群号较多或
+        逐个查询失败时，改为从 get_all（有缓存）中筛选。
+
+        Args:
+            group_codes: 群号列表
+
+        Returns:
+            {群号: 群组}，未找到的群号不包含在结果中
+        """
+        wanted = list(dict.fromkeys(group_codes))
+        if not wanted:
+            return {}
+
+        if len(wanted) <= self.BY_ID_LOOKUP_LIMIT:
+            # 使用独立线程池：在 batch_export 的回调（运行于客户端线程池）中调用时不会互相等待
+            try:
+                details = self._map_concurrent(self.get, wanted, self.BY_ID_LOOKUP_LIMIT, None)
+            except APIError:
+                details = None
+            if details is not None:
+                groups = {code: Group.from_dict(d) for code, d in details.items()}
+                if all(g.group_code == code for code, g in groups.items()):
+                    return groups
+
+        wanted_set = set(wanted)
+        return {g.group_code: g for g in self.get_all() if g.group_code in wanted_set}
 
     def get(self, group_code: str, force_refresh: bool = False) -> Dict[str, Any]:
         """
@@ -107,7 +364,7 @@ class GroupsAPI(BaseAPI):
         return self._request(
             "GET",
             f"/api/groups/{group_code}",
-            params={"forceRefresh": str(force_refresh).lower()},
+            params={"forceRefresh": _BOOL_STR[bool(force_refresh)]},
         )
 
     def get_members(
@@ -128,35 +385,57 @@ class GroupsAPI(BaseAPI):
         data = self._request(
             "GET",
             f"/api/groups/{group_code}/members",
-            params={"forceRefresh": str(force_refresh).lower()},
+            params={"forceRefresh": _BOOL_STR[bool(force_refresh)]},
         )
         # API 直接返回成员数组
         if isinstance(data, list):
-            return [GroupMember.from_dict(m) for m in data]
+            return list(map(GroupMember.from_dict, data))
         return []
 
 
 class FriendsAPI(BaseAPI):
     """好友 API"""
 
-    def get_all(self, page: int = 1, limit: int = 999) -> List[Friend]:
+    @cached_with_inflight(ttl=30, bypass="force_refresh")
+    def get_all(self, page: int = 1, limit: int = 999, force_refresh: bool = False) -> List[Friend]:
         """
         获取所有好友
 
+        结果在客户端缓存 cache_ttl 秒（默认 30），并发的相同调用只会发送一次请求。
+        好友多于 limit 个时自动获取后续页面。返回的列表是副本，
+        但其中的 Friend 对象与缓存共享，请勿修改。
+
         Args:
-            page: 页码
+            page: 起始页码
             limit: 每页数量
+            force_refresh: 是否跳过客户端缓存
 
         Returns:
             好友列表
         """
-        data = self._request(
-            "GET",
-            "/api/friends",
-            params={"page": page, "limit": limit},
-        )
-        friends_data = data.get("friends", [])
-        return [Friend.from_dict(f) for f in friends_data]
+        friends_data = self._get_pages("/api/friends", "friends", page, limit)
+        return list(map(Friend.from_dict, friends_data))
+
+    @cached_with_inflight(ttl=30, bypass="force_refresh")
+    def get_uid_map(self, force_refresh: bool = False) -> Dict[str, str]:
+        """
+        获取好友 QQ 号（uin）到 uid 的索引
+
+        与 get_all 使用相同的缓存有效期，缓存期内按 QQ 号查找 uid 无需遍历好友列表。
+        返回的字典为共享缓存，请勿修改。
+
+        Args:
+            force_refresh: 是否跳过客户端缓存（同时刷新好友列表）
+
+        Returns:
+            {uin: uid}
+        """
+        return {f.uin: f.uid for f in self.get_all(force_refresh=force_refresh)}
+
+    def invalidate(self):
+        """清空好友列表缓存，下次 get_all 将重新请求"""
+        FriendsAPI.get_all.invalidate(self)
+        FriendsAPI.get_uid_map.invalidate(self)
 
     def get(self, uid: str, no_cache: bool = False) -> Dict[str, Any]:
         """
@@ -172,7 +451,7 @@ class FriendsAPI(BaseAPI):
         return self._request(
             "GET",
             f"/api/friends/{uid}",
-            params={"no_cache": str(no_cache).lower()},
+            params={"no_cache": _BOOL_STR[bool(no_cache)]},
         )
 
 
@@ -193,25 +472,94 @@ class UsersAPI(BaseAPI):
         data = self._request(
             "GET",
             f"/api/users/{uid}",
-            params={"no_cache": str(no_cache).lower()},
+            params={"no_cache": _BOOL_STR[bool(no_cache)]},
         )
         return UserInfo.from_dict(data)
 
+    def get_many(
+        self,
+        uids: List[str],
+        no_cache: bool = False,
+        max_workers: int = 8,
+        on_error: Optional[Callable[[str, Exception], None]] = None,
+    ) -> Dict[str, UserInfo]:
+        """
+        并发获取多个用户的信息
 
-class MessagesAPI(BaseAPI):
-    """消息 API"""
+        服务端没有批量查询接口，这里通过最多 max_workers 个线程并发发送单个查询，
+        各线程共享连接池中的 keep-alive 连接。
+
+        Args:
+            uids: 用户 UID 列表（重复的只查询一次）
+            no_cache: 是否禁用缓存
+            max_workers: 并发请求数
+            on_error: 查询失败回调 (uid, exception)；未指定时抛出第一个失败项的异常
+
+        Returns:
+            {uid: 用户信息}，查询失败的 uid 不包含在结果中
+        """
+        return self._map_concurrent(
+            lambda uid: self.get(uid, no_cache), uids, max_workers, on_error,
+        )
+
+
+class PendingExport:
+    """
+    已提交的导出任务句柄
+
+    由 wait=False 的导出方法返回。提交后不会立即查询状态，
+    首次调用 result() 时才开始等待，结果会被缓存。
+
+    Example:
+        >>> pending = [client.export_group(gid, days=7, wait=False) for gid in group_ids]
+        >>> for p in pending:
+        ...     print(p.result().message_count)
+    """
+
+    def __init__(self, tasks: "TasksAPI", task: ExportTask, timeout: float = 600):
+        self._tasks = tasks
+        self.task = task
+        self.timeout = timeout
+        self._result: Optional[ExportTask] = None
+
+    @property
+    def id(self) -> str:
+        """任务 ID"""
+        return self.task.id
+
+    def result(
+        self,
+        timeout: Optional[float] = None,
+        on_progress: Optional[Callable[[ExportTask], None]] = None,
+    ) -> ExportTask:
+        """
+        等待任务完成并返回结果
+
+        Args:
+            timeout: 超时时间（秒），默认使用提交时的 timeout
+            on_progress: 进度回调函数
+
+        Returns:
+            完成的导出任务
+
+        Raises:
+            TimeoutError: 超时
+            APIError: 任务失败
+        """
+        if self._result is None:
+            self._result = self._tasks.wait_for_completion(
+                self.task.id,
+                timeout=self.timeout if timeout is None else timeout,
+                on_progress=on_progress,
+            )
+        return self._result
+
+    def __repr__(self) -> str:
+        return f"PendingExport(id={self.task.id!r})"
 
-    def _normalize_chat_type(self, chat_type) -> int:
-        """将 ChatType 枚举或整数统一转换为整数"""
-        if isinstance(chat_type, ChatType):
-            return chat_type.value
-        return int(chat_type)
 
-    def _normalize_format(self, format) -> str:
-        """将 ExportFormat 枚举或字符串统一转换为字符串"""
-        if isinstance(format, ExportFormat):
-            return format.value.upper()
-        return str(format).upper()
+class MessagesAPI(BaseAPI):
+    """消息 API"""
 
     def fetch(
         self,
@@ -221,6 +569,7 @@ class MessagesAPI(BaseAPI):
         batch_size: int = 5000,
         page: int = 1,
         limit: int = 50,
+        cursor: Optional[str] = None,
     ) -> Dict[str, Any]:
         """
         批量获取消息
@@ -232,11 +581,25 @@ class MessagesAPI(BaseAPI):
             batch_size: 批量大小
             page: 页码
             limit: 每页数量
+            cursor: 上一页返回的 next_cursor；服务端支持游标分页时按游标续取，忽略 page
 
         Returns:
-            包含消息列表和分页信息的字典
+            包含消息列表和分页信息的字典；服务端支持游标分页时 next_cursor
+            为下一页的游标，否则为 None
         """
-        peer = {"chatType": self._normalize_chat_type(chat_type), "peerUid": peer_uid}
+        peer = {"chatType": _normalize_chat_type(chat_type), "peerUid": peer_uid}
+        return self._fetch_page(peer, filter, batch_size, page, limit, cursor)
+
+    def _fetch_page(
+        self,
+        peer: Dict[str, Any],
+        filter: Optional[MessageFilter],
+        batch_size: int,
+        page: int,
+        limit: int,
+        cursor: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """按已构建的会话参数请求一页消息，逐页请求时会话参数只需构建一次"""
         body = {
             "peer": peer,
             "batchSize": batch_size,
@@ -245,11 +608,13 @@ class MessagesAPI(BaseAPI):
         }
         if filter:
             body["filter"] = filter.to_dict()
+        if cursor is not None:
+            body["cursor"] = cursor
 
         data = self._request("POST", "/api/messages/fetch", json_data=body)
 
         # 解析消息
-        messages = [Message.from_dict(m) for m in data.get("messages", [])]
+        messages = list(map(Message.from_dict, data.get("messages") or ()))
 
         return {
             "messages": messages,
@@ -258,6 +623,7 @@ class MessagesAPI(BaseAPI):
             "total_pages": data.get("totalPages", 1),
             "has_next": data.get("hasNext", False),
             "cache_hit": data.get("cacheHit", False),
+            "next_cursor": data.get("nextCursor"),
         }
 
     def fetch_all(
@@ -266,37 +632,144 @@ class MessagesAPI(BaseAPI):
         peer_uid: str,
         filter: Optional[MessageFilter] = None,
         batch_size: int = 5000,
+        page_size: int = 1000,
     ) -> Generator[List[Message], None, None]:
         """
         获取所有消息（生成器）
 
+        产出当前页之前就在后台请求下一页，调用方处理当前页时下一页已在传输中；
+        提前停止迭代时会取消尚未开始的预取。
+        服务端返回游标（nextCursor）时改用游标分页：每页开销与所在位置无关，
+        遍历期间有新消息到达也不会导致页面错位。
+
         Args:
             chat_type: 聊天类型 (ChatType.PRIVATE, ChatType.GROUP 或 1, 2)
             peer_uid: 对方 UID 或群号
             filter: 消息筛选条件
             batch_size: 批量大小
+            page_size: 每页请求的消息数
 
         Yields:
             消息列表（每页）
         """
+        # 各页的会话参数相同，只构建一次
+        peer = {"chatType": _normalize_chat_type(chat_type), "peerUid": peer_uid}
+
+        def fetch_page(page: int, cursor: Optional[str] = None) -> Dict[str, Any]:
+            return self._fetch_page(peer, filter, batch_size, page, page_size, cursor)
+
+        page = 1
+        result = fetch_page(page)
+        # 首页带有 next_cursor 时说明服务端支持游标分页，之后按游标续取
+        use_cursor = result["next_cursor"] is not None
+        # 使用独立线程池：在 batch_export 的回调（运行于客户端线程池）中迭代时不会互相等待
+        executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="napcat-qce-fetch")
+        pending: Optional[Future] = None
+        try:
+            while True:
+                cursor = result["next_cursor"]
+                if (cursor is not None) if use_cursor else result["has_next"]:
+                    pending = executor.submit(fetch_page, page + 1, cursor)
+
+                messages = result["messages"]
+                if messages:
+                    yield messages
+
+                if pending is None:
+                    break
+                result = pending.result()
+                pending = None
+                page += 1
+        finally:
+            if pending is not None:
+                pending.cancel()
+            executor.shutdown(wait=False)
+
+    def iter(
+        self,
+        chat_type,  # int 或 ChatType
+        peer_uid: str,
+        filter: Optional[MessageFilter] = None,
+        page_size: int = 200,
+    ) -> Generator[Message, None, None]:
+        """
+        逐条遍历消息（生成器）
+
+        按页请求，内存中最多只保留一页消息；提前停止迭代时不会请求后续页面。
+        安装 ijson 后边接收边解析响应，每条消息解析完即产出，
+        不必等整页下载完成，也不会同时保留整页的原始数据。
+
+        Args:
+            chat_type: 聊天类型 (ChatType.PRIVATE, ChatType.GROUP 或 1, 2)
+            peer_uid: 对方 UID 或群号
+            filter: 消息筛选条件
+            page_size: 每页请求的消息数
+
+        Yields:
+            消息
+
+        Example:
+            >>> from itertools import islice
+            >>> for msg in islice(client.messages.iter(ChatType.GROUP, "123456789"), 10):
+            ...     print(msg.msg_id)
+        """
+        peer = {"chatType": _normalize_chat_type(chat_type), "peerUid": peer_uid}
         page = 1
         while True:
-            result = self.fetch(
-                chat_type=chat_type,
-                peer_uid=peer_uid,
-                filter=filter,
-                batch_size=batch_size,
-                page=page,
-                limit=100,
-            )
-            messages = result["messages"]
-            if messages:
-                yield messages
+            if HAS_IJSON:
+                body = {
+                    "peer": peer,
+                    "batchSize": 5000,
+                    "page": page,
+                    "limit": page_size,
+                }
+                if filter:
+                    body["filter"] = filter.to_dict()
+                count, has_next = yield from self._stream_page(body)
+            else:
+                result = self._fetch_page(peer, filter, 5000, page, page_size)
+                messages = result["messages"]
+                yield from messages
+                count, has_next = len(messages), result["has_next"]
 
-            if not result["has_next"]:
+            if not has_next or count < page_size:
                 break
             page += 1
 
+    # 流式解析时消息项在响应中的路径（响应可能带或不带 data 外层）
+    _STREAM_ITEM_PREFIXES = frozenset({"data.messages.item", "messages.item"})
+
+    def _stream_page(self, body: Dict[str, Any]) -> Generator[Message, None, Tuple[int, bool]]:
+        """
+        流式请求一页消息，逐条产出
+
+        消息以外的字段（分页信息、错误信息）照常构建，读完响应后统一检查。
+
+        Returns:
+            (本页消息数, 是否有下一页)
+        """
+        prefixes = self._STREAM_ITEM_PREFIXES
+        response = self._client._request_stream("POST", "/api/messages/fetch", json_data=body)
+        count = 0
+        with response:
+            root = ijson.ObjectBuilder()
+            item = None
+            for prefix, event, value in ijson.parse(response.raw, use_float=True):
+                if item is not None:
+                    item.event(event, value)
+                    if event == "end_map" and prefix in prefixes:
+                        count += 1
+                        yield Message.from_dict(item.value)
+                        item = None
+                elif event == "start_map" and prefix in prefixes:
+                    item = ijson.ObjectBuilder()
+                    item.event(event, value)
+                else:
+                    root.event(event, value)
+
+        meta = _unwrap_response(root.value, response.status_code)
+        return count, bool(meta.get("hasNext", False))
+
     def export(
         self,
         chat_type,  # int 或 ChatType
@@ -320,10 +793,10 @@ class MessagesAPI(BaseAPI):
         Returns:
             导出任务
         """
-        peer = {"chatType": self._normalize_chat_type(chat_type), "peerUid": peer_uid}
+        peer = {"chatType": _normalize_chat_type(chat_type), "peerUid": peer_uid}
         body: Dict[str, Any] = {
             "peer": peer,
-            "format": self._normalize_format(format),
+            "format": _normalize_format(format),
         }
         if filter:
             body["filter"] = filter.to_dict()
@@ -335,6 +808,63 @@ class MessagesAPI(BaseAPI):
         data = self._request("POST", "/api/messages/export", json_data=body)
         return ExportTask.from_dict(data)
 
+    def export_batch(
+        self,
+        targets: List[Dict[str, Any]],
+        format = "JSON",  # str 或 ExportFormat
+        filter: Optional[MessageFilter] = None,
+        options: Optional[ExportOptions] = None,
+        on_error: Optional[Callable[[int, Exception], None]] = None,
+        max_workers: int = 4,
+    ) -> List[Optional[ExportTask]]:
+        """
+        批量创建导出任务
+
+        一次性提交所有导出任务而不等待任何一个完成，服务端会并行处理。
+        提交请求通过最多 max_workers 个线程并发发送。
+        提交后可通过 tasks.wait_for_many 等待各任务完成。
+
+        Args:
+            targets: 导出目标列表，每项包含:
+                - chat_type: 聊天类型 (ChatType 或 1, 2)
+                - peer_uid: 对方 UID 或群号
+                - session_name: 可选，会话名称
+            format: 导出格式 (ExportFormat.HTML 或 "HTML", "JSON", "TXT", "EXCEL")
+            filter: 消息筛选条件（所有目标共用）
+            options: 导出选项（所有目标共用）
+            on_error: 提交失败回调 (index, exception)，按 targets 顺序在当前线程调用；
+                未指定时抛出第一个失败项的异常（其余目标仍会提交）
+            max_workers: 并发提交的线程数，为 1 时逐个提交
+
+        Returns:
+            与 targets 一一对应的导出任务列表，提交失败的项为 None
+        """
+        def submit(target: Dict[str, Any]) -> ExportTask:
+            return self.export(
+                chat_type=target["chat_type"],
+                peer_uid=target["peer_uid"],
+                format=format,
+                filter=filter,
+                options=options,
+                session_name=target.get("session_name"),
+            )
+
+        workers = max(1, min(max_workers, len(targets)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(submit, target) for target in targets]
+
+        tasks: List[Optional[ExportTask]] = []
+        for index, future in enumerate(futures):
+            try:
+                task = future.result()
+            except Exception as e:
+                if on_error is None:
+                    raise
+                on_error(index, e)
+                task = None
+            tasks.append(task)
+        return tasks
+
     def quick_export(
         self,
         chat_type,  # int 或 ChatType
@@ -346,7 +876,8 @@ class MessagesAPI(BaseAPI):
         session_name: Optional[str] = None,
         timeout: float = 600,
         on_progress: Optional[Callable[[ExportTask], None]] = None,
-    ) -> ExportTask:
+        wait: bool = True,
+    ) -> Union[ExportTask, PendingExport]:
         """
         快速导出（创建任务并等待完成）
 
@@ -360,9 +891,10 @@ class MessagesAPI(BaseAPI):
             session_name: 会话名称（可选）
             timeout: 超时时间（秒）
             on_progress: 进度回调函数
+            wait: 为 False 时提交后立即返回 PendingExport，调用其 result() 时才等待
 
         Returns:
-            完成的导出任务
+            完成的导出任务（wait=False 时为 PendingExport）
         """
         # 如果指定了 days，创建筛选器
         if days is not None and filter is None:
@@ -378,6 +910,9 @@ class MessagesAPI(BaseAPI):
             session_name=session_name,
         )
 
+        if not wait:
+            return PendingExport(self._client.tasks, task, timeout=timeout)
+
         # 等待完成
         return self._client.tasks.wait_for_completion(
             task.id,
@@ -389,16 +924,18 @@ class MessagesAPI(BaseAPI):
 class TasksAPI(BaseAPI):
     """任务 API"""
 
-    def get_all(self) -> List[ExportTask]:
+    def get_all(self) -> Sequence[ExportTask]:
         """
         获取所有导出任务
 
+        任务历史可能很长，返回的列表在访问某一项时才构建对应的任务对象，
+        只查看数量或前几项时不必解析全部任务。
+
         Returns:
-            任务列表
+            任务列表（只读，支持索引、切片和遍历）
         """
         data = self._request("GET", "/api/tasks")
-        tasks_data = data.get("tasks", [])
-        return [ExportTask.from_dict(t) for t in tasks_data]
+        return LazyList(data.get("tasks") or [], ExportTask.from_dict)
 
     def get(self, task_id: str) -> ExportTask:
         """
@@ -413,6 +950,37 @@ class TasksAPI(BaseAPI):
         data = self._request("GET", f"/api/tasks/{task_id}")
         return ExportTask.from_dict(data)
 
+    def get_many(self, task_ids: List[str]) -> Dict[str, ExportTask]:
+        """
+        批量获取多个任务
+
+        通过一次任务列表请求获取所有任务，再按 ID 筛选，只为所需的任务构建对象。
+        只有一个任务时直接查询该任务；列表中不存在的任务并行单独查询。
+
+        Args:
+            task_ids: 任务 ID 列表
+
+        Returns:
+            {任务 ID: 任务详情}
+        """
+        wanted = set(task_ids)
+        if len(wanted) == 1:
+            task_id = next(iter(wanted))
+            return {task_id: self.get(task_id)}
+
+        data = self._request("GET", "/api/tasks")
+        tasks: Dict[str, ExportTask] = {}
+        for item in data.get("tasks", []):
+            task_id = item.get("id") or item.get("taskId") or item.get("task_id")
+            if task_id in wanted:
+                tasks[task_id] = ExportTask.from_dict(item)
+
+        missing = [task_id for task_id in dict.fromkeys(task_ids) if task_id not in tasks]
+        if missing:
+            # 使用独立线程池，在客户端线程池的回调中调用时不会互相等待
+            tasks.update(self._map_concurrent(self.get, missing, 8, None))
+        return tasks
+
     def delete(self, task_id: str) -> bool:
         """
         删除任务
@@ -426,6 +994,27 @@ class TasksAPI(BaseAPI):
         self._request("DELETE", f"/api/tasks/{task_id}")
         return True
 
+    def delete_many(
+        self,
+        task_ids: List[str],
+        max_workers: int = 8,
+        on_error: Optional[Callable[[str, Exception], None]] = None,
+    ) -> Dict[str, bool]:
+        """
+        并发删除多个任务
+
+        服务端没有批量接口，这里通过最多 max_workers 个线程并发发送单个请求。
+
+        Args:
+            task_ids: 任务 ID 列表（重复的只处理一次）
+            max_workers: 并发请求数
+            on_error: 失败回调 (task_id, exception)；未指定时抛出第一个失败项的异常
+
+        Returns:
+            {task_id: 是否成功}，失败的项不包含在结果中
+        """
+        return self._map_concurrent(self.delete, task_ids, max_workers, on_error)
+
     def delete_original_files(self, task_id: str) -> bool:
         """
         删除 ZIP 导出任务的原始文件
@@ -439,12 +1028,166 @@ class TasksAPI(BaseAPI):
         self._request("DELETE", f"/api/tasks/{task_id}/original-files")
         return True
 
+    # WebSocket 模式下无事件时的兜底查询间隔（秒）
+    STREAM_RESYNC_INTERVAL = 15
+
+    # 轮询模式的初始间隔（秒），之后按 1.5 倍递增至 poll_interval
+    POLL_MIN_INTERVAL = 0.1
+
+    # 任务进度长时间不变时，轮询间隔最长可增至此值（秒）
+    MAX_POLL_INTERVAL = 15.0
+
+    # 推送通道连接失败后，多少秒内不再尝试连接（直接使用轮询）
+    STREAM_RETRY_INTERVAL = 60.0
+
+    # 推送通道下次允许尝试连接的时间（time.monotonic()），None 表示随时可连接
+    _stream_retry_at: Optional[float] = None
+
+    @staticmethod
+    def _next_poll_interval(
+        interval: float,
+        progressed: bool,
+        poll_interval: float,
+        max_poll_interval: Optional[float],
+    ) -> float:
+        """计算下一次轮询间隔：有进展时不超过 poll_interval，无进展时继续增长至 max_poll_interval"""
+        limit = poll_interval
+        if not progressed and max_poll_interval is not None:
+            limit = max(poll_interval, max_poll_interval)
+        return min(interval * 1.5, limit)
+
+    def _open_event_stream(self) -> Optional["websocket.WebSocket"]:
+        """
+        连接服务端事件推送，不可用时返回 None
+
+        连接失败后 STREAM_RETRY_INTERVAL 秒内直接返回 None，
+        连续等待多个任务时不会每次都等待连接超时。
+        """
+        if not HAS_WEBSOCKET:
+            return None
+        retry_at = self._stream_retry_at
+        if retry_at is not None and time.monotonic() < retry_at:
+            return None
+        try:
+            conn = websocket.create_connection(self._client.ws_url, timeout=5)
+        except Exception:
+            self._stream_retry_at = time.monotonic() + self.STREAM_RETRY_INTERVAL
+            return None
+        self._stream_retry_at = None
+        return conn
+
+    @staticmethod
+    def _apply_progress_event(task: ExportTask, data: Dict[str, Any]) -> ExportTask:
+        """将 export_progress 推送事件合并到任务状态中"""
+        return dataclasses.replace(
+            task,
+            status=TaskStatus.RUNNING,
+            progress=data.get("progress", task.progress),
+            message_count=data.get("messageCount", task.message_count),
+        )
+
+    def stream_progress(
+        self,
+        task_id: str,
+        timeout: float = 300,
+        poll_interval: float = 2,
+        use_websocket: bool = True,
+        max_poll_interval: Optional[float] = MAX_POLL_INTERVAL,
+    ) -> Generator[ExportTask, None, None]:
+        """
+        逐个产出任务的进度更新，直到任务结束
+
+        优先通过 WebSocket 接收服务端推送的进度事件，只在状态变化时产出；
+        未安装 websocket-client 或连接失败时退回到轮询，轮询间隔从 0.1 秒开始
+        按 1.5 倍递增，最长为 poll_interval，短任务可以更快返回。
+        轮询结果与上次完全相同时不重新构建任务对象，也不产出。
+        进度长时间不变（如服务端仍在排队）时间隔继续增长至 max_poll_interval，
+        一旦进度变化便回落到 poll_interval 以内。
+
+        Args:
+            task_id: 任务 ID
+            timeout: 超时时间（秒）
+            poll_interval: 有进展时的最大轮询间隔（秒，仅轮询模式使用）
+            use_websocket: 是否尝试使用 WebSocket 推送
+            max_poll_interval: 无进展时的最大轮询间隔（秒），为 None 时与 poll_interval 相同
+
+        Yields:
+            任务的最新状态，最后一项为已结束（完成/失败/取消）的任务
+
+        Raises:
+            TimeoutError: 超时
+        """
+        deadline = time.monotonic() + timeout
+        conn = self._open_event_stream() if use_websocket else None
+        finished = (TaskStatus.COMPLETED, TaskStatus.FAILED, TaskStatus.CANCELLED)
+        interval = min(self.POLL_MIN_INTERVAL, poll_interval)
+
+        try:
+            # 先订阅再查询，避免错过连接建立前已发生的状态变化
+            last_data = self._request("GET", f"/api/tasks/{task_id}")
+            task = ExportTask.from_dict(last_data)
+            yield task
+
+            while task.status not in finished:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise TimeoutError(f"等待任务完成超时: {task_id}")
+
+                if conn is None:
+                    time.sleep(min(interval, remaining))
+                    data = self._request("GET", f"/api/tasks/{task_id}")
+                    if data == last_data:
+                        interval = self._next_poll_interval(
+                            interval, False, poll_interval, max_poll_interval,
+                        )
+                        continue
+                    previous = task.progress
+                    last_data = data
+                    task = ExportTask.from_dict(data)
+                    interval = self._next_poll_interval(
+                        interval, task.progress != previous, poll_interval, max_poll_interval,
+                    )
+                    yield task
+                    continue
+
+                try:
+                    conn.settimeout(min(self.STREAM_RESYNC_INTERVAL, remaining))
+                    event = json_loads(conn.recv())
+                except websocket.WebSocketTimeoutException:
+                    # 长时间无事件，主动查询一次
+                    task = self.get(task_id)
+                    yield task
+                    continue
+                except (websocket.WebSocketException, OSError, ValueError):
+                    # 推送通道异常，改为轮询
+                    conn.close()
+                    conn = None
+                    continue
+
+                data = event.get("data") or {}
+                if data.get("taskId") != task_id:
+                    continue
+
+                event_type = event.get("type")
+                if event_type == "export_progress":
+                    task = self._apply_progress_event(task, data)
+                    yield task
+                elif event_type in ("export_complete", "export_error"):
+                    # 以服务端记录的最终状态为准
+                    task = self.get(task_id)
+                    yield task
+        finally:
+            if conn is not None:
+                conn.close(timeout=1)
+
     def wait_for_completion(
         self,
         task_id: str,
         timeout: float = 300,
         poll_interval: float = 2,
         on_progress: Optional[Callable[[ExportTask], None]] = None,
+        use_websocket: bool = True,
+        max_poll_interval: Optional[float] = MAX_POLL_INTERVAL,
     ) -> ExportTask:
         """
         等待任务完成
@@ -452,8 +1195,10 @@ class TasksAPI(BaseAPI):
         Args:
             task_id: 任务 ID
             timeout: 超时时间（秒）
-            poll_interval: 轮询间隔（秒）
+            poll_interval: 有进展时的最大轮询间隔（秒，WebSocket 不可用时使用）
             on_progress: 进度回调函数
+            use_websocket: 是否优先使用 WebSocket 推送（见 stream_progress）
+            max_poll_interval: 进度不变时的最大轮询间隔（秒）
 
         Returns:
             完成的任务
@@ -462,32 +1207,154 @@ class TasksAPI(BaseAPI):
             TimeoutError: 超时
             APIError: 任务失败
         """
-        start_time = time.time()
-        while True:
-            task = self.get(task_id)
-
+        for task in self.stream_progress(
+            task_id, timeout, poll_interval, use_websocket, max_poll_interval,
+        ):
             if on_progress:
                 on_progress(task)
 
-            if task.status == TaskStatus.COMPLETED:
-                return task
-            elif task.status == TaskStatus.FAILED:
-                raise APIError(
-                    message=f"任务失败: {task.error}",
-                    code="TASK_FAILED",
-                    details={"task_id": task_id, "error": task.error},
-                )
-            elif task.status == TaskStatus.CANCELLED:
-                raise APIError(
-                    message="任务已取消",
-                    code="TASK_CANCELLED",
-                    details={"task_id": task_id},
-                )
+        if task.status == TaskStatus.FAILED:
+            raise APIError(
+                message=f"任务失败: {task.error}",
+                code="TASK_FAILED",
+                details={"task_id": task_id, "error": task.error},
+            )
+        elif task.status == TaskStatus.CANCELLED:
+            raise APIError(
+                message="任务已取消",
+                code="TASK_CANCELLED",
+                details={"task_id": task_id},
+            )
+        return task
+
+    def wait_for_many(
+        self,
+        task_ids: List[str],
+        timeout: float = 600,
+        poll_interval: float = 2,
+        on_progress: Optional[Callable[[str, ExportTask], None]] = None,
+        return_when: str = "all",
+        use_websocket: bool = True,
+        on_done: Optional[Callable[[str, ExportTask], Optional[Sequence[str]]]] = None,
+        max_poll_interval: Optional[float] = MAX_POLL_INTERVAL,
+    ) -> Dict[str, ExportTask]:
+        """
+        同时等待多个任务结束
+
+        每次查询只发送一次请求（见 get_many），任务一结束立即回调，
+        不会因为前面的任务耗时较长而推迟后面任务的处理。
+        WebSocket 可用时由推送事件驱动：进度事件直接回调，收到完成/失败事件才重新查询；
+        否则退回到间隔递增的轮询（同 stream_progress）。
+
+        Args:
+            task_ids: 任务 ID 列表
+            timeout: 总超时时间（秒）
+            poll_interval: 最大轮询间隔（秒，仅轮询模式使用）
+            on_progress: 进度回调 (task_id, task)，任务状态或进度变化时调用
+            return_when: "all" 等待全部结束；"first" 至少一个任务结束即返回
+            use_websocket: 是否尝试使用 WebSocket 推送
+            on_done: 结束回调 (task_id, task)，每个任务结束（完成/失败/取消）时调用一次；
+                返回任务 ID 列表（可为空）时，列表中的任务加入本次等待，超时时间从此刻重新计算
+            max_poll_interval: 所有任务进度都不变时的最大轮询间隔（秒，仅轮询模式使用）
+
+        Returns:
+            {任务 ID: 已结束的任务}，失败或取消的任务也包含在内，需检查 status
+
+        Raises:
+            TimeoutError: 超时
+        """
+        finished = (TaskStatus.COMPLETED, TaskStatus.FAILED, TaskStatus.CANCELLED)
+        deadline = time.monotonic() + timeout
+        pending = list(dict.fromkeys(task_ids))
+        latest: Dict[str, ExportTask] = {}
+        last_seen: Dict[str, tuple] = {}
+        results: Dict[str, ExportTask] = {}
+        conn = self._open_event_stream() if use_websocket else None
+        interval = min(self.POLL_MIN_INTERVAL, poll_interval)
+
+        def report(task_id: str, task: ExportTask) -> bool:
+            latest[task_id] = task
+            state = (task.status, task.progress)
+            changed = last_seen.get(task_id) != state
+            if on_progress and changed:
+                on_progress(task_id, task)
+            last_seen[task_id] = state
+            return changed
+
+        try:
+            while pending:
+                progressed = False
+                added: Optional[List[str]] = None
+                tasks = self.get_many(pending)
+                for task_id in pending:
+                    task = tasks[task_id]
+                    progressed = report(task_id, task) or progressed
+                    if task.status in finished:
+                        results[task_id] = task
+                        if on_done:
+                            more = on_done(task_id, task)
+                            if more is not None:
+                                added = (added or []) + list(more)
+
+                pending = [task_id for task_id in pending if task_id not in results]
+                if added is not None:
+                    pending.extend(
+                        task_id for task_id in dict.fromkeys(added)
+                        if task_id not in results and task_id not in pending
+                    )
+                    deadline = time.monotonic() + timeout
+                if not pending or (return_when == "first" and results):
+                    break
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise TimeoutError(f"等待任务完成超时: {', '.join(pending)}")
 
-            if time.time() - start_time > timeout:
-                raise TimeoutError(f"等待任务完成超时: {task_id}")
+                if conn is None:
+                    time.sleep(min(interval, remaining))
+                    interval = self._next_poll_interval(
+                        interval, progressed, poll_interval, max_poll_interval,
+                    )
+                    continue
+
+                # 等待推送：进度事件直接回调，任一任务结束或长时间无事件时重新查询
+                wait_until = time.monotonic() + min(self.STREAM_RESYNC_INTERVAL, remaining)
+                while True:
+                    wait = wait_until - time.monotonic()
+                    if wait <= 0:
+                        break
+                    try:
+                        conn.settimeout(wait)
+                        event = json_loads(conn.recv())
+                    except websocket.WebSocketTimeoutException:
+                        break
+                    except (websocket.WebSocketException, OSError, ValueError):
+                        # 推送通道异常，改为轮询
+                        conn.close()
+                        conn = None
+                        break
+
+                    data = event.get("data") or {}
+                    event_task_id = data.get("taskId")
+                    if not isinstance(event_task_id, str) or event_task_id not in pending:
+                        continue
+                    if event_task_id not in latest:
+                        # 刚加入等待、尚未查询过的任务，重新查询一次
+                        break
+
+                    event_type = event.get("type")
+                    if event_type == "export_progress":
+                        report(
+                            event_task_id,
+                            self._apply_progress_event(latest[event_task_id], data),
+                        )
+                    elif event_type in ("export_complete", "export_error"):
+                        break
+        finally:
+            if conn is not None:
+                conn.close(timeout=1)
 
-            time.sleep(poll_interval)
+        return results
 
 
 class ScheduledExportsAPI(BaseAPI):
@@ -506,16 +1373,37 @@ class ScheduledExportsAPI(BaseAPI):
         data = self._request("POST", "/api/scheduled-exports", json_data=config.to_dict())
         return ScheduledExport.from_dict(data)
 
-    def get_all(self) -> List[ScheduledExport]:
+    def get_all(self, include_history: int = 0) -> List[ScheduledExport]:
         """
         获取所有定时导出任务
 
+        Args:
+            include_history: 同时获取每个任务最近的 N 条执行历史，写入 .history；
+                服务端未在列表中返回历史时，改为并行请求各任务的历史
+
         Returns:
             定时导出任务列表
         """
-        data = self._request("GET", "/api/scheduled-exports")
+        params = {"includeHistory": include_history} if include_history > 0 else None
+        data = self._request("GET", "/api/scheduled-exports", params=params)
         exports_data = data.get("scheduledExports", [])
-        return [ScheduledExport.from_dict(e) for e in exports_data]
+        exports = list(map(ScheduledExport.from_dict, exports_data))
+
+        if include_history > 0:
+            missing = [
+                export for export, raw in zip(exports, exports_data)
+                if "history" not in raw
+            ]
+            if missing:
+                # 使用独立线程池，在客户端线程池的回调中调用时不会互相等待
+                histories = self._map_concurrent(
+                    lambda export_id: self.get_history(export_id, include_history),
+                    [export.id for export in missing], 8, None,
+                )
+                for export in missing:
+                    export.history = histories[export.id]
+
+        return exports
 
     def get(self, export_id: str) -> ScheduledExport:
         """
@@ -595,27 +1483,83 @@ class ScheduledExportsAPI(BaseAPI):
         """禁用定时导出任务"""
         return self.update(export_id, {"enabled": False})
 
+    def disable_many(
+        self,
+        export_ids: List[str],
+        max_workers: int = 8,
+        on_error: Optional[Callable[[str, Exception], None]] = None,
+    ) -> Dict[str, ScheduledExport]:
+        """
+        并发禁用多个定时导出任务
+
+        服务端没有批量接口，这里通过最多 max_workers 个线程并发发送单个请求。
+
+        Args:
+            export_ids: 任务 ID 列表（重复的只处理一次）
+            max_workers: 并发请求数
+            on_error: 失败回调 (export_id, exception)；未指定时抛出第一个失败项的异常
+
+        Returns:
+            {export_id: 更新后的定时导出任务}，失败的项不包含在结果中
+        """
+        return self._map_concurrent(self.disable, export_ids, max_workers, on_error)
+
+    def trigger_many(
+        self,
+        export_ids: List[str],
+        max_workers: int = 8,
+        on_error: Optional[Callable[[str, Exception], None]] = None,
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        并发手动触发多个定时导出任务
+
+        服务端没有批量接口，这里通过最多 max_workers 个线程并发发送单个请求。
+
+        Args:
+            export_ids: 任务 ID 列表（重复的只处理一次）
+            max_workers: 并发请求数
+            on_error: 失败回调 (export_id, exception)；未指定时抛出第一个失败项的异常
+
+        Returns:
+            {export_id: 触发结果}，失败的项不包含在结果中
+        """
+        return self._map_concurrent(self.trigger, export_ids, max_workers, on_error)
+
 
 class StickerPacksAPI(BaseAPI):
     """表情包 API"""
 
-    def get_all(self, types: Optional[List[str]] = None) -> List[StickerPack]:
+    def get_all(
+        self,
+        types: Optional[List[str]] = None,
+        force_refresh: bool = False,
+    ) -> List[StickerPack]:
         """
         获取所有表情包
 
+        结果在客户端缓存 cache_ttl 秒（默认 30），并发的相同调用只会发送一次请求。
+
         Args:
             types: 类型筛选 (favorite_emoji, market_pack, system_pack)
+            force_refresh: 是否跳过客户端缓存
 
         Returns:
             表情包列表
         """
-        params = {}
-        if types:
-            params["types"] = ",".join(types)
+        # 列表不可哈希，转为逗号分隔的字符串作为缓存键
+        return self._get_all(",".join(types) if types else None, force_refresh=force_refresh)
 
-        data = self._request("GET", "/api/sticker-packs", params=params if params else None)
+    @cached_with_inflight(ttl=30, bypass="force_refresh")
+    def _get_all(self, types: Optional[str], force_refresh: bool = False) -> List[StickerPack]:
+        data = self._request(
+            "GET", "/api/sticker-packs", params={"types": types} if types else None,
+        )
         packs_data = data.get("packs", [])
-        return [StickerPack.from_dict(p) for p in packs_data]
+        return list(map(StickerPack.from_dict, packs_data))
+
+    def invalidate(self):
+        """清空表情包列表缓存，下次 get_all 将重新请求"""
+        StickerPacksAPI._get_all.invalidate(self)
 
     def export(self, pack_id: str) -> Dict[str, Any]:
         """
@@ -664,7 +1608,7 @@ class ExportFilesAPI(BaseAPI):
         """
         data = self._request("GET", "/api/exports/files")
         files_data = data.get("files", [])
-        return [ExportFile.from_dict(f) for f in files_data]
+        return list(map(ExportFile.from_dict, files_data))
 
     def get_info(self, file_name: str) -> ExportFile:
         """
@@ -692,6 +1636,94 @@ class ExportFilesAPI(BaseAPI):
         self._request("DELETE", f"/api/exports/files/{file_name}")
         return True
 
+    def delete_many(
+        self,
+        file_names: List[str],
+        max_workers: int = 8,
+        on_error: Optional[Callable[[str, Exception], None]] = None,
+    ) -> Dict[str, bool]:
+        """
+        并发删除多个导出文件
+
+        服务端没有批量接口，这里通过最多 max_workers 个线程并发发送单个请求。
+
+        Args:
+            file_names: 文件名列表（重复的只处理一次）
+            max_workers: 并发请求数
+            on_error: 失败回调 (file_name, exception)；未指定时抛出第一个失败项的异常
+
+        Returns:
+            {file_name: 是否成功}，失败的项不包含在结果中
+        """
+        return self._map_concurrent(self.delete, file_names, max_workers, on_error)
+
+    def download(
+        self,
+        file_name: str,
+        output_path: str,
+        is_scheduled: bool = False,
+        chunk_size: int = 1 << 20,
+        on_progress: Optional[Callable[[int, Optional[int]], None]] = None,
+    ) -> str:
+        """
+        下载导出文件到本地
+
+        以流的方式边下载边写入，不会把整个文件读入内存，适用于服务端在其他机器上的情况。
+        不需要进度回调时直接在连接和文件之间按块复制，不逐块产生中间对象。
+
+        Args:
+            file_name: 文件名
+            output_path: 保存路径
+            is_scheduled: 是否为定时导出文件
+            chunk_size: 每次写入的块大小（字节）
+            on_progress: 进度回调 (已下载字节数, 总字节数)，每写入一块调用一次；
+                服务端未返回 Content-Length 时总字节数为 None
+
+        Returns:
+            保存路径
+
+        Raises:
+            APIError: 服务端返回错误
+            NetworkError: 网络错误
+        """
+        url = self.get_download_url(file_name, is_scheduled=is_scheduled)
+        try:
+            with self._client._session.get(
+                url,
+                stream=True,
+                timeout=self._client.timeout,
+                verify=self._client.verify_ssl,
+            ) as response:
+                if response.status_code >= 400:
+                    raise APIError(
+                        message=f"下载失败: {response.status_code}",
+                        status_code=response.status_code,
+                        details={"file_name": file_name},
+                    )
+                try:
+                    with open(output_path, "wb") as f:
+                        if on_progress is None:
+                            # 读取时按 Content-Encoding 解压，与 iter_content 一致
+                            response.raw.decode_content = True
+                            shutil.copyfileobj(response.raw, f, chunk_size)
+                        else:
+                            length = response.headers.get("Content-Length")
+                            total = int(length) if length and length.isdigit() else None
+                            downloaded = 0
+                            for chunk in response.iter_content(chunk_size=chunk_size):
+                                f.write(chunk)
+                                downloaded += len(chunk)
+                                on_progress(downloaded, total)
+                except BaseException:
+                    # 不保留下载了一半的文件
+                    if os.path.exists(output_path):
+                        os.remove(output_path)
+                    raise
+        except (requests.exceptions.RequestException, urllib3.exceptions.HTTPError) as e:
+            # 直接从 response.raw 读取时，连接中断等错误以 urllib3 异常的形式抛出
+            raise NetworkError(f"下载失败: {e}") from e
+        return output_path
+
     def get_preview_url(self, file_name: str) -> str:
         """
         获取文件预览 URL
@@ -722,16 +1754,26 @@ class ExportFilesAPI(BaseAPI):
 class SystemAPI(BaseAPI):
     """系统 API"""
 
-    def get_info(self) -> SystemInfo:
+    @cached_with_inflight(ttl=30, bypass="force_refresh")
+    def get_info(self, force_refresh: bool = False) -> SystemInfo:
         """
         获取系统信息
 
+        结果在客户端缓存 cache_ttl 秒（默认 30），并发的相同调用只会发送一次请求。
+
+        Args:
+            force_refresh: 是否跳过客户端缓存
+
         Returns:
             系统信息
         """
         data = self._request("GET", "/api/system/info")
         return SystemInfo.from_dict(data)
 
+    def invalidate(self):
+        """清空系统信息缓存，下次 get_info 将重新请求"""
+        SystemAPI.get_info.invalidate(self)
+
     def get_status(self) -> Dict[str, Any]:
         """
         获取系统状态
@@ -760,6 +1802,35 @@ class SystemAPI(BaseAPI):
         return self._client._request("GET", "/security-status")
 
 
+class BootstrapData:
+    """
+    预取的启动数据
+
+    由 NapCatQCE.prefetch_bootstrap() 返回。各请求在后台并行进行，
+    首次访问对应属性时才会等待结果（请求失败时在访问处抛出异常）。
+    """
+
+    def __init__(self, info: Future, groups: Future, friends: Future):
+        self._info = info
+        self._groups = groups
+        self._friends = friends
+
+    @property
+    def info(self) -> SystemInfo:
+        """系统信息"""
+        return self._info.result()
+
+    @property
+    def groups(self) -> List[Group]:
+        """群组列表"""
+        return self._groups.result()
+
+    @property
+    def friends(self) -> List[Friend]:
+        """好友列表"""
+        return self._friends.result()
+
+
 class NapCatQCE:
     """
     NapCat-QCE Python SDK 主客户端
@@ -775,6 +1846,34 @@ class NapCatQCE:
 
     DEFAULT_HOST = "localhost"
     DEFAULT_PORT = 40653
+    # 最近一次请求成功后多少秒内，is_connected 不再发送探测请求
+    CONNECTED_CACHE_TTL = 5.0
+
+    # 开启 compress_requests 时，请求体超过此大小（字节）才压缩
+    COMPRESS_MIN_SIZE = 4096
+
+    # API 模块在首次访问时创建（见 __getattr__），只用到部分模块时不必全部构造
+    _API_CLASSES: Dict[str, type] = {
+        "groups": GroupsAPI,
+        "friends": FriendsAPI,
+        "users": UsersAPI,
+        "messages": MessagesAPI,
+        "tasks": TasksAPI,
+        "scheduled_exports": ScheduledExportsAPI,
+        "sticker_packs": StickerPacksAPI,
+        "export_files": ExportFilesAPI,
+        "system": SystemAPI,
+    }
+
+    groups: GroupsAPI
+    friends: FriendsAPI
+    users: UsersAPI
+    messages: MessagesAPI
+    tasks: TasksAPI
+    scheduled_exports: ScheduledExportsAPI
+    sticker_packs: StickerPacksAPI
+    export_files: ExportFilesAPI
+    system: SystemAPI
 
     def __init__(
         self,
@@ -783,6 +1882,11 @@ class NapCatQCE:
         port: int = DEFAULT_PORT,
         timeout: float = 30.0,
         verify_ssl: bool = True,
+        pool_size: int = 32,
+        cache_ttl: float = 30,
+        compress_requests: bool = False,
+        etag_cache_size: int = 256,
+        rpm: Optional[float] = None,
     ):
         """
         初始化客户端
@@ -793,115 +1897,244 @@ class NapCatQCE:
             port: 服务器端口
             timeout: 请求超时时间（秒）
             verify_ssl: 是否验证 SSL 证书
+            pool_size: 连接池可保持的最大连接数，多线程并发请求时可适当调大
+            cache_ttl: 群组/好友列表、系统信息等的缓存有效期（秒），为 0 时不缓存
+            compress_requests: 是否 gzip 压缩较大的请求体（超过 COMPRESS_MIN_SIZE 字节）；
+                连接远程服务器且网络较慢时可开启，本机连接时始终不压缩
+            etag_cache_size: 按 ETag 缓存的 GET 响应数量上限，为 0 时不使用条件请求
+            rpm: 每分钟最多发送的请求数（令牌桶限流，允许短时突发），为 None 时不限制；
+                批量导出、批量查询时可避免请求过快导致服务端返回 503
         """
         self.host = host
         self.port = port
         self.token = token
         self.timeout = timeout
         self.verify_ssl = verify_ssl
+        self.cache_ttl = cache_ttl
+        # 本机通信时压缩只会增加 CPU 开销
+        self.compress_requests = compress_requests and host not in _LOCAL_HOSTS
 
         self.base_url = f"http://{host}:{port}"
+        self.ws_url = f"ws://{host}:{port}"
+
+        # 后台请求线程池（首次使用时创建）
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+
+        # 最近一次请求成功的时间，供 is_connected 跳过探测
+        self._last_ok: Optional[float] = None
+
+        # GET 响应的 ETag 缓存 {请求键: (ETag, 响应体)}，按最近使用顺序淘汰
+        self.etag_cache_size = etag_cache_size
+        self._etag_cache: "OrderedDict[str, Tuple[str, bytes]]" = OrderedDict()
+        self._etag_lock = threading.Lock()
 
-        # 创建 session
+        # 客户端限流（所有请求共用）
+        self._rate_limiter = RateLimiter(rpm) if rpm else None
+
+        # 创建 session（连接池复用 TCP 连接；仅对幂等请求自动重试，避免重复创建导出任务）
+        # 网关类错误（502/503/504）同样重试；重试用尽后返回最后一次响应，按常规错误处理
         self._session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=16,
+            pool_maxsize=pool_size,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.2,
+                status_forcelist=(502, 503, 504),
+                raise_on_status=False,
+            ),
+        )
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
         if token:
             self._session.headers["Authorization"] = f"Bearer {token}"
 
-        # 初始化各 API 模块
-        self.groups = GroupsAPI(self)
-        self.friends = FriendsAPI(self)
-        self.users = UsersAPI(self)
-        self.messages = MessagesAPI(self)
-        self.tasks = TasksAPI(self)
-        self.scheduled_exports = ScheduledExportsAPI(self)
-        self.sticker_packs = StickerPacksAPI(self)
-        self.export_files = ExportFilesAPI(self)
-        self.system = SystemAPI(self)
+    def __getattr__(self, name: str) -> Any:
+        """首次访问 API 模块时创建实例，之后直接从实例属性读取"""
+        cls = NapCatQCE._API_CLASSES.get(name)
+        if cls is None:
+            raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
+        # setdefault 保证并发首次访问时所有线程拿到同一个实例
+        return self.__dict__.setdefault(name, cls(self))
 
-    def _request(
+    def __dir__(self) -> List[str]:
+        return sorted(set(super().__dir__()) | set(NapCatQCE._API_CLASSES))
+
+    def _send(
         self,
         method: str,
         endpoint: str,
         params: Optional[Dict[str, Any]] = None,
         json_data: Optional[Dict[str, Any]] = None,
         **kwargs,
-    ) -> Dict[str, Any]:
+    ) -> requests.Response:
         """
-        发送 HTTP 请求
-
-        Args:
-            method: HTTP 方法
-            endpoint: API 端点
-            params: 查询参数
-            json_data: JSON 请求体
-            **kwargs: 其他请求参数
-
-        Returns:
-            响应数据
+        发送 HTTP 请求并处理网络错误和认证失败，不读取响应体
 
         Raises:
             AuthenticationError: 认证失败
-            ValidationError: 参数验证失败
-            APIError: API 调用失败
             NetworkError: 网络错误
         """
-        url = urljoin(self.base_url, endpoint)
+        # 直接拼接，无需 urljoin 解析；兼容不以 "/" 开头的端点
+        if endpoint[:1] == "/":
+            url = self.base_url + endpoint
+        else:
+            url = self.base_url + "/" + endpoint
+
+        # 请求体自行序列化（已安装 orjson 时更快），响应同理
+        body = None
+        if json_data is not None:
+            body = json_dumps(json_data)
+            headers = {"Content-Type": "application/json"}
+            if self.compress_requests and len(body) > self.COMPRESS_MIN_SIZE:
+                body = gzip.compress(body, compresslevel=1)
+                headers["Content-Encoding"] = "gzip"
+            kwargs["headers"] = {**headers, **kwargs.get("headers", {})}
+
+        if self._rate_limiter is not None:
+            self._rate_limiter.acquire()
 
         try:
             response = self._session.request(
                 method=method,
                 url=url,
                 params=params,
-                json=json_data,
+                data=body,
                 timeout=self.timeout,
                 verify=self.verify_ssl,
                 **kwargs,
             )
         except requests.exceptions.ConnectionError as e:
+            self._last_ok = None
             raise NetworkError(f"无法连接到服务器: {self.base_url}") from e
         except requests.exceptions.Timeout as e:
+            self._last_ok = None
             raise NetworkError(f"请求超时: {url}") from e
         except requests.exceptions.RequestException as e:
+            self._last_ok = None
             raise NetworkError(f"请求失败: {e}") from e
 
-        # 处理响应
-        if response.status_code == 401:
+        # 常见的成功响应只需一次比较
+        status_code = response.status_code
+        if status_code < 400:
+            self._last_ok = time.monotonic()
+        elif status_code == 401:
+            self._last_ok = None
+            response.close()
             raise AuthenticationError("认证失败，请检查访问令牌")
-        elif response.status_code == 403:
+        elif status_code == 403:
+            self._last_ok = None
+            response.close()
             raise AuthenticationError("访问被拒绝，令牌无效或已过期")
-
+        else:
+            # 4xx 说明服务器可达；5xx 视为连接状态未知
+            self._last_ok = None if status_code >= 500 else time.monotonic()
+        return response
+
+    @staticmethod
+    def _parse_response(content: bytes, status_code: int) -> Dict[str, Any]:
+        """解析响应体，失败时抛出对应异常，成功时返回 data 字段"""
         try:
-            data = response.json()
-        except json.JSONDecodeError:
-            if response.status_code >= 400:
+            data = json_loads(content)
+        except ValueError:
+            if status_code >= 400:
                 raise APIError(
-                    message=f"服务器返回错误: {response.status_code}",
-                    status_code=response.status_code,
+                    message=f"服务器返回错误: {status_code}",
+                    status_code=status_code,
                 )
             return {}
 
-        # 检查 API 响应
-        if not data.get("success", True):
-            error = data.get("error", {})
-            error_type = error.get("type", "UNKNOWN_ERROR")
-            error_message = error.get("message", "未知错误")
-            error_code = error.get("context", {}).get("code", error_type)
-
-            if error_type == "AUTH_ERROR":
-                raise AuthenticationError(error_message, code=error_code)
-            elif error_type == "VALIDATION_ERROR":
-                raise ValidationError(error_message, code=error_code)
-            elif error_code == "TASK_NOT_FOUND":
-                raise TaskNotFoundError(error.get("context", {}).get("taskId", "unknown"))
-            else:
-                raise APIError(
-                    message=error_message,
-                    code=error_code,
-                    status_code=response.status_code,
-                    details=error,
-                )
+        return _unwrap_response(data, status_code)
 
-        return data.get("data", data)
+    def _request(
+        self,
+        method: str,
+        endpoint: str,
+        params: Optional[Dict[str, Any]] = None,
+        json_data: Optional[Dict[str, Any]] = None,
+        **kwargs,
+    ) -> Dict[str, Any]:
+        """
+        发送 HTTP 请求
+
+        Args:
+            method: HTTP 方法
+            endpoint: API 端点
+            params: 查询参数
+            json_data: JSON 请求体
+            **kwargs: 其他请求参数
+
+        Returns:
+            响应数据
+
+        Raises:
+            AuthenticationError: 认证失败
+            ValidationError: 参数验证失败
+            APIError: API 调用失败
+            NetworkError: 网络错误
+        """
+        # GET 请求带上已缓存的 ETag，内容未变时服务端返回 304，省去传输响应体
+        cache_key = None
+        cached = None
+        if method == "GET" and self.etag_cache_size > 0:
+            cache_key = endpoint if not params else endpoint + "?" + repr(sorted(params.items()))
+            with self._etag_lock:
+                cached = self._etag_cache.get(cache_key)
+                if cached is not None:
+                    self._etag_cache.move_to_end(cache_key)
+            if cached is not None:
+                kwargs["headers"] = {"If-None-Match": cached[0], **kwargs.get("headers", {})}
+
+        response = self._send(method, endpoint, params, json_data, **kwargs)
+        status_code = response.status_code
+        content = response.content
+        if cache_key is not None:
+            if status_code == 304 and cached is not None:
+                # 每次重新解析缓存的响应体，调用方修改返回值不会影响缓存
+                content = cached[1]
+                status_code = 200
+            elif status_code < 300:
+                etag = response.headers.get("ETag")
+                if etag:
+                    self._store_etag(cache_key, etag, content)
+
+        return self._parse_response(content, status_code)
+
+    def _request_stream(
+        self,
+        method: str,
+        endpoint: str,
+        params: Optional[Dict[str, Any]] = None,
+        json_data: Optional[Dict[str, Any]] = None,
+    ) -> requests.Response:
+        """
+        发送 HTTP 请求，成功时返回尚未读取响应体的 Response，供流式解析
+
+        调用方负责关闭返回的 Response。
+
+        Raises:
+            同 _request
+        """
+        response = self._send(method, endpoint, params, json_data, stream=True)
+        if response.status_code >= 400:
+            with response:
+                self._parse_response(response.content, response.status_code)
+            raise APIError(
+                message=f"服务器返回错误: {response.status_code}",
+                status_code=response.status_code,
+            )
+        # 由 urllib3 解压 gzip 等编码，流式读取得到的即为原始 JSON
+        response.raw.decode_content = True
+        return response
+
+    def _store_etag(self, cache_key: str, etag: str, content: bytes):
+        """记录 GET 响应的 ETag 和响应体，超出上限时淘汰最久未使用的项"""
+        with self._etag_lock:
+            self._etag_cache[cache_key] = (etag, content)
+            self._etag_cache.move_to_end(cache_key)
+            while len(self._etag_cache) > self.etag_cache_size:
+                self._etag_cache.popitem(last=False)
 
     def authenticate(self, token: str) -> bool:
         """
@@ -916,25 +2149,45 @@ class NapCatQCE:
         try:
             response = self._session.post(
                 f"{self.base_url}/auth",
-                json={"token": token},
+                data=json_dumps({"token": token}),
+                headers={"Content-Type": "application/json"},
                 timeout=self.timeout,
+                verify=self.verify_ssl,
             )
-            data = response.json()
+            data = json_loads(response.content)
             if data.get("success") and data.get("data", {}).get("authenticated"):
+                if token != self.token:
+                    # 令牌变化后不再沿用之前缓存的结果
+                    for name in ("groups", "friends", "sticker_packs", "system"):
+                        api = self.__dict__.get(name)
+                        if api is not None:
+                            api.invalidate()
                 self.token = token
                 self._session.headers["Authorization"] = f"Bearer {token}"
+                self._last_ok = time.monotonic()
                 return True
             return False
         except Exception:
             return False
 
-    def is_connected(self) -> bool:
+    def is_connected(self, ttl: Optional[float] = None) -> bool:
         """
         检查是否已连接到服务器
 
+        最近 ttl 秒内有请求成功时不再发送探测请求；
+        认证失败、服务端错误或网络错误会立即使其失效。
+
+        Args:
+            ttl: 成功结果的有效期（秒），默认 CONNECTED_CACHE_TTL；为 0 时总是发送探测请求
+
         Returns:
             是否已连接
         """
+        if ttl is None:
+            ttl = self.CONNECTED_CACHE_TTL
+        last_ok = self._last_ok
+        if last_ok is not None and time.monotonic() - last_ok < ttl:
+            return True
         try:
             self.system.health_check()
             return True
@@ -943,6 +2196,9 @@ class NapCatQCE:
 
     def close(self):
         """关闭客户端连接"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
         self._session.close()
 
     def __enter__(self) -> "NapCatQCE":
@@ -954,10 +2210,100 @@ class NapCatQCE:
     def __repr__(self) -> str:
         return f"NapCatQCE(host={self.host!r}, port={self.port})"
 
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """获取（必要时创建）后台请求线程池"""
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=4,
+                    thread_name_prefix="napcat-qce",
+                )
+            return self._executor
+
+    def prefetch_bootstrap(self) -> BootstrapData:
+        """
+        并行预取系统信息、群组列表和好友列表
+
+        三个请求互不依赖，同时发出可将等待时间从 3 次往返缩短为 1 次。
+        列表结果同时写入 get_all 的缓存，之后的 get_all 调用无需再次请求。
+
+        Returns:
+            预取数据，通过 .info / .groups / .friends 访问
+
+        Example:
+            >>> bootstrap = client.prefetch_bootstrap()
+            >>> print(bootstrap.info.self_nick)
+            >>> print(f"共 {len(bootstrap.groups)} 个群")
+        """
+        # 使用独立线程池：在 batch_export 的回调（运行于客户端线程池）中调用时不会互相等待
+        executor = ThreadPoolExecutor(max_workers=3, thread_name_prefix="napcat-qce-bootstrap")
+        try:
+            return BootstrapData(
+                info=executor.submit(self.system.get_info),
+                groups=executor.submit(self.groups.get_all),
+                friends=executor.submit(self.friends.get_all),
+            )
+        finally:
+            # 不等待：已提交的请求仍会完成，线程随后退出
+            executor.shutdown(wait=False)
+
     # ========================================
     # 便捷导出方法
     # ========================================
 
+    def _resolve_friend_uid(
+        self,
+        friend_id: str,
+        friend_uids: Optional[Dict[str, str]] = None,
+    ) -> str:
+        """
+        将好友 QQ 号（uin）转换为 uid，已是 uid 或未找到时原样返回
+
+        friend_uids 为预先构建的 {uin: uid} 索引；未传入时使用 friends.get_uid_map() 的缓存。
+        """
+        # 私聊需要使用 uid（内部标识符），而不是 uin（QQ号）
+        # 检查是否已经是 uid 格式（通常以 "u_" 开头）
+        if friend_id.startswith("u_"):
+            return friend_id
+
+        # 传入的是 QQ 号，需要查找对应的 uid
+        if friend_uids is None:
+            friend_uids = self.friends.get_uid_map()
+        return friend_uids.get(friend_id, friend_id)
+
+    def resolve_names(self, ids: List[str]) -> Dict[str, Tuple[str, bool]]:
+        """
+        解析群号/QQ号对应的会话名称
+
+        只返回所请求 ID 的结果；全部 ID 都是群号时不会获取好友列表。
+        列表来自 get_all 的缓存，短时间内重复调用不会重复请求。
+
+        Args:
+            ids: 群号或好友QQ号（uin）/ uid 列表
+
+        Returns:
+            {id: (名称, 是否为群)}，未找到的 ID 不包含在结果中
+
+        Example:
+            >>> names = client.resolve_names(["123456789", "111222333"])
+            >>> name, is_group = names["123456789"]
+        """
+        wanted = set(ids)
+        resolved: Dict[str, Tuple[str, bool]] = {}
+
+        for group in self.groups.get_all():
+            if group.group_code in wanted:
+                resolved[group.group_code] = (group.group_name, True)
+
+        if wanted - set(resolved):
+            for friend in self.friends.get_all():
+                name = friend.remark or friend.nick
+                for key in (friend.uin, friend.uid):
+                    if key in wanted and key not in resolved:
+                        resolved[key] = (name, False)
+
+        return resolved
+
     def export_group(
         self,
         group_id: str,
@@ -967,7 +2313,8 @@ class NapCatQCE:
         session_name: Optional[str] = None,
         timeout: float = 600,
         on_progress: Optional[Callable[[ExportTask], None]] = None,
-    ) -> ExportTask:
+        wait: bool = True,
+    ) -> Union[ExportTask, PendingExport]:
         """
         快速导出群聊记录
 
@@ -979,9 +2326,10 @@ class NapCatQCE:
             session_name: 会话名称（默认使用群名）
             timeout: 超时时间（秒）
             on_progress: 进度回调函数
+            wait: 为 False 时提交后立即返回 PendingExport，调用其 result() 时才等待
 
         Returns:
-            完成的导出任务
+            完成的导出任务（wait=False 时为 PendingExport）
 
         Example:
             # 导出最近7天
@@ -997,6 +2345,7 @@ class NapCatQCE:
             session_name=session_name,
             timeout=timeout,
             on_progress=on_progress,
+            wait=wait,
         )
 
     def export_friend(
@@ -1008,7 +2357,8 @@ class NapCatQCE:
         session_name: Optional[str] = None,
         timeout: float = 600,
         on_progress: Optional[Callable[[ExportTask], None]] = None,
-    ) -> ExportTask:
+        wait: bool = True,
+    ) -> Union[ExportTask, PendingExport]:
         """
         快速导出私聊记录
 
@@ -1020,37 +2370,26 @@ class NapCatQCE:
             session_name: 会话名称（默认使用好友昵称）
             timeout: 超时时间（秒）
             on_progress: 进度回调函数
+            wait: 为 False 时提交后立即返回 PendingExport，调用其 result() 时才等待
 
         Returns:
-            完成的导出任务
+            完成的导出任务（wait=False 时为 PendingExport）
 
         Example:
             # 导出最近30天
             task = client.export_friend("111222333", days=30)
             print(f"导出了 {task.message_count} 条消息")
         """
-        # 私聊需要使用 uid（内部标识符），而不是 uin（QQ号）
-        # 如果传入的是 QQ 号，需要先转换为 uid
-        peer_uid = friend_id
-
-        # 检查是否已经是 uid 格式（通常以 "u_" 开头）
-        if not friend_id.startswith("u_"):
-            # 传入的是 QQ 号，需要查找对应的 uid
-            friends = self.friends.get_all()
-            for friend in friends:
-                if friend.uin == friend_id:
-                    peer_uid = friend.uid
-                    break
-
         return self.messages.quick_export(
             chat_type=ChatType.PRIVATE,
-            peer_uid=peer_uid,
+            peer_uid=self._resolve_friend_uid(friend_id),
             format=format,
             days=days,
             filter=filter,
             session_name=session_name,
             timeout=timeout,
             on_progress=on_progress,
+            wait=wait,
         )
 
     def batch_export(
@@ -1061,6 +2400,8 @@ class NapCatQCE:
         output_dir: Optional[str] = None,
         on_progress: Optional[Callable[[str, ExportTask], None]] = None,
         on_error: Optional[Callable[[str, Exception], None]] = None,
+        friends: Optional[List[Friend]] = None,
+        pipeline_depth: Optional[int] = None,
     ) -> Dict[str, Any]:
         """
         批量导出多个聊天记录
@@ -1073,11 +2414,17 @@ class NapCatQCE:
             format: 导出格式
             days: 导出最近N天
             output_dir: 输出目录（导出完成后移动文件到此目录）
-            on_progress: 进度回调 (target_id, task)
+            on_progress: 完成回调 (target_id, task)，在后台线程中依次调用
             on_error: 错误回调 (target_id, exception)
+            friends: 已获取的好友列表（可选），用于将好友QQ号解析为 uid，
+                传入后不再重新获取
+            pipeline_depth: 同时进行的导出任务数上限，某个任务结束后立即提交下一个；
+                为 None 时一次性提交全部任务，否则必须大于 0
 
         Returns:
-            结果统计: {"success": int, "failed": int, "total_messages": int, "results": [...]}
+            结果统计: {"success": int, "failed": int, "total_messages": int,
+            "duplicates": int, "results": [...]}，重复的目标（type 和 id 均相同）只导出一次，
+            跳过的数量记在 duplicates 中
 
         Example:
             results = client.batch_export([
@@ -1086,53 +2433,159 @@ class NapCatQCE:
             ], days=7, output_dir="D:/QQ聊天记录")
             print(f"成功: {results['success']}, 失败: {results['failed']}")
         """
-        import os
-        import shutil
+        if pipeline_depth is not None and pipeline_depth < 1:
+            raise ValueError("pipeline_depth 必须大于 0")
 
         # 确保输出目录存在
         if output_dir:
             os.makedirs(output_dir, exist_ok=True)
 
+        # 去除重复目标，同一会话只导出一次
+        seen = set()
+        unique_targets = []
+        for target in targets:
+            key = (target.get("type", "group"), target.get("id", ""))
+            if key not in seen:
+                seen.add(key)
+                unique_targets.append(target)
+
         results = {
             "success": 0,
             "failed": 0,
             "total_messages": 0,
+            "duplicates": len(targets) - len(unique_targets),
             "results": [],
         }
+        targets = unique_targets
+
+        filter = MessageFilter.last_days(days) if days is not None else None
+
+        # 第一阶段：解析所有目标
+        errors: Dict[int, Exception] = {}
+        queue: List[int] = []
+        exports: Dict[int, Dict[str, Any]] = {}
+        # 好友 {uin: uid} 索引；未传入 friends 时使用 friends.get_uid_map() 的缓存
+        friend_uids: Optional[Dict[str, str]] = None
+        if friends is not None:
+            friend_uids = {f.uin: f.uid for f in friends}
+        for index, target in enumerate(targets):
+            try:
+                if target.get("type", "group") == "group":
+                    chat_type = ChatType.GROUP
+                    peer_uid = target.get("id", "")
+                else:
+                    chat_type = ChatType.PRIVATE
+                    friend_id = target.get("id", "")
+                    peer_uid = self._resolve_friend_uid(friend_id, friend_uids)
+            except Exception as e:
+                errors[index] = e
+                continue
+            queue.append(index)
+            exports[index] = {
+                "chat_type": chat_type,
+                "peer_uid": peer_uid,
+                "session_name": target.get("name"),
+            }
+
+        # 第二阶段：提交任务并等待，任一任务结束即移动文件、回调并补充提交
+        submitted: Dict[int, ExportTask] = {}
+        inflight: Dict[str, int] = {}
+        finished: Dict[str, ExportTask] = {}
+        export_dir = _default_export_dir() if output_dir else None
+
+        # 文件移动/下载和完成回调放到线程池执行，不阻塞对其余任务的等待
+        executor = self._get_executor()
+        post_jobs: Dict[str, Future] = {}
+        callback_lock = threading.Lock()
+
+        def finish_task(index: int, task: ExportTask) -> Optional[str]:
+            output_path = None
+            if output_dir and task.file_name:
+                output_path = _move_export_file(task.file_name, output_dir, export_dir)
+                if output_path is None:
+                    # 本机找不到导出文件（如服务端在其他机器上），通过 HTTP 下载
+                    output_path = self.export_files.download(
+                        task.file_name,
+                        os.path.join(output_dir, task.file_name),
+                    )
+            if on_progress:
+                # 回调在线程池中执行，逐个调用，调用方无需自行加锁
+                with callback_lock:
+                    on_progress(targets[index].get("id", ""), task)
+            return output_path
+
+        def submit_more() -> List[str]:
+            """补充提交，使进行中的任务数保持在 pipeline_depth，返回新提交的任务 ID"""
+            nonlocal queue
+            task_ids: List[str] = []
+            while queue:
+                free = len(queue) if pipeline_depth is None else pipeline_depth - len(inflight)
+                if free <= 0:
+                    break
+                batch, queue = queue[:free], queue[free:]
 
-        for target in targets:
+                def submit_error(batch_index: int, error: Exception):
+                    errors[batch[batch_index]] = error
+
+                tasks = self.messages.export_batch(
+                    [exports[index] for index in batch],
+                    format=format,
+                    filter=filter,
+                    on_error=submit_error,
+                )
+                for index, task in zip(batch, tasks):
+                    if task is not None:
+                        submitted[index] = task
+                        inflight[task.id] = index
+                        task_ids.append(task.id)
+            return task_ids
+
+        def task_done(task_id: str, task: ExportTask) -> List[str]:
+            finished[task_id] = task
+            index = inflight.pop(task_id)
+            if task.status == TaskStatus.COMPLETED:
+                post_jobs[task_id] = executor.submit(finish_task, index, task)
+            return submit_more()
+
+        while True:
+            task_ids = submit_more()
+            if not task_ids:
+                break
+            try:
+                # 只等待一次：任务结束时在 on_done 中补充提交，新任务加入同一次等待，
+                # 超过 600 秒没有任何任务结束视为超时
+                self.tasks.wait_for_many(task_ids, timeout=600, on_done=task_done)
+            except Exception as e:
+                # 未结束的任务记为失败，尚未提交的目标继续提交
+                for index in inflight.values():
+                    errors.setdefault(index, e)
+                inflight.clear()
+
+        # 按目标顺序整理结果
+        for index, target in enumerate(targets):
             target_type = target.get("type", "group")
             target_id = target.get("id", "")
-            target_name = target.get("name")
 
             try:
-                if target_type == "group":
-                    task = self.export_group(
-                        group_id=target_id,
-                        format=format,
-                        days=days,
-                        session_name=target_name,
+                if index in errors:
+                    raise errors[index]
+
+                task = finished[submitted[index].id]
+                job = post_jobs.get(task.id)
+                output_path = job.result() if job is not None else None
+                if task.status == TaskStatus.FAILED:
+                    raise APIError(
+                        message=f"任务失败: {task.error}",
+                        code="TASK_FAILED",
+                        details={"task_id": task.id, "error": task.error},
                     )
-                else:
-                    task = self.export_friend(
-                        friend_id=target_id,
-                        format=format,
-                        days=days,
-                        session_name=target_name,
+                elif task.status == TaskStatus.CANCELLED:
+                    raise APIError(
+                        message="任务已取消",
+                        code="TASK_CANCELLED",
+                        details={"task_id": task.id},
                     )
 
-                # 移动文件到输出目录
-                output_path = None
-                if output_dir and task.file_name:
-                    user_profile = os.environ.get("USERPROFILE", os.path.expanduser("~"))
-                    src_path = os.path.join(user_profile, ".qq-chat-exporter", "exports", task.file_name)
-                    if os.path.exists(src_path):
-                        output_path = os.path.join(output_dir, task.file_name)
-                        shutil.move(src_path, output_path)
-
-                if on_progress:
-                    on_progress(target_id, task)
-
                 results["success"] += 1
                 results["total_messages"] += task.message_count
                 results["results"].append({
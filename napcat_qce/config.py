@@ -5,14 +5,24 @@ NapCat-QCE 配置管理
 管理导出配置，包括文件格式、保存位置等。
 """
 
-import json
 import os
+import threading
+import time
+from datetime import datetime
 from pathlib import Path
 from typing import Optional, Dict, Any, Union
 from dataclasses import dataclass, field, asdict
 
 from .types import ExportFormat
 from .auto_token import get_config_dir
+from .utils import json_dumps, json_loads
+
+
+# 文件名中的非法字符替换表，str.translate 一次遍历完成全部替换
+_INVALID_FILENAME_TABLE = str.maketrans(dict.fromkeys('<>:"/\\|?*', "_"))
+
+# 扩展名与格式名不同的导出格式
+_FORMAT_EXTENSIONS = {"excel": "xlsx"}
 
 
 @dataclass
@@ -80,8 +90,6 @@ class ExportConfig:
         Returns:
             完整文件路径
         """
-        from datetime import datetime
-
         # 确定输出目录
         if self.output_dir:
             output_dir = Path(self.output_dir)
@@ -109,17 +117,12 @@ class ExportConfig:
     def _get_extension(self) -> str:
         """获取文件扩展名"""
         format_lower = self.format.lower()
-        if format_lower == "excel":
-            return "xlsx"
-        return format_lower
+        return _FORMAT_EXTENSIONS.get(format_lower, format_lower)
 
     @staticmethod
     def _sanitize_filename(name: str) -> str:
         """清理文件名中的非法字符"""
-        invalid_chars = '<>:"/\\|?*'
-        for char in invalid_chars:
-            name = name.replace(char, "_")
-        return name.strip()
+        return name.translate(_INVALID_FILENAME_TABLE).strip()
 
 
 class ConfigManager:
@@ -136,6 +139,12 @@ class ConfigManager:
         >>> config_manager.save_export_config(config)
     """
 
+    # 两次检查配置文件是否被外部修改之间的最短间隔（秒）
+    STAT_INTERVAL = 1.0
+
+    # 延迟保存时，最后一次修改后多久写入磁盘（秒）
+    SAVE_DELAY = 0.25
+
     def __init__(self, config_dir: Optional[str] = None):
         """
         初始化配置管理器
@@ -148,48 +157,116 @@ class ConfigManager:
 
         self._export_config_path = self.config_dir / "export_config.json"
         self._export_config: Optional[ExportConfig] = None
+        self._lock = threading.RLock()
+        # 最近一次读写时配置文件的修改时间，None 表示文件不存在
+        self._mtime_ns: Optional[int] = None
+        self._next_stat = 0.0
+        self._save_timer: Optional[threading.Timer] = None
+        # 延迟写入失败时的异常，此时内存中的配置尚未保存，下次写入时重试
+        self._save_error: Optional[Exception] = None
+
+    def _stat_mtime(self) -> Optional[int]:
+        try:
+            return os.stat(self._export_config_path).st_mtime_ns
+        except OSError:
+            return None
 
     def get_export_config(self) -> ExportConfig:
         """
         获取导出配置
 
+        已加载时直接返回缓存对象，最多每 STAT_INTERVAL 秒检查一次文件修改时间，
+        只有文件被其他进程修改后才重新读取。有尚未写入的修改时不重新读取。
+
         Returns:
             导出配置对象
         """
-        if self._export_config:
-            return self._export_config
-
-        if self._export_config_path.exists():
-            try:
-                with open(self._export_config_path, "r", encoding="utf-8") as f:
-                    data = json.load(f)
+        with self._lock:
+            if self._export_config is not None:
+                now = time.monotonic()
+                # 有尚未写入（或写入失败）的修改时保留内存中的配置
+                pending = self._save_timer is not None or self._save_error is not None
+                if pending or now < self._next_stat:
+                    return self._export_config
+                self._next_stat = now + self.STAT_INTERVAL
+                if self._stat_mtime() == self._mtime_ns:
+                    return self._export_config
+
+            self._mtime_ns = self._stat_mtime()
+            self._next_stat = time.monotonic() + self.STAT_INTERVAL
+            if self._mtime_ns is not None:
+                try:
+                    data = json_loads(self._export_config_path.read_bytes())
                     self._export_config = ExportConfig.from_dict(data)
-            except Exception as e:
-                print(f"[ConfigManager] 加载配置失败: {e}")
+                except Exception as e:
+                    print(f"[ConfigManager] 加载配置失败: {e}")
+                    self._export_config = ExportConfig()
+            else:
                 self._export_config = ExportConfig()
-        else:
-            self._export_config = ExportConfig()
 
-        return self._export_config
+            return self._export_config
 
-    def save_export_config(self, config: Optional[ExportConfig] = None):
+    def save_export_config(self, config: Optional[ExportConfig] = None, flush: bool = True):
         """
         保存导出配置
 
         Args:
             config: 配置对象（None 时保存当前配置）
+            flush: 是否立即写入；为 False 时延迟 SAVE_DELAY 秒写入，
+                期间的多次修改合并为一次写入。之前的延迟写入失败时立即重新写入
+
+        Raises:
+            OSError: 立即写入失败
         """
-        if config:
-            self._export_config = config
+        with self._lock:
+            if config:
+                self._export_config = config
+            if not self._export_config:
+                return
+
+            if flush or self._save_error is not None:
+                self.flush()
+            elif self._save_timer is None:
+                # 非守护线程：进程退出前仍会完成写入
+                self._save_timer = threading.Timer(self.SAVE_DELAY, self._deferred_flush)
+                self._save_timer.start()
+
+    def _deferred_flush(self):
+        """定时器线程中写入，失败时只记录日志，修改留在内存中等待下次写入"""
+        try:
+            self.flush()
+        except Exception as e:
+            print(f"[ConfigManager] 保存配置失败: {e}")
+
+    def flush(self):
+        """
+        立即写入尚未保存的配置修改
+
+        之前的延迟写入失败时会重新写入，仍然失败则抛出异常。
 
-        if self._export_config:
-            with open(self._export_config_path, "w", encoding="utf-8") as f:
-                json.dump(self._export_config.to_dict(), f, ensure_ascii=False, indent=2)
+        Raises:
+            OSError: 写入失败（修改仍保留在内存中，可再次调用 flush() 重试）
+        """
+        with self._lock:
+            if self._save_timer is not None:
+                self._save_timer.cancel()
+                self._save_timer = None
+            if self._export_config:
+                try:
+                    self._export_config_path.write_bytes(
+                        json_dumps(self._export_config.to_dict(), indent=True)
+                    )
+                except Exception as e:
+                    self._save_error = e
+                    raise
+                self._mtime_ns = self._stat_mtime()
+            self._save_error = None
 
     def reset_export_config(self):
         """重置导出配置为默认值"""
-        self._export_config = ExportConfig()
-        self.save_export_config()
+        with self._lock:
+            self._export_config = ExportConfig()
+            self.save_export_config()
 
     def set_output_dir(self, path: str):
         """
@@ -200,7 +277,7 @@ class ConfigManager:
         """
         config = self.get_export_config()
         config.output_dir = path
-        self.save_export_config()
+        self.save_export_config(flush=False)
 
     def set_format(self, format: Union[str, ExportFormat]):
         """
@@ -214,7 +291,7 @@ class ConfigManager:
             config.format = format.value.upper()
         else:
             config.format = format.upper()
-        self.save_export_config()
+        self.save_export_config(flush=False)
 
 
 # 全局配置管理器实例
@@ -5,6 +5,8 @@ NapCat-QCE 启动器
 通过 Python 启动和管理 NapCat-QCE 服务。
 """
 
+import asyncio
+import io
 import os
 import sys
 import time
@@ -12,8 +14,12 @@ import subprocess
 import threading
 import signal
 import re
+import codecs
+import queue
+import selectors
+import functools
 from pathlib import Path
-from typing import Optional, Callable, Dict, Any, List
+from typing import Optional, Callable, Dict, Any, List, cast
 import ctypes
 
 # Windows 命名管道支持
@@ -23,15 +29,104 @@ if sys.platform == "win32":
     # Windows API 常量
     GENERIC_READ = 0x80000000
     OPEN_EXISTING = 3
-    FILE_FLAG_OVERLAPPED = 0x40000000
-    INVALID_HANDLE_VALUE = -1
+    INVALID_HANDLE_VALUE = ctypes.wintypes.HANDLE(-1).value
+    ERROR_FILE_NOT_FOUND = 2
     ERROR_PIPE_BUSY = 231
     ERROR_MORE_DATA = 234
+    JOB_OBJECT_LIMIT_KILL_ON_JOB_CLOSE = 0x2000
+    JobObjectExtendedLimitInformation = 9
+
+    # use_last_error=True 时 ctypes.get_last_error() 才能取到调用失败的错误码
+    kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+    # 声明参数和返回类型，句柄按指针宽度传递，避免 64 位系统上被截断为 int
+    kernel32.CreateFileW.argtypes = [
+        ctypes.wintypes.LPCWSTR, ctypes.wintypes.DWORD, ctypes.wintypes.DWORD, ctypes.c_void_p,
+        ctypes.wintypes.DWORD, ctypes.wintypes.DWORD, ctypes.wintypes.HANDLE,
+    ]
+    kernel32.CreateFileW.restype = ctypes.wintypes.HANDLE
+    kernel32.ReadFile.argtypes = [
+        ctypes.wintypes.HANDLE, ctypes.c_void_p, ctypes.wintypes.DWORD,
+        ctypes.POINTER(ctypes.wintypes.DWORD), ctypes.c_void_p,
+    ]
+    kernel32.ReadFile.restype = ctypes.wintypes.BOOL
+    kernel32.CloseHandle.argtypes = [ctypes.wintypes.HANDLE]
+    kernel32.CloseHandle.restype = ctypes.wintypes.BOOL
+    kernel32.CreateJobObjectW.argtypes = [ctypes.c_void_p, ctypes.wintypes.LPCWSTR]
+    kernel32.CreateJobObjectW.restype = ctypes.wintypes.HANDLE
+    kernel32.SetInformationJobObject.argtypes = [
+        ctypes.wintypes.HANDLE, ctypes.c_int, ctypes.c_void_p, ctypes.wintypes.DWORD,
+    ]
+    kernel32.SetInformationJobObject.restype = ctypes.wintypes.BOOL
+    kernel32.AssignProcessToJobObject.argtypes = [ctypes.wintypes.HANDLE, ctypes.wintypes.HANDLE]
+    kernel32.AssignProcessToJobObject.restype = ctypes.wintypes.BOOL
+    kernel32.TerminateJobObject.argtypes = [ctypes.wintypes.HANDLE, ctypes.wintypes.UINT]
+    kernel32.TerminateJobObject.restype = ctypes.wintypes.BOOL
+
+    class JOBOBJECT_BASIC_LIMIT_INFORMATION(ctypes.Structure):
+        _fields_ = [
+            ("PerProcessUserTimeLimit", ctypes.c_int64),
+            ("PerJobUserTimeLimit", ctypes.c_int64),
+            ("LimitFlags", ctypes.wintypes.DWORD),
+            ("MinimumWorkingSetSize", ctypes.c_size_t),
+            ("MaximumWorkingSetSize", ctypes.c_size_t),
+            ("ActiveProcessLimit", ctypes.wintypes.DWORD),
+            ("Affinity", ctypes.c_size_t),
+            ("PriorityClass", ctypes.wintypes.DWORD),
+            ("SchedulingClass", ctypes.wintypes.DWORD),
+        ]
+
+    class IO_COUNTERS(ctypes.Structure):
+        _fields_ = [
+            (name, ctypes.c_uint64) for name in (
+                "ReadOperationCount", "WriteOperationCount", "OtherOperationCount",
+                "ReadTransferCount", "WriteTransferCount", "OtherTransferCount",
+            )
+        ]
+
+    class JOBOBJECT_EXTENDED_LIMIT_INFORMATION(ctypes.Structure):
+        _fields_ = [
+            ("BasicLimitInformation", JOBOBJECT_BASIC_LIMIT_INFORMATION),
+            ("IoInfo", IO_COUNTERS),
+            ("ProcessMemoryLimit", ctypes.c_size_t),
+            ("JobMemoryLimit", ctypes.c_size_t),
+            ("PeakProcessMemoryUsed", ctypes.c_size_t),
+            ("PeakJobMemoryUsed", ctypes.c_size_t),
+        ]
+
+from .auto_token import get_token_from_config, get_config_dir, get_security_config_path
+from .exceptions import NapCatQCEError
 
-    kernel32 = ctypes.windll.kernel32
 
-from .auto_token import get_token_from_config, get_config_dir
-from .exceptions import NapCatQCEError
+# 服务输出中的命名管道重定向提示
+_PIPE_RE = re.compile(r'已重定向到命名管道:\s*(\\\\.\\pipe\\[^\s]+)')
+
+# 服务输出中需要处理的关键字，一次扫描找出全部；error 不区分大小写
+_EVENT_RE = re.compile(r'访问令牌|Access Token|QQ聊天记录导出工具已启动|错误|(?i:error)')
+
+# 关键字到事件的映射，未列出的（各种大小写的 error）均为错误事件
+_EVENT_KINDS = {
+    "访问令牌": "token",
+    "Access Token": "token",
+    "QQ聊天记录导出工具已启动": "ready",
+}
+
+# 每次从输出管道读取的最大字节数
+_READ_SIZE = 65536
+
+
+def _take_lines(pending: bytearray, decoder: codecs.IncrementalDecoder, data: bytes) -> List[str]:
+    """
+    将读取到的数据追加到 pending，返回其中已完整的行
+
+    只解码到最后一个换行为止，之后的部分留在 pending 中等待后续数据。
+    """
+    pending += data
+    end = pending.rfind(b"\n")
+    if end < 0:
+        return []
+    text = decoder.decode(bytes(pending[:end]))
+    del pending[:end + 1]
+    return text.split("\n")
 
 
 class LauncherError(NapCatQCEError):
@@ -50,10 +145,14 @@ def is_admin() -> bool:
         return os.geteuid() == 0
 
 
+@functools.lru_cache(maxsize=1)
 def find_qq_path() -> Optional[str]:
     """
     自动查找 QQ 安装路径
 
+    查询注册表和常见位置的结果会被缓存，重新安装 QQ 后可调用
+    reset_path_cache() 重新查找。
+
     Returns:
         QQ.exe 路径，未找到返回 None
     """
@@ -70,23 +169,26 @@ def find_qq_path() -> Optional[str]:
         winreg.CloseKey(key)
 
         # 从卸载路径提取 QQ.exe 路径
-        qq_dir = Path(uninstall_string).parent
-        qq_exe = qq_dir / "QQ.exe"
-        if qq_exe.exists():
-            return str(qq_exe)
+        qq_exe = os.path.join(os.path.dirname(uninstall_string), "QQ.exe")
+        if os.path.isfile(qq_exe):
+            return qq_exe
     except Exception:
         pass
 
-    # 尝试常见路径
-    common_paths = [
-        Path(os.environ.get("ProgramFiles", "")) / "Tencent" / "QQNT" / "QQ.exe",
-        Path(os.environ.get("ProgramFiles(x86)", "")) / "Tencent" / "QQNT" / "QQ.exe",
-        Path(os.environ.get("LOCALAPPDATA", "")) / "Programs" / "Tencent" / "QQNT" / "QQ.exe",
-    ]
+    # 尝试常见路径（跳过未设置的环境变量，避免拼出相对路径；重复的位置只检查一次）
+    common_paths = []
+    for var, parts in (
+        ("ProgramFiles", ("Tencent", "QQNT")),
+        ("ProgramFiles(x86)", ("Tencent", "QQNT")),
+        ("LOCALAPPDATA", ("Programs", "Tencent", "QQNT")),
+    ):
+        base = os.environ.get(var)
+        if base:
+            common_paths.append(os.path.join(base, *parts, "QQ.exe"))
 
-    for path in common_paths:
-        if path.exists():
-            return str(path)
+    for path in dict.fromkeys(common_paths):
+        if os.path.isfile(path):
+            return path
 
     return None
 
@@ -95,6 +197,9 @@ def find_napcat_qce_path() -> Optional[str]:
     """
     自动查找 NapCat-QCE 安装路径
 
+    优先使用环境变量 NAPCAT_QCE_PATH；常见位置的搜索结果会被缓存，
+    安装位置变化后可调用 reset_path_cache() 重新搜索。
+
     Returns:
         NapCat-QCE 目录路径，未找到返回 None
     """
@@ -103,26 +208,44 @@ def find_napcat_qce_path() -> Optional[str]:
     if env_path and Path(env_path).exists():
         return env_path
 
-    # 检查常见位置
-    search_paths = [
+    return _search_napcat_qce_path()
+
+
+# 固定的常见安装位置（D盘）
+_STATIC_NAPCAT_SEARCH = (
+    Path("D:/readqq/NapCat-QCE-Windows-x64"),
+    Path("D:/NapCat-QCE-Windows-x64"),
+)
+
+
+@functools.lru_cache(maxsize=1)
+def _search_napcat_qce_path() -> Optional[str]:
+    """在常见位置搜索 NapCat-QCE 目录（结果缓存）"""
+    cwd = Path.cwd()
+    search_paths = (
         # 当前目录
-        Path.cwd() / "NapCat-QCE-Windows-x64",
+        cwd / "NapCat-QCE-Windows-x64",
         # 用户目录
         Path.home() / "NapCat-QCE-Windows-x64",
         # 上级目录
-        Path.cwd().parent / "NapCat-QCE-Windows-x64",
-        # D盘常见位置
-        Path("D:/readqq/NapCat-QCE-Windows-x64"),
-        Path("D:/NapCat-QCE-Windows-x64"),
-    ]
+        cwd.parent / "NapCat-QCE-Windows-x64",
+    ) + _STATIC_NAPCAT_SEARCH
 
-    for path in search_paths:
-        if path.exists() and (path / "NapCatWinBootMain.exe").exists():
+    # 直接检查目录内的启动程序：目录不存在时同样返回 False，每个位置只需一次 stat；
+    # 当前目录与用户目录相同时只检查一次
+    for path in dict.fromkeys(search_paths):
+        if os.path.isfile(path / "NapCatWinBootMain.exe"):
             return str(path)
 
     return None
 
 
+def reset_path_cache():
+    """清空 find_qq_path 和 find_napcat_qce_path 的缓存，下次调用时重新查找"""
+    find_qq_path.cache_clear()
+    _search_napcat_qce_path.cache_clear()
+
+
 class NapCatQCELauncher:
     """
     NapCat-QCE 启动器
@@ -138,6 +261,11 @@ class NapCatQCELauncher:
         >>> launcher.stop()
     """
 
+    # 输出回调队列容量；on_output(drop_on_overflow=True) 时积压超过该值的普通行会被丢弃
+    OUTPUT_QUEUE_SIZE = 1024
+    # stop() 等待输出读取线程退出的最长时间（秒）
+    OUTPUT_JOIN_TIMEOUT = 1.0
+
     def __init__(
         self,
         napcat_path: Optional[str] = None,
@@ -161,18 +289,35 @@ class NapCatQCELauncher:
 
         self._process: Optional[subprocess.Popen] = None
         self._output_thread: Optional[threading.Thread] = None
+        # POSIX 下用于唤醒输出读取线程的管道写端，stop() 时关闭
+        self._wake_w: Optional[int] = None
+        # 从配置文件读取的令牌: (st_mtime_ns, st_size, 令牌)
+        self._config_token: Optional[tuple] = None
+        # 启动进程时追加的环境变量: (napcat_path, 变量)，napcat_path 变化后重新生成
+        self._env_overlay: Optional[tuple] = None
         self._pipe_thread: Optional[threading.Thread] = None
         self._running = False
-        self._ready = False
+        # 就绪时置位；进程退出或停止时也会置位以唤醒 wait_for_ready（此时 is_running 为假）
+        self._ready_event = threading.Event()
         self._token: Optional[str] = None
         self._pipe_name: Optional[str] = None
         self._pipe_handle = None
+        # 作业对象：服务进程及其启动的 QQ 等子进程都在其中，关闭句柄时一并终止
+        self._job = None
 
         # 输出回调
         self._on_output: Optional[Callable[[str], None]] = None
         self._on_ready: Optional[Callable[[str], None]] = None
         self._on_error: Optional[Callable[[str], None]] = None
 
+        # 读取线程只负责入队，由分发线程调用输出回调，慢回调不会阻塞读取
+        self._output_queue: "queue.Queue[str]" = queue.Queue(maxsize=self.OUTPUT_QUEUE_SIZE)
+        self._drop_on_overflow = False
+        self._dispatch_thread: Optional[threading.Thread] = None
+        # 标准输出和命名管道可能各有一个读取线程，计数需加锁
+        self._dropped_lock = threading.Lock()
+        self.dropped_lines = 0
+
         # 验证路径
         if not self.napcat_path:
             raise LauncherError(
@@ -189,9 +334,24 @@ class NapCatQCELauncher:
                 "2. 安装 QQ 客户端 (https://im.qq.com/)"
             )
 
-    def on_output(self, callback: Callable[[str], None]) -> "NapCatQCELauncher":
-        """设置输出回调"""
+    def on_output(
+        self,
+        callback: Callable[[str], None],
+        drop_on_overflow: bool = False,
+    ) -> "NapCatQCELauncher":
+        """
+        设置输出回调
+
+        回调在独立的分发线程中执行，不会阻塞进程输出的读取。
+
+        Args:
+            callback: 输出回调，每行调用一次
+            drop_on_overflow: 回调积压超过 OUTPUT_QUEUE_SIZE 行时丢弃新到的普通行
+                （计入 dropped_lines），令牌、就绪、错误等事件行仍会等待入队；
+                默认为 False，读取线程等待回调处理，不丢弃任何行
+        """
         self._on_output = callback
+        self._drop_on_overflow = drop_on_overflow
         return self
 
     def on_ready(self, callback: Callable[[str], None]) -> "NapCatQCELauncher":
@@ -210,59 +370,147 @@ class NapCatQCELauncher:
         if not line:
             return
 
-        # 检测命名管道重定向
-        pipe_match = re.search(r'已重定向到命名管道:\s*(\\\\.\\pipe\\[^\s]+)', line)
-        if pipe_match:
-            self._pipe_name = pipe_match.group(1)
-            # 启动命名管道读取线程
-            self._pipe_thread = threading.Thread(target=self._read_named_pipe, daemon=True)
-            self._pipe_thread.start()
-
-        # 检测令牌输出
-        if "访问令牌" in line or "Access Token" in line:
-            # 尝试提取令牌
-            parts = line.split(":")
-            if len(parts) >= 2:
-                self._token = parts[-1].strip()
-                self._ready = True
-                if self._on_ready:
-                    self._on_ready(self._token)
-
-        # 检测服务就绪（QQ聊天记录导出工具已启动）
-        if "QQ聊天记录导出工具已启动" in line:
-            self._ready = True
-            if self._on_ready:
-                self._on_ready(self._token)
-
-        # 检测错误
-        if "error" in line.lower() or "错误" in line:
-            if self._on_error:
+        # 检测命名管道重定向（先做子串判断，绝大多数行无需执行正则）
+        if "\\pipe\\" in line:
+            pipe_match = _PIPE_RE.search(line)
+            if pipe_match:
+                self._pipe_name = pipe_match.group(1)
+                # 启动命名管道读取线程
+                self._pipe_thread = threading.Thread(target=self._read_named_pipe, daemon=True)
+                self._pipe_thread.start()
+
+        events = {_EVENT_KINDS.get(m, "error") for m in _EVENT_RE.findall(line)}
+        if events:
+            # 检测令牌输出
+            if "token" in events:
+                # 尝试提取令牌
+                parts = line.split(":")
+                if len(parts) >= 2:
+                    self._token = parts[-1].strip()
+                    self._mark_ready()
+
+            # 检测服务就绪（QQ聊天记录导出工具已启动）
+            if "ready" in events:
+                self._mark_ready()
+
+            # 检测错误
+            if "error" in events and self._on_error:
                 self._on_error(line)
 
         # 输出回调
         if self._on_output:
-            self._on_output(line)
-
-    def _read_output(self):
-        """读取进程输出"""
-        if not self._process or not self._process.stdout:
+            self._enqueue_output(line, bool(events))
+
+    def _mark_ready(self):
+        """标记服务就绪并通知等待方"""
+        self._ready_event.set()
+        if self._on_ready:
+            self._on_ready(self._token)
+
+    def _enqueue_output(self, line: str, is_event: bool = False):
+        """将输出行放入分发队列；事件行即使允许丢弃也会等待入队"""
+        if not self._drop_on_overflow or is_event:
+            self._output_queue.put(line)
             return
 
-        for line in iter(self._process.stdout.readline, ""):
-            if not self._running:
-                break
-            self._process_line(line)
+        try:
+            self._output_queue.put_nowait(line)
+        except queue.Full:
+            with self._dropped_lock:
+                self.dropped_lines += 1
+
+    def _dispatch_output(self):
+        """在分发线程中依次调用输出回调"""
+        while self._running or not self._output_queue.empty():
+            try:
+                line = self._output_queue.get(timeout=0.5)
+            except queue.Empty:
+                continue
+
+            callback = self._on_output
+            if callback:
+                try:
+                    callback(line)
+                except Exception:
+                    pass
+
+    def _read_output(self, wake_fd: Optional[int] = None):
+        """
+        读取进程输出
 
-    def _read_named_pipe(self):
-        """从 Windows 命名管道读取输出"""
-        if sys.platform != "win32" or not self._pipe_name:
-            return
+        按块读取原始字节，每块只解码一次，再按行处理。
 
-        # 等待管道可用
-        time.sleep(0.5)
+        Args:
+            wake_fd: POSIX 下的唤醒管道读端，写端关闭时立即停止读取（由本线程关闭）
+        """
+        process = self._process
+        if not process or not process.stdout:
+            return
 
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        pending = bytearray()
         try:
-            # 打开命名管道
+            if wake_fd is None:
+                # Windows 的匿名管道不支持 select，阻塞读取；read1 返回当前已到达的数据。
+                # stop() 终止进程树后管道写端全部关闭，read1 返回空数据，循环随之结束
+                reader = cast(io.BufferedReader, process.stdout)
+                while True:
+                    data = reader.read1(_READ_SIZE)
+                    if not data:
+                        break
+                    for line in _take_lines(pending, decoder, data):
+                        self._process_line(line)
+            else:
+                self._select_output(process.stdout.fileno(), wake_fd, pending, decoder)
+        finally:
+            if wake_fd is not None:
+                os.close(wake_fd)
+
+        # 输出结束，处理最后一行不带换行的内容（stop() 之后也不丢弃）
+        tail = decoder.decode(bytes(pending), final=True)
+        if tail:
+            self._process_line(tail)
+
+        if self._running:
+            # 输出结束说明进程正在退出；等其结束后唤醒仍在等待就绪的线程
+            process.wait()
+            self._ready_event.set()
+
+    def _select_output(self, fd: int, wake_fd: int, pending: bytearray,
+                       decoder: codecs.IncrementalDecoder):
+        """
+        同时等待进程输出和唤醒管道（POSIX）
+
+        stop() 关闭唤醒管道写端后立即返回，即使子进程遗留的后代进程仍持有输出管道。
+        直接读取文件描述符，不经过带缓冲的文件对象，避免数据滞留在缓冲区中。
+        """
+        with selectors.DefaultSelector() as selector:
+            selector.register(fd, selectors.EVENT_READ)
+            selector.register(wake_fd, selectors.EVENT_READ)
+            while self._running:
+                for key, _ in selector.select():
+                    if key.fd == wake_fd:
+                        return
+                    data = os.read(fd, _READ_SIZE)
+                    if not data:
+                        return
+                    for line in _take_lines(pending, decoder, data):
+                        self._process_line(line)
+
+    # 等待命名管道创建的最长时间（秒）
+    PIPE_CONNECT_TIMEOUT = 5.0
+
+    def _open_named_pipe(self):
+        """
+        打开命名管道
+
+        管道尚未创建或正忙时每 100 毫秒重试一次，期间调用 stop() 会放弃。
+
+        Returns:
+            管道句柄，失败或已停止时返回 None
+        """
+        deadline = time.monotonic() + self.PIPE_CONNECT_TIMEOUT
+        while self._running:
             handle = kernel32.CreateFileW(
                 self._pipe_name,
                 GENERIC_READ,
@@ -272,26 +520,42 @@ class NapCatQCELauncher:
                 0,
                 None
             )
+            if handle != INVALID_HANDLE_VALUE:
+                return handle
 
-            if handle == INVALID_HANDLE_VALUE:
-                error = ctypes.get_last_error()
+            error = ctypes.get_last_error()
+            if error not in (ERROR_FILE_NOT_FOUND, ERROR_PIPE_BUSY) or time.monotonic() >= deadline:
                 if self._on_error:
                     self._on_error(f"无法连接到命名管道: 错误码 {error}")
+                return None
+            time.sleep(0.1)
+        return None
+
+    def _read_named_pipe(self):
+        """
+        从 Windows 命名管道读取输出
+
+        读取会阻塞到有数据或服务进程关闭管道为止，进程退出后线程随之结束。
+        """
+        if sys.platform != "win32" or not self._pipe_name:
+            return
+
+        try:
+            handle = self._open_named_pipe()
+            if handle is None:
                 return
 
             self._pipe_handle = handle
-            buffer = ctypes.create_string_buffer(4096)
+            buffer = ctypes.create_string_buffer(_READ_SIZE)
             bytes_read = ctypes.wintypes.DWORD()
-            partial_line = ""
+            # 指针只创建一次，每次读取复用同一组缓冲区
+            p_bytes_read = ctypes.byref(bytes_read)
+            # 按字节缓存未完整的行；增量解码器可正确处理被读取边界截断的多字节字符
+            decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+            pending = bytearray()
 
             while self._running:
-                success = kernel32.ReadFile(
-                    handle,
-                    buffer,
-                    4096,
-                    ctypes.byref(bytes_read),
-                    None
-                )
+                success = kernel32.ReadFile(handle, buffer, _READ_SIZE, p_bytes_read, None)
 
                 if not success:
                     error = ctypes.get_last_error()
@@ -299,19 +563,7 @@ class NapCatQCELauncher:
                         break
 
                 if bytes_read.value > 0:
-                    try:
-                        data = buffer.raw[:bytes_read.value].decode('utf-8', errors='replace')
-                    except:
-                        data = buffer.raw[:bytes_read.value].decode('gbk', errors='replace')
-
-                    # 处理可能的多行数据
-                    data = partial_line + data
-                    lines = data.split('\n')
-
-                    # 最后一个可能是不完整的行
-                    partial_line = lines[-1]
-
-                    for line in lines[:-1]:
+                    for line in _take_lines(pending, decoder, buffer[:bytes_read.value]):
                         self._process_line(line)
 
         except Exception as e:
@@ -322,6 +574,21 @@ class NapCatQCELauncher:
                 kernel32.CloseHandle(self._pipe_handle)
                 self._pipe_handle = None
 
+    def _get_env_overlay(self, napcat_dir: Path) -> Dict[str, str]:
+        """返回启动进程时追加的 NAPCAT_* 环境变量，按 napcat_path 缓存"""
+        cached = self._env_overlay
+        if cached is not None and cached[0] == self.napcat_path:
+            return cached[1]
+        overlay = {
+            "NAPCAT_PATCH_PACKAGE": str(napcat_dir / "qqnt.json"),
+            "NAPCAT_LOAD_PATH": str(napcat_dir / "loadNapCat.js"),
+            "NAPCAT_INJECT_PATH": str(napcat_dir / "NapCatWinBootHook.dll"),
+            "NAPCAT_LAUNCHER_PATH": str(napcat_dir / "NapCatWinBootMain.exe"),
+            "NAPCAT_MAIN_PATH": str(napcat_dir / "napcat.mjs"),
+        }
+        self._env_overlay = (self.napcat_path, overlay)
+        return overlay
+
     def start(self, wait_for_ready: bool = False, timeout: float = 60) -> bool:
         """
         启动 NapCat-QCE 服务
@@ -355,12 +622,9 @@ class NapCatQCELauncher:
             cmd.append(self.auto_login_uin)
 
         # 设置环境变量
-        env = os.environ.copy()
-        env["NAPCAT_PATCH_PACKAGE"] = str(napcat_dir / "qqnt.json")
-        env["NAPCAT_LOAD_PATH"] = str(napcat_dir / "loadNapCat.js")
-        env["NAPCAT_INJECT_PATH"] = str(napcat_dir / "NapCatWinBootHook.dll")
-        env["NAPCAT_LAUNCHER_PATH"] = str(napcat_dir / "NapCatWinBootMain.exe")
-        env["NAPCAT_MAIN_PATH"] = str(napcat_dir / "napcat.mjs")
+        env = {**os.environ, **self._get_env_overlay(napcat_dir)}
+
+        self._ready_event.clear()
 
         try:
             # 启动进程
@@ -370,19 +634,27 @@ class NapCatQCELauncher:
                 stdout=subprocess.PIPE,
                 stderr=subprocess.STDOUT,
                 stdin=subprocess.PIPE,
-                text=True,
-                encoding="utf-8",
-                errors="replace",
                 env=env,
                 creationflags=subprocess.CREATE_NEW_PROCESS_GROUP if sys.platform == "win32" else 0,
             )
 
             self._running = True
+            if sys.platform == "win32":
+                self._job = self._create_job(self._process)
 
             # 启动输出读取线程
-            self._output_thread = threading.Thread(target=self._read_output, daemon=True)
+            wake_fd = None
+            if sys.platform != "win32":
+                wake_fd, self._wake_w = os.pipe()
+            self._output_thread = threading.Thread(
+                target=self._read_output, args=(wake_fd,), daemon=True,
+            )
             self._output_thread.start()
 
+            if self._dispatch_thread is None or not self._dispatch_thread.is_alive():
+                self._dispatch_thread = threading.Thread(target=self._dispatch_output, daemon=True)
+                self._dispatch_thread.start()
+
             print(f"[Launcher] NapCat-QCE 已启动 (PID: {self._process.pid})")
 
             if wait_for_ready:
@@ -393,6 +665,53 @@ class NapCatQCELauncher:
         except Exception as e:
             raise LauncherError(f"启动失败: {e}")
 
+    @staticmethod
+    def _create_job(process: subprocess.Popen):
+        """
+        创建作业对象并将进程加入其中（Windows）
+
+        进程之后启动的子进程会自动加入同一作业；作业设置了 KILL_ON_JOB_CLOSE，
+        关闭句柄（包括本进程意外退出）时整个进程树都会被终止。
+
+        Returns:
+            作业句柄，创建失败时返回 None（停止时退回 taskkill 终止进程树）
+        """
+        if sys.platform == "win32":
+            job = kernel32.CreateJobObjectW(None, None)
+            if not job:
+                return None
+            info = JOBOBJECT_EXTENDED_LIMIT_INFORMATION()
+            info.BasicLimitInformation.LimitFlags = JOB_OBJECT_LIMIT_KILL_ON_JOB_CLOSE
+            if not (
+                kernel32.SetInformationJobObject(
+                    job, JobObjectExtendedLimitInformation, ctypes.byref(info), ctypes.sizeof(info)
+                )
+                and kernel32.AssignProcessToJobObject(job, int(process._handle))
+            ):
+                kernel32.CloseHandle(job)
+                return None
+            return job
+        return None
+
+    def _kill(self):
+        """
+        强制终止服务及其子进程
+
+        Windows 上有作业对象时终止整个作业，否则用 taskkill /T 终止进程树，
+        taskkill 失败时只终止主进程。
+        """
+        if sys.platform == "win32":
+            if self._job and kernel32.TerminateJobObject(self._job, 1):
+                return
+            result = subprocess.run(
+                ["taskkill", "/F", "/T", "/PID", str(self._process.pid)],
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+            )
+            if result.returncode == 0:
+                return
+        self._process.kill()
+
     def wait_for_ready(self, timeout: float = 60) -> bool:
         """
         等待服务就绪
@@ -403,14 +722,8 @@ class NapCatQCELauncher:
         Returns:
             是否就绪
         """
-        start_time = time.time()
-        while time.time() - start_time < timeout:
-            if self._ready:
-                return True
-            if not self._running:
-                return False
-            time.sleep(0.5)
-        return False
+        # 就绪、进程退出或被停止时都会立即唤醒，无需轮询
+        return self._ready_event.wait(timeout) and self.is_running
 
     def stop(self, force: bool = False):
         """
@@ -420,11 +733,16 @@ class NapCatQCELauncher:
             force: 是否强制终止
         """
         self._running = False
+        if self._wake_w is not None:
+            # 关闭写端使读端可读，唤醒输出读取线程
+            os.close(self._wake_w)
+            self._wake_w = None
 
         if self._process:
             try:
                 if force:
-                    self._process.kill()
+                    self._kill()
+                    self._process.wait()
                 else:
                     # 尝试优雅终止
                     if sys.platform == "win32":
@@ -436,26 +754,30 @@ class NapCatQCELauncher:
                     try:
                         self._process.wait(timeout=5)
                     except subprocess.TimeoutExpired:
-                        self._process.kill()
+                        self._kill()
 
                 print("[Launcher] NapCat-QCE 已停止")
             except Exception as e:
                 print(f"[Launcher] 停止时出错: {e}")
             finally:
                 self._process = None
-
-        self._ready = False
+                if sys.platform == "win32" and self._job:
+                    # 关闭作业句柄，终止仍在运行的子进程（如 QQ.exe）
+                    kernel32.CloseHandle(self._job)
+                    self._job = None
+
+        # 等待输出读取线程处理完剩余输出后退出（回调中调用 stop() 时跳过）
+        thread = self._output_thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(self.OUTPUT_JOIN_TIMEOUT)
+
+        # 先置位再清除：唤醒其他线程中的 wait_for_ready，使其返回 False
+        self._ready_event.set()
+        self._ready_event.clear()
         self._token = None
+        self._config_token = None
         self._pipe_name = None
 
-        # 关闭命名管道句柄
-        if sys.platform == "win32" and self._pipe_handle:
-            try:
-                kernel32.CloseHandle(self._pipe_handle)
-            except:
-                pass
-            self._pipe_handle = None
-
     def restart(self, wait_for_ready: bool = True, timeout: float = 60) -> bool:
         """
         重启服务
@@ -471,6 +793,53 @@ class NapCatQCELauncher:
         time.sleep(2)
         return self.start(wait_for_ready, timeout)
 
+    async def wait_for_ready_async(self, timeout: float = 60) -> bool:
+        """
+        wait_for_ready 的协程版本，等待期间不阻塞事件循环
+
+        Args:
+            timeout: 超时时间（秒）
+
+        Returns:
+            是否就绪
+        """
+        loop = asyncio.get_running_loop()
+        ready = await loop.run_in_executor(None, self._ready_event.wait, timeout)
+        return ready and self.is_running
+
+    async def start_async(self, wait_for_ready: bool = False, timeout: float = 60) -> bool:
+        """
+        start 的协程版本，可在同一事件循环中并行启动多个服务
+
+        Args:
+            wait_for_ready: 是否等待服务就绪
+            timeout: 等待超时时间（秒）
+
+        Returns:
+            是否启动成功
+        """
+        if not self.start():
+            return False
+        if wait_for_ready:
+            return await self.wait_for_ready_async(timeout)
+        return True
+
+    async def restart_async(self, wait_for_ready: bool = True, timeout: float = 60) -> bool:
+        """
+        restart 的协程版本
+
+        Args:
+            wait_for_ready: 是否等待就绪
+            timeout: 超时时间
+
+        Returns:
+            是否成功
+        """
+        # stop() 最多等待进程退出 5 秒，放到线程池中执行
+        await asyncio.get_running_loop().run_in_executor(None, self.stop)
+        await asyncio.sleep(2)
+        return await self.start_async(wait_for_ready, timeout)
+
     @property
     def is_running(self) -> bool:
         """服务是否正在运行"""
@@ -481,15 +850,25 @@ class NapCatQCELauncher:
     @property
     def is_ready(self) -> bool:
         """服务是否就绪"""
-        return self._ready and self.is_running
+        return self._ready_event.is_set() and self.is_running
 
     @property
     def token(self) -> Optional[str]:
         """获取访问令牌"""
         if self._token:
             return self._token
-        # 尝试从配置文件读取
-        return get_token_from_config()
+        # 尝试从配置文件读取；文件未变化时直接返回上次的结果
+        try:
+            st = get_security_config_path().stat()
+        except OSError:
+            self._config_token = None
+            return None
+        cached = self._config_token
+        if cached is not None and cached[:2] == (st.st_mtime_ns, st.st_size):
+            return cached[2]
+        token = get_token_from_config()
+        self._config_token = (st.st_mtime_ns, st.st_size, token)
+        return token
 
     @property
     def pid(self) -> Optional[int]:
@@ -498,13 +877,14 @@ class NapCatQCELauncher:
             return self._process.pid
         return None
 
-    def get_client(self, host: str = "localhost", port: int = 40653):
+    def get_client(self, host: str = "localhost", port: int = 40653, **kwargs):
         """
         获取已连接的客户端
 
         Args:
             host: 服务器地址
             port: 服务器端口
+            **kwargs: 传递给 NapCatQCE 的其他参数（如 timeout、pool_size）
 
         Returns:
             NapCatQCE 客户端实例
@@ -515,7 +895,7 @@ class NapCatQCELauncher:
         if not token:
             raise LauncherError("无法获取访问令牌，服务可能未就绪")
 
-        return NapCatQCE(token=token, host=host, port=port)
+        return NapCatQCE(token=token, host=host, port=port, **kwargs)
 
     def __enter__(self) -> "NapCatQCELauncher":
         self.start(wait_for_ready=True)
@@ -524,6 +904,13 @@ class NapCatQCELauncher:
     def __exit__(self, exc_type, exc_val, exc_tb):
         self.stop()
 
+    async def __aenter__(self) -> "NapCatQCELauncher":
+        await self.start_async(wait_for_ready=True)
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await asyncio.get_running_loop().run_in_executor(None, self.stop)
+
 
 def start_napcat_qce(
     napcat_path: Optional[str] = None,
@@ -5,24 +5,33 @@ NapCat-QCE 类型定义
 包含所有 API 使用的数据类型、枚举和配置类。
 """
 
-from enum import Enum
+import functools
+import sys
+from enum import Enum, IntEnum
 from dataclasses import dataclass, field
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, ClassVar, Type, TypeVar
 from datetime import datetime
 
+from .utils import ms_now
+
+_MS_PER_HOUR = 3_600_000
+_MS_PER_DAY = 24 * _MS_PER_HOUR
+
 
 # ============================================================================
 # 枚举类型
 # ============================================================================
 
-class ChatType(Enum):
+# 枚举成员本身就是 int/str，可直接与服务端返回的原始值比较，也可直接序列化为 JSON
+
+class ChatType(IntEnum):
     """聊天类型"""
     PRIVATE = 1  # 私聊
     GROUP = 2    # 群聊
     TEMP = 3     # 临时会话
 
 
-class ExportFormat(Enum):
+class ExportFormat(str, Enum):
     """导出格式"""
     TXT = "txt"
     JSON = "json"
@@ -30,7 +39,7 @@ class ExportFormat(Enum):
     EXCEL = "excel"
 
 
-class TaskStatus(Enum):
+class TaskStatus(str, Enum):
     """任务状态"""
     PENDING = "pending"      # 等待中
     RUNNING = "running"      # 执行中
@@ -40,7 +49,7 @@ class TaskStatus(Enum):
     CANCELLED = "cancelled"  # 已取消
 
 
-class ResourceType(Enum):
+class ResourceType(str, Enum):
     """资源类型"""
     IMAGE = "image"
     VIDEO = "video"
@@ -48,7 +57,7 @@ class ResourceType(Enum):
     FILE = "file"
 
 
-class ResourceStatus(Enum):
+class ResourceStatus(str, Enum):
     """资源状态"""
     PENDING = "pending"
     DOWNLOADING = "downloading"
@@ -58,7 +67,7 @@ class ResourceStatus(Enum):
     SKIPPED = "skipped"
 
 
-class ScheduleType(Enum):
+class ScheduleType(str, Enum):
     """定时类型"""
     DAILY = "daily"
     WEEKLY = "weekly"
@@ -66,7 +75,7 @@ class ScheduleType(Enum):
     CUSTOM = "custom"
 
 
-class TimeRangeType(Enum):
+class TimeRangeType(str, Enum):
     """时间范围类型"""
     YESTERDAY = "yesterday"
     LAST_WEEK = "last-week"
@@ -76,18 +85,60 @@ class TimeRangeType(Enum):
     CUSTOM = "custom"
 
 
-class StickerPackType(Enum):
+class StickerPackType(str, Enum):
     """表情包类型"""
     FAVORITE_EMOJI = "favorite_emoji"  # 收藏表情
     MARKET_PACK = "market_pack"        # 市场表情包
     SYSTEM_PACK = "system_pack"        # 系统表情包
 
 
+E = TypeVar("E", bound=Enum)
+
+
+def _to_enum(enum_cls: Type[E], value: Any, default: E) -> E:
+    """将原始值转换为枚举成员，未知值返回 default（不缓存）"""
+    try:
+        return enum_cls(value)
+    except ValueError:
+        return default
+
+
+_to_enum_cached = functools.lru_cache(maxsize=256)(_to_enum)
+
+
+def _parse_enum(enum_cls: Type[E], value: Any, default: E) -> E:
+    """
+    将服务端返回的原始值转换为枚举成员，未知值返回 default
+
+    结果按 (枚举类, 值, 默认值) 缓存：常见值只需一次字典查找，
+    未知值也只在首次出现时构造 ValueError。不可哈希的值不经过缓存。
+
+    Args:
+        enum_cls: 枚举类
+        value: 原始值
+        default: 无法转换时返回的成员
+    """
+    try:
+        member: E = _to_enum_cached(enum_cls, value, default)
+        return member
+    except TypeError:
+        return _to_enum(enum_cls, value, default)
+
+
 # ============================================================================
 # 数据类型
 # ============================================================================
 
-@dataclass
+# 响应对象和配置使用 __slots__（Python 3.10+），减少内存占用并加快属性访问
+_SLOTS: Dict[str, Any] = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+def _intern(value: Any) -> Any:
+    """驻留字符串：取值种类很少的字段（元素类型、格式等）在大量对象间共享同一个 str"""
+    return sys.intern(value) if type(value) is str else value
+
+
+@dataclass(**_SLOTS)
 class Group:
     """群组信息"""
     group_code: str
@@ -99,17 +150,18 @@ class Group:
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "Group":
+        g = data.get
         return cls(
-            group_code=str(data.get("groupCode", "")),
-            group_name=data.get("groupName", ""),
-            member_count=data.get("memberCount", 0),
-            max_member=data.get("maxMember", 0),
-            remark=data.get("remark"),
-            avatar_url=data.get("avatarUrl"),
+            str(g("groupCode", "")),
+            g("groupName", ""),
+            g("memberCount", 0),
+            g("maxMember", 0),
+            g("remark"),
+            g("avatarUrl"),
         )
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class GroupMember:
     """群成员信息"""
     uid: str
@@ -123,19 +175,20 @@ class GroupMember:
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "GroupMember":
+        g = data.get
         return cls(
-            uid=data.get("uid", ""),
-            uin=str(data.get("uin", "")),
-            nick=data.get("nick", ""),
-            card_name=data.get("cardName"),
-            role=data.get("role", 0),
-            join_time=data.get("joinTime"),
-            last_speak_time=data.get("lastSpeakTime"),
-            avatar_url=data.get("avatarUrl"),
+            g("uid", ""),
+            str(g("uin", "")),
+            g("nick", ""),
+            g("cardName"),
+            g("role", 0),
+            g("joinTime"),
+            g("lastSpeakTime"),
+            g("avatarUrl"),
         )
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class Friend:
     """好友信息"""
     uid: str
@@ -149,19 +202,20 @@ class Friend:
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "Friend":
+        g = data.get
         return cls(
-            uid=data.get("uid", ""),
-            uin=str(data.get("uin", "")),
-            nick=data.get("nick", ""),
-            remark=data.get("remark"),
-            avatar_url=data.get("avatarUrl"),
-            is_online=data.get("isOnline", False),
-            status=data.get("status", 0),
-            category_id=data.get("categoryId", 1),
+            g("uid", ""),
+            str(g("uin", "")),
+            g("nick", ""),
+            g("remark"),
+            g("avatarUrl"),
+            g("isOnline", False),
+            g("status", 0),
+            g("categoryId", 1),
         )
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class UserInfo:
     """用户详细信息"""
     uid: str
@@ -178,22 +232,23 @@ class UserInfo:
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "UserInfo":
+        g = data.get
         return cls(
-            uid=data.get("uid", ""),
-            uin=str(data.get("uin", "")),
-            nick=data.get("nick", ""),
-            avatar_url=data.get("avatarUrl"),
-            long_nick=data.get("longNick"),
-            sex=data.get("sex"),
-            age=data.get("age"),
-            qq_level=data.get("qqLevel"),
-            vip_flag=data.get("vipFlag", False),
-            svip_flag=data.get("svipFlag", False),
-            vip_level=data.get("vipLevel", 0),
+            g("uid", ""),
+            str(g("uin", "")),
+            g("nick", ""),
+            g("avatarUrl"),
+            g("longNick"),
+            g("sex"),
+            g("age"),
+            g("qqLevel"),
+            g("vipFlag", False),
+            g("svipFlag", False),
+            g("vipLevel", 0),
         )
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class MessageElement:
     """消息元素"""
     type: str
@@ -201,9 +256,16 @@ class MessageElement:
     raw_data: Optional[Dict[str, Any]] = None
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class Message:
-    """消息"""
+    """消息
+
+    raw_data 默认不保留：批量拉取时原始字典会让整页解析结果一直驻留内存。
+    需要时设置 Message.KEEP_RAW = True，之后解析的消息会保存原始字典。
+    """
+    # 是否在 raw_data 中保留服务端返回的原始字典
+    KEEP_RAW: ClassVar[bool] = False
+
     msg_id: str
     msg_seq: str
     msg_time: int
@@ -216,34 +278,39 @@ class Message:
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "Message":
-        elements = []
-        for elem in data.get("elements", []):
-            elements.append(MessageElement(
-                type=elem.get("elementType", "unknown"),
-                content=elem,
-                raw_data=elem,
-            ))
+        # 批量解析时每条消息都会调用，绑定为局部变量并按位置传参
+        element = MessageElement
+        get = dict.get
+        g = data.get
+        elements = [
+            element(_intern(get(elem, "elementType", "unknown")), elem, elem)
+            for elem in g("elements", ())
+        ]
 
         return cls(
-            msg_id=data.get("msgId", ""),
-            msg_seq=data.get("msgSeq", ""),
-            msg_time=int(data.get("msgTime", 0)),
-            sender_uid=data.get("senderUid", ""),
-            sender_uin=data.get("senderUin"),
-            sender_name=data.get("sendNickName"),
-            sender_member_name=data.get("sendMemberName"),
-            elements=elements,
-            raw_data=data,
+            g("msgId", ""),
+            g("msgSeq", ""),
+            int(g("msgTime", 0)),
+            _intern(g("senderUid", "")),
+            g("senderUin"),
+            g("sendNickName"),
+            g("sendMemberName"),
+            elements,
+            data if cls.KEEP_RAW else None,
         )
 
 
-@dataclass
+@dataclass(frozen=True, **_SLOTS)
 class Peer:
-    """聊天对象"""
-    chat_type: int
+    """聊天对象（不可变，可作为字典键或放入集合）"""
+    chat_type: int  # 也可传入 ChatType，构造时转换为整数
     peer_uid: str
     guild_id: Optional[str] = None
 
+    def __post_init__(self):
+        if isinstance(self.chat_type, ChatType):
+            object.__setattr__(self, "chat_type", self.chat_type.value)
+
     def to_dict(self) -> Dict[str, Any]:
         result = {
             "chatType": self.chat_type,
@@ -254,7 +321,7 @@ class Peer:
         return result
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class ExportTask:
     """导出任务"""
     id: str
@@ -281,11 +348,7 @@ class ExportTask:
             peer_uid=peer_data.get("peerUid", ""),
         )
 
-        status_str = data.get("status", "pending")
-        try:
-            status = TaskStatus(status_str)
-        except ValueError:
-            status = TaskStatus.PENDING
+        status = _parse_enum(TaskStatus, data.get("status", "pending"), TaskStatus.PENDING)
 
         # 尝试多个可能的字段名
         task_id = data.get("id") or data.get("taskId") or data.get("task_id") or ""
@@ -296,7 +359,7 @@ class ExportTask:
             session_name=data.get("sessionName", ""),
             status=status,
             progress=data.get("progress", 0),
-            format=data.get("format", "JSON"),
+            format=_intern(data.get("format", "JSON")),
             message_count=data.get("messageCount", 0),
             file_name=data.get("fileName"),
             file_path=data.get("filePath"),
@@ -309,7 +372,7 @@ class ExportTask:
         )
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class ScheduledExport:
     """定时导出任务"""
     id: str
@@ -324,6 +387,8 @@ class ScheduledExport:
     next_run: Optional[str] = None
     last_run: Optional[str] = None
     options: Dict[str, Any] = field(default_factory=dict)
+    # 最近的执行历史，仅在 get_all(include_history=N) 时填充
+    history: List[Dict[str, Any]] = field(default_factory=list)
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "ScheduledExport":
@@ -333,15 +398,12 @@ class ScheduledExport:
             peer_uid=peer_data.get("peerUid", ""),
         )
 
-        try:
-            schedule_type = ScheduleType(data.get("scheduleType", "daily"))
-        except ValueError:
-            schedule_type = ScheduleType.DAILY
-
-        try:
-            time_range_type = TimeRangeType(data.get("timeRangeType", "yesterday"))
-        except ValueError:
-            time_range_type = TimeRangeType.YESTERDAY
+        schedule_type = _parse_enum(
+            ScheduleType, data.get("scheduleType", "daily"), ScheduleType.DAILY,
+        )
+        time_range_type = _parse_enum(
+            TimeRangeType, data.get("timeRangeType", "yesterday"), TimeRangeType.YESTERDAY,
+        )
 
         return cls(
             id=data.get("id", ""),
@@ -356,10 +418,11 @@ class ScheduledExport:
             next_run=data.get("nextRun"),
             last_run=data.get("lastRun"),
             options=data.get("options", {}),
+            history=data.get("history", []),
         )
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class StickerPack:
     """表情包"""
     pack_id: str
@@ -371,10 +434,9 @@ class StickerPack:
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "StickerPack":
-        try:
-            pack_type = StickerPackType(data.get("packType", "favorite_emoji"))
-        except ValueError:
-            pack_type = StickerPackType.FAVORITE_EMOJI
+        pack_type = _parse_enum(
+            StickerPackType, data.get("packType", "favorite_emoji"), StickerPackType.FAVORITE_EMOJI,
+        )
 
         return cls(
             pack_id=data.get("packId", ""),
@@ -386,7 +448,7 @@ class StickerPack:
         )
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class ExportFile:
     """导出文件"""
     file_name: str
@@ -404,23 +466,24 @@ class ExportFile:
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "ExportFile":
+        g = data.get
         return cls(
-            file_name=data.get("fileName", ""),
-            file_path=data.get("filePath", ""),
-            relative_path=data.get("relativePath", ""),
-            size=data.get("size", 0),
-            create_time=data.get("createTime", ""),
-            modify_time=data.get("modifyTime", ""),
-            chat_type=data.get("chatType", ""),
-            chat_id=data.get("chatId", ""),
-            display_name=data.get("displayName"),
-            message_count=data.get("messageCount"),
-            format=data.get("format", "HTML"),
-            is_scheduled=data.get("isScheduled", False),
+            g("fileName", ""),
+            g("filePath", ""),
+            g("relativePath", ""),
+            g("size", 0),
+            g("createTime", ""),
+            g("modifyTime", ""),
+            _intern(g("chatType", "")),
+            g("chatId", ""),
+            g("displayName"),
+            g("messageCount"),
+            _intern(g("format", "HTML")),
+            g("isScheduled", False),
         )
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class SystemInfo:
     """系统信息"""
     version: str
@@ -456,7 +519,7 @@ class SystemInfo:
 # 配置类型
 # ============================================================================
 
-@dataclass
+@dataclass(**_SLOTS)
 class MessageFilter:
     """消息筛选条件
 
@@ -492,29 +555,17 @@ class MessageFilter:
     @classmethod
     def last_days(cls, days: int, **kwargs) -> "MessageFilter":
         """创建最近N天的筛选器"""
-        from datetime import timedelta
-        end = datetime.now()
-        start = end - timedelta(days=days)
-        return cls(
-            start_time=int(start.timestamp() * 1000),
-            end_time=int(end.timestamp() * 1000),
-            **kwargs
-        )
+        end = ms_now()
+        return cls(start_time=end - int(days * _MS_PER_DAY), end_time=end, **kwargs)
 
     @classmethod
     def last_hours(cls, hours: int, **kwargs) -> "MessageFilter":
         """创建最近N小时的筛选器"""
-        from datetime import timedelta
-        end = datetime.now()
-        start = end - timedelta(hours=hours)
-        return cls(
-            start_time=int(start.timestamp() * 1000),
-            end_time=int(end.timestamp() * 1000),
-            **kwargs
-        )
+        end = ms_now()
+        return cls(start_time=end - int(hours * _MS_PER_HOUR), end_time=end, **kwargs)
 
     def to_dict(self) -> Dict[str, Any]:
-        result = {}
+        result: Dict[str, Any] = {}
         if self.start_time is not None:
             result["startTime"] = self.start_time
         if self.end_time is not None:
@@ -529,10 +580,11 @@ class MessageFilter:
         return result
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class ExportOptions:
     """导出选项"""
     batch_size: int = 5000
+    # 包含图片、语音等资源链接；只需要文字内容时关闭可省去服务端的资源处理
     include_resource_links: bool = True
     include_system_messages: bool = True
     filter_pure_image_messages: bool = False
@@ -541,7 +593,7 @@ class ExportOptions:
     output_dir: Optional[str] = None  # 输出目录
 
     def to_dict(self) -> Dict[str, Any]:
-        result = {
+        result: Dict[str, Any] = {
             "batchSize": self.batch_size,
             "includeResourceLinks": self.include_resource_links,
             "includeSystemMessages": self.include_system_messages,
@@ -553,8 +605,21 @@ class ExportOptions:
             result["outputDir"] = self.output_dir
         return result
 
+    @classmethod
+    def text_only(cls, **kwargs) -> "ExportOptions":
+        """创建纯文字导出选项（过滤纯图片消息，不处理资源）"""
+        kwargs.setdefault("filter_pure_image_messages", True)
+        kwargs.setdefault("include_resource_links", False)
+        return cls(**kwargs)
+
+    @classmethod
+    def compact(cls, **kwargs) -> "ExportOptions":
+        """创建紧凑输出选项（JSON 不缩进，服务端序列化更快、文件更小）"""
+        kwargs.setdefault("pretty_format", False)
+        return cls(**kwargs)
+
 
-@dataclass
+@dataclass(**_SLOTS)
 class ScheduledExportConfig:
     """定时导出配置"""
     name: str
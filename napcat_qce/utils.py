@@ -0,0 +1,401 @@
+"""
+NapCat-QCE 工具函数
+==================
+
+SDK 内部使用的通用工具。
+"""
+
+import asyncio
+import errno
+import functools
+import json
+import os
+import shutil
+import sys
+import threading
+import time
+from concurrent.futures import Future
+from typing import Optional, Callable, Any, Dict, List, Sequence, TextIO, TypeVar, Union, overload
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+
+# 已安装 orjson 时用其编解码 JSON，否则使用标准库；json_loads 接受 str 或 bytes
+# json_dumps 的 indent=True 输出两空格缩进的可读格式（用于配置文件）
+if HAS_ORJSON:
+    def json_loads(data: Union[str, bytes]) -> Any:
+        """解析 JSON（orjson）"""
+        return orjson.loads(data)
+
+    def json_dumps(obj: Any, indent: bool = False) -> bytes:
+        """序列化为 UTF-8 JSON（orjson，允许非字符串键）"""
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, option=option)
+else:
+    def json_loads(data: Union[str, bytes]) -> Any:
+        """解析 JSON（标准库）"""
+        return json.loads(data)
+
+    def json_dumps(obj: Any, indent: bool = False) -> bytes:
+        """序列化为 UTF-8 JSON（标准库）"""
+        if indent:
+            return json.dumps(obj, ensure_ascii=False, indent=2).encode("utf-8")
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def cached_with_inflight(ttl: float = 30, bypass: Optional[str] = None):
+    """
+    为 API 方法添加短时缓存，并合并并发的相同请求
+
+    TTL 内的重复调用直接返回缓存结果；多个线程同时发起相同调用时，
+    只有第一个线程真正发送请求，其余线程等待并共享同一结果。
+    缓存按实例保存，不同客户端之间互不影响。
+    实例带有 cache_ttl 属性时以其为准；可通过 方法.invalidate(实例) 清空缓存。
+    列表结果每次返回浅拷贝，列表中的对象仍与缓存共享，调用方不应修改。
+
+    Args:
+        ttl: 默认缓存有效期（秒）
+        bypass: 关键字参数名，调用时该参数为真则跳过缓存并刷新缓存结果
+
+    Example:
+        >>> class GroupsAPI(BaseAPI):
+        ...     @cached_with_inflight(ttl=30, bypass="force_refresh")
+        ...     def get_all(self, force_refresh=False): ...
+    """
+    def decorator(func: Callable) -> Callable:
+        lock = threading.Lock()
+        attr = f"_cache_{func.__name__}"
+
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            refresh = bool(bypass and kwargs.get(bypass))
+            key_kwargs = {k: v for k, v in kwargs.items() if k != bypass}
+            key = (args, tuple(sorted(key_kwargs.items())))
+
+            with lock:
+                state = self.__dict__.get(attr)
+                if state is None:
+                    state = self.__dict__[attr] = ({}, {})
+                results, inflight = state
+
+                if not refresh:
+                    hit = results.get(key)
+                    if hit is not None and hit[1] > time.monotonic():
+                        return _copy_result(hit[0])
+
+                future = None if refresh else inflight.get(key)
+                owner = future is None
+                if owner:
+                    future = Future()
+                    inflight[key] = future
+
+            if not owner:
+                return _copy_result(future.result())
+
+            try:
+                value = func(self, *args, **kwargs)
+            except BaseException as e:
+                with lock:
+                    if inflight.get(key) is future:
+                        del inflight[key]
+                future.set_exception(e)
+                raise
+
+            with lock:
+                results[key] = (value, time.monotonic() + getattr(self, "cache_ttl", ttl))
+                if inflight.get(key) is future:
+                    del inflight[key]
+            future.set_result(value)
+            return _copy_result(value)
+
+        def invalidate(instance):
+            """清空实例上该方法的缓存结果"""
+            with lock:
+                state = instance.__dict__.get(attr)
+                if state is not None:
+                    state[0].clear()
+
+        setattr(wrapper, "invalidate", invalidate)
+        return wrapper
+
+    return decorator
+
+
+T = TypeVar("T")
+
+_MISSING = object()
+
+
+class LazyList(Sequence[T]):
+    """
+    按需转换的只读列表
+
+    保存原始数据，首次访问某一项时才调用 factory 转换并缓存结果；
+    只查看长度或前几项时，其余项不会被转换。切片返回普通列表。
+
+    Args:
+        raw: 原始数据列表
+        factory: 将单项原始数据转换为对象的函数
+
+    Example:
+        >>> tasks = LazyList(raw_tasks, ExportTask.from_dict)
+        >>> len(tasks)  # 不转换任何一项
+        >>> tasks[0]    # 只转换第一项
+    """
+
+    __slots__ = ("_raw", "_factory", "_items")
+
+    def __init__(self, raw: List[Any], factory: Callable[[Any], T]):
+        self._raw = raw
+        self._factory = factory
+        self._items: List[Any] = [_MISSING] * len(raw)
+
+    def __len__(self) -> int:
+        return len(self._raw)
+
+    @overload
+    def __getitem__(self, index: int) -> T: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> List[T]: ...
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self._raw)))]
+        item = self._items[index]
+        if item is _MISSING:
+            item = self._items[index] = self._factory(self._raw[index])
+        return item
+
+    def __iter__(self):
+        for i in range(len(self._raw)):
+            yield self[i]
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, (LazyList, list)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"LazyList({list(self)!r})"
+
+
+def fast_move(src: str, dst: str) -> str:
+    """
+    移动文件，同一文件系统内只做重命名
+
+    跨文件系统时复制后删除源文件；shutil 会使用系统的快速复制接口
+    （Linux sendfile、macOS fcopyfile、Windows CopyFile），不经过 Python 缓冲区。
+    只复制文件内容，不复制权限和时间戳。
+
+    Args:
+        src: 源路径
+        dst: 目标路径（已存在时覆盖）
+
+    Returns:
+        目标路径
+    """
+    try:
+        os.replace(src, dst)
+    except OSError as e:
+        if e.errno != errno.EXDEV:
+            raise
+        shutil.copyfile(src, dst)
+        os.remove(src)
+    return dst
+
+
+def ms_now() -> int:
+    """当前 Unix 时间戳（毫秒），只用整数运算"""
+    return time.time_ns() // 1_000_000
+
+
+def _copy_result(value: Any) -> Any:
+    """
+    返回列表结果的浅拷贝，避免调用方增删元素影响缓存
+
+    只复制列表本身，元素对象仍与缓存共享，调用方不应修改。
+    """
+    if isinstance(value, list):
+        return list(value)
+    return value
+
+
+class RateLimiter:
+    """
+    令牌桶限流器，限制每分钟的请求数
+
+    桶容量为 rpm，按 rpm/60 每秒的速度补充令牌；令牌不足时等待到下一个令牌可用。
+    等待时间在锁内预留（令牌数可为负），锁外睡眠，多线程并发调用时按到达顺序依次放行。
+
+    Args:
+        rpm: 每分钟允许的请求数
+
+    Example:
+        >>> limiter = RateLimiter(rpm=600)
+        >>> limiter.acquire()  # 同步调用
+        >>> await limiter.acquire_async()  # 协程中调用
+    """
+
+    def __init__(self, rpm: float):
+        if rpm <= 0:
+            raise ValueError("rpm 必须大于 0")
+        self.rpm = rpm
+        self.request_tokens = float(rpm)
+        self.last_update = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self) -> float:
+        """取出一个令牌，返回调用方需要等待的秒数"""
+        with self._lock:
+            now = time.monotonic()
+            elapsed = now - self.last_update
+            self.last_update = now
+            self.request_tokens = min(self.rpm, self.request_tokens + elapsed * self.rpm / 60)
+            wait_time = max(0.0, (1 - self.request_tokens) * 60 / self.rpm)
+            self.request_tokens -= 1
+            return wait_time
+
+    def acquire(self):
+        """等待直到可以发送一个请求"""
+        wait_time = self._reserve()
+        if wait_time > 0:
+            time.sleep(wait_time)
+
+    async def acquire_async(self):
+        """acquire 的协程版本，等待期间不阻塞事件循环"""
+        wait_time = self._reserve()
+        if wait_time > 0:
+            await asyncio.sleep(wait_time)
+
+
+class ProgressPrinter:
+    """
+    合并多个任务的进度更新，以固定频率刷新到终端
+
+    update() 只记录最新状态，由后台定时器最多每 interval 秒输出一次汇总行，
+    多个任务同时回调时不会争抢输出。输出不是终端（如 CI 日志）时不刷新进度行，
+    只在每个任务完成时打印一行。
+
+    Args:
+        interval: 刷新间隔（秒），默认 0.1（10 Hz）
+        stream: 输出流，默认 sys.stdout
+
+    Example:
+        >>> printer = ProgressPrinter()
+        >>> client.tasks.wait_for_completion(task.id, on_progress=printer.track)
+        >>> printer.finish()
+    """
+
+    def __init__(self, interval: float = 0.1, stream: Optional[TextIO] = None):
+        self.interval = interval
+        self.stream = stream if stream is not None else sys.stdout
+        isatty = getattr(self.stream, "isatty", None)
+        self._tty = bool(isatty and isatty())
+        self._lock = threading.Lock()
+        self._states: Dict[str, Dict[str, Any]] = {}
+        self._timer: Optional[threading.Timer] = None
+        self._last_line = ""
+
+    def update(self, task_id: str, progress: int, message_count: int = 0,
+               label: Optional[str] = None):
+        """
+        记录任务的最新进度
+
+        Args:
+            task_id: 任务 ID
+            progress: 进度百分比
+            message_count: 已处理消息数
+            label: 显示名称，默认使用任务 ID 的前 8 位
+        """
+        with self._lock:
+            state = self._states.get(task_id)
+            if state is None:
+                state = self._states[task_id] = {"done": False, "progress": None}
+                label = label or task_id[:8]
+            if label and label != state.get("label"):
+                state["label"] = label
+                state["short"] = label[:8]
+                state["segment"] = None
+            if progress != state["progress"]:
+                state["progress"] = progress
+                state["segment"] = None
+            state["message_count"] = message_count
+
+            if not self._tty:
+                if progress >= 100 and not state["done"]:
+                    state["done"] = True
+                    self.stream.write(f"{state['label']}: 100% ({message_count} 条)\n")
+                    self.stream.flush()
+                return
+
+            if self._timer is None:
+                self._timer = threading.Timer(self.interval, self._flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def track(self, task: Any, label: Optional[str] = None):
+        """
+        以 ExportTask 更新进度，可直接作为 wait_for_completion 的 on_progress
+
+        Args:
+            task: 导出任务
+            label: 显示名称，默认使用会话名称
+        """
+        self.update(task.id, task.progress, task.message_count,
+                    label or getattr(task, "session_name", None))
+
+    def finish(self):
+        """立即输出最终进度并换行，之后可继续复用"""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if self._tty and self._states:
+                self.stream.write(self._render_line() + "\n")
+                self.stream.flush()
+            self._states.clear()
+            self._last_line = ""
+
+    def _flush(self):
+        with self._lock:
+            self._timer = None
+            if self._states:
+                text = self._render_line()
+                # 内容与上次相同时不写入，省去一次系统调用
+                if text:
+                    self.stream.write(text)
+                    self.stream.flush()
+
+    def _render_line(self) -> str:
+        """生成覆盖当前行的输出；内容与上次相同时返回空字符串"""
+        if len(self._states) == 1:
+            state = next(iter(self._states.values()))
+            line = f"{state['label']}: {state['progress']}% ({state['message_count']} 条)"
+        else:
+            # 多任务汇总行按任务缓存片段，只重新格式化进度有变化的任务
+            parts = []
+            for s in self._states.values():
+                segment = s["segment"]
+                if segment is None:
+                    segment = s["segment"] = f"[{s['short']}:{s['progress']}%]"
+                parts.append(segment)
+            line = " ".join(parts)
+        if line == self._last_line:
+            return ""
+        # 用空格覆盖上一次更长的输出
+        padding = max(0, len(self._last_line) - len(line))
+        self._last_line = line
+        return "\r" + line + " " * padding
+
+    def __enter__(self) -> "ProgressPrinter":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.finish()
@@ -5,12 +5,14 @@ NapCat-QCE WebSocket 客户端
 提供实时事件监听和流式搜索功能。
 """
 
-import json
 import threading
 import time
-from typing import Optional, Dict, Any, Callable, List
+import uuid
+from typing import Optional, Dict, Any, Callable, Set, Tuple, TypeVar, Union, overload
 from enum import Enum
 
+from .utils import json_dumps, json_loads
+
 try:
     import websocket
     HAS_WEBSOCKET = True
@@ -18,6 +20,10 @@ except ImportError:
     HAS_WEBSOCKET = False
 
 
+# 事件处理函数类型，on() 作为装饰器使用时原样返回
+F = TypeVar("F", bound=Callable[[Dict[str, Any]], None])
+
+
 class WebSocketEventType(Enum):
     """WebSocket 事件类型"""
     CONNECTED = "connected"
@@ -48,6 +54,13 @@ class WebSocketClient:
         >>> ws_client.disconnect()
     """
 
+    # 长期存在、消息回调中频繁读取属性，使用 __slots__
+    __slots__ = (
+        "host", "port", "token", "auto_reconnect", "reconnect_interval", "ws_url",
+        "_ws", "_thread", "_connected", "_should_reconnect", "_attempt_done",
+        "_handlers", "_raw_events",
+    )
+
     def __init__(
         self,
         host: str = "localhost",
@@ -82,14 +95,62 @@ class WebSocketClient:
         self._thread: Optional[threading.Thread] = None
         self._connected = False
         self._should_reconnect = True
+        # 连接尝试有结果（成功或失败）时置位，供 connect 等待
+        self._attempt_done = threading.Event()
+
+        # 事件处理器；每个事件保存不可变的元组，注册/移除时整体替换，
+        # 分发时无需加锁或复制即可安全遍历
+        self._handlers: Dict[str, Tuple[Callable[[Dict[str, Any]], None], ...]] = {}
+        # 需要在事件数据中附带原始消息（_raw）的事件类型，见 on_raw
+        self._raw_events: Set[str] = set()
 
-        # 事件处理器
-        self._handlers: Dict[str, List[Callable[[Dict[str, Any]], None]]] = {}
+    @overload
+    def on(
+        self,
+        event_type: str,
+        handler: Callable[[Dict[str, Any]], None],
+    ) -> "WebSocketClient": ...
 
-    def on(self, event_type: str, handler: Callable[[Dict[str, Any]], None]) -> "WebSocketClient":
+    @overload
+    def on(self, event_type: str, handler: None = None) -> Callable[[F], F]: ...
+
+    def on(
+        self,
+        event_type: str,
+        handler: Optional[Callable[[Dict[str, Any]], None]] = None,
+    ) -> Union["WebSocketClient", Callable[[F], F]]:
         """
         注册事件处理器
 
+        也可以作为装饰器使用: @ws.on("export_progress")
+
+        Args:
+            event_type: 事件类型
+            handler: 处理函数（省略时返回装饰器）
+
+        Returns:
+            self（支持链式调用）；作为装饰器时返回原函数
+        """
+        if handler is None:
+            def decorator(func: F) -> F:
+                self.on(event_type, func)
+                return func
+            return decorator
+
+        self._handlers[event_type] = self._handlers.get(event_type, ()) + (handler,)
+        return self
+
+    def on_raw(
+        self,
+        event_type: str,
+        handler: Callable[[Dict[str, Any]], None],
+    ) -> "WebSocketClient":
+        """
+        注册事件处理器，事件数据中附带完整的原始消息
+
+        该事件的所有处理器收到的数据都会包含 "_raw" 键（服务端发送的完整消息）；
+        通过 on() 注册的事件默认不附带，避免每条消息都保留整个消息对象。
+
         Args:
             event_type: 事件类型
             handler: 处理函数
@@ -97,10 +158,8 @@ class WebSocketClient:
         Returns:
             self（支持链式调用）
         """
-        if event_type not in self._handlers:
-            self._handlers[event_type] = []
-        self._handlers[event_type].append(handler)
-        return self
+        self._raw_events.add(event_type)
+        return self.on(event_type, handler)
 
     def off(self, event_type: str, handler: Optional[Callable] = None) -> "WebSocketClient":
         """
@@ -115,11 +174,12 @@ class WebSocketClient:
         """
         if event_type in self._handlers:
             if handler is None:
-                self._handlers[event_type] = []
+                self._handlers[event_type] = ()
+                self._raw_events.discard(event_type)
             else:
-                self._handlers[event_type] = [
+                self._handlers[event_type] = tuple(
                     h for h in self._handlers[event_type] if h != handler
-                ]
+                )
         return self
 
     def on_export_progress(self, handler: Callable[[Dict[str, Any]], None]) -> "WebSocketClient":
@@ -142,37 +202,49 @@ class WebSocketClient:
         """注册断开连接处理器"""
         return self.on("disconnected", handler)
 
-    def _emit(self, event_type: str, data: Dict[str, Any]):
-        """触发事件"""
-        handlers = self._handlers.get(event_type, [])
+    def _emit(
+        self,
+        event_type: str,
+        data: Dict[str, Any],
+        handlers: Optional[Tuple[Callable[[Dict[str, Any]], None], ...]] = None,
+    ):
+        """触发事件；调用方已取得处理器元组时可直接传入，省去再次查找"""
+        if handlers is None:
+            handlers = self._handlers.get(event_type, ())
         for handler in handlers:
             try:
                 handler(data)
             except Exception as e:
                 print(f"[WebSocket] 事件处理器错误 ({event_type}): {e}")
 
-    def _on_message(self, ws, message: str):
+    def _on_message(self, ws, message: Union[str, bytes]):
         """处理收到的消息"""
         try:
-            data = json.loads(message)
+            data = json_loads(message)
             event_type = data.get("type", "unknown")
+            handlers = self._handlers.get(event_type)
+            if not handlers:
+                return
             event_data = data.get("data", {})
 
-            # 添加原始消息
-            event_data["_raw"] = data
+            # 仅在通过 on_raw 请求时附带原始消息
+            if event_type in self._raw_events:
+                event_data["_raw"] = data
 
-            self._emit(event_type, event_data)
-        except json.JSONDecodeError as e:
+            self._emit(event_type, event_data, handlers)
+        except ValueError as e:
             print(f"[WebSocket] 消息解析失败: {e}")
 
     def _on_error(self, ws, error):
         """处理错误"""
+        self._attempt_done.set()
         print(f"[WebSocket] 错误: {error}")
         self._emit("error", {"error": str(error)})
 
     def _on_close(self, ws, close_status_code, close_msg):
         """处理连接关闭"""
         self._connected = False
+        self._attempt_done.set()
         self._emit("disconnected", {
             "status_code": close_status_code,
             "message": close_msg,
@@ -188,6 +260,7 @@ class WebSocketClient:
     def _on_open(self, ws):
         """处理连接打开"""
         self._connected = True
+        self._attempt_done.set()
         print(f"[WebSocket] 已连接到 {self.ws_url}")
 
     def _connect_internal(self):
@@ -199,24 +272,32 @@ class WebSocketClient:
             on_close=self._on_close,
             on_open=self._on_open,
         )
-        self._ws.run_forever()
+        # 跳过库内的 UTF-8 校验和解码，文本帧以原始字节交给 _on_message，
+        # 由 json_loads 直接解析字节（非法编码同样会解析失败）
+        self._ws.run_forever(skip_utf8_validation=True)
 
-    def connect(self, blocking: bool = False):
+    def connect(self, blocking: bool = False, timeout: float = 5.0) -> bool:
         """
         连接到 WebSocket 服务器
 
         Args:
             blocking: 是否阻塞当前线程
+            timeout: 非阻塞模式下等待连接结果的最长时间（秒），
+                连接成功或失败时立即返回
+
+        Returns:
+            是否已连接
         """
         self._should_reconnect = True
+        self._attempt_done.clear()
 
         if blocking:
             self._connect_internal()
         else:
             self._thread = threading.Thread(target=self._connect_internal, daemon=True)
             self._thread.start()
-            # 等待连接建立
-            time.sleep(0.5)
+            self._attempt_done.wait(timeout)
+        return self._connected
 
     def disconnect(self):
         """断开连接"""
@@ -234,7 +315,8 @@ class WebSocketClient:
             message: 消息内容
         """
         if self._ws and self._connected:
-            self._ws.send(json.dumps(message))
+            # json_dumps 返回 UTF-8 字节，按文本帧原样发送，无需再解码为 str
+            self._ws.send(json_dumps(message))
         else:
             raise RuntimeError("WebSocket 未连接")
 
@@ -259,10 +341,15 @@ class WebSocketClient:
         Returns:
             搜索 ID
         """
-        import uuid
         search_id = str(uuid.uuid4())
 
-        message = {
+        search_filter = {}
+        if start_time is not None:
+            search_filter["startTime"] = start_time
+        if end_time is not None:
+            search_filter["endTime"] = end_time
+
+        self.send({
             "type": "start_stream_search",
             "data": {
                 "searchId": search_id,
@@ -271,16 +358,9 @@ class WebSocketClient:
                     "peerUid": peer_uid,
                 },
                 "searchQuery": query,
-                "filter": {},
+                "filter": search_filter,
             },
-        }
-
-        if start_time is not None:
-            message["data"]["filter"]["startTime"] = start_time
-        if end_time is not None:
-            message["data"]["filter"]["endTime"] = end_time
-
-        self.send(message)
+        })
         return search_id
 
     def cancel_search(self, search_id: str):
@@ -323,11 +403,15 @@ class ExportProgressMonitor:
         >>> monitor.stop()
     """
 
+    __slots__ = ("_ws_client", "_tasks", "_task_events", "_progress_callbacks")
+
     def __init__(self, host: str = "localhost", port: int = 40653):
         self._ws_client = WebSocketClient(host=host, port=port, auto_reconnect=True)
+        # 以下字典只做单键读写（GIL 下为原子操作），状态以新字典整体替换发布，
+        # 推送线程和等待线程之间无需加锁
         self._tasks: Dict[str, Dict[str, Any]] = {}
         self._task_events: Dict[str, threading.Event] = {}
-        self._lock = threading.Lock()
+        self._progress_callbacks: Dict[str, Callable[[Dict[str, Any]], None]] = {}
 
         # 注册处理器
         self._ws_client.on_export_progress(self._handle_progress)
@@ -337,40 +421,44 @@ class ExportProgressMonitor:
     def _handle_progress(self, data: Dict[str, Any]):
         task_id = data.get("taskId")
         if task_id:
-            with self._lock:
-                self._tasks[task_id] = {
-                    "status": "running",
-                    "progress": data.get("progress", 0),
-                    "message": data.get("message", ""),
-                    "message_count": data.get("messageCount", 0),
-                }
+            status = self._tasks[task_id] = {
+                "status": "running",
+                "progress": data.get("progress", 0),
+                "message": data.get("message", ""),
+                "message_count": data.get("messageCount", 0),
+            }
+            callback = self._progress_callbacks.get(task_id)
+            if callback:
+                callback(dict(status))
+
+    def _finish(self, task_id: str, status: Dict[str, Any]):
+        """发布任务的最终状态并唤醒等待方"""
+        # 先发布状态再查找事件；wait_for_task 先登记事件再检查状态，两边至少有一方能看到对方
+        self._tasks[task_id] = status
+        event = self._task_events.get(task_id)
+        if event:
+            event.set()
 
     def _handle_complete(self, data: Dict[str, Any]):
         task_id = data.get("taskId")
         if task_id:
-            with self._lock:
-                self._tasks[task_id] = {
-                    "status": "completed",
-                    "progress": 100,
-                    "message": "导出完成",
-                    "message_count": data.get("messageCount", 0),
-                    "file_name": data.get("fileName"),
-                    "file_path": data.get("filePath"),
-                    "download_url": data.get("downloadUrl"),
-                }
-                if task_id in self._task_events:
-                    self._task_events[task_id].set()
+            self._finish(task_id, {
+                "status": "completed",
+                "progress": 100,
+                "message": "导出完成",
+                "message_count": data.get("messageCount", 0),
+                "file_name": data.get("fileName"),
+                "file_path": data.get("filePath"),
+                "download_url": data.get("downloadUrl"),
+            })
 
     def _handle_error(self, data: Dict[str, Any]):
         task_id = data.get("taskId")
         if task_id:
-            with self._lock:
-                self._tasks[task_id] = {
-                    "status": "failed",
-                    "error": data.get("error", "未知错误"),
-                }
-                if task_id in self._task_events:
-                    self._task_events[task_id].set()
+            self._finish(task_id, {
+                "status": "failed",
+                "error": data.get("error", "未知错误"),
+            })
 
     def start(self):
         """启动监控"""
@@ -382,8 +470,7 @@ class ExportProgressMonitor:
 
     def get_task_status(self, task_id: str) -> Optional[Dict[str, Any]]:
         """获取任务状态"""
-        with self._lock:
-            return self._tasks.get(task_id)
+        return self._tasks.get(task_id)
 
     def wait_for_task(
         self,
@@ -406,28 +493,22 @@ class ExportProgressMonitor:
             TimeoutError: 超时
         """
         event = threading.Event()
-        with self._lock:
-            self._task_events[task_id] = event
-
-        # 进度轮询
+        # 进度回调由推送事件直接触发，无需轮询
         if on_progress:
-            def poll_progress():
-                while not event.is_set():
-                    status = self.get_task_status(task_id)
-                    if status:
-                        on_progress(status)
-                    time.sleep(1)
-
-            poll_thread = threading.Thread(target=poll_progress, daemon=True)
-            poll_thread.start()
-
-        # 等待完成
-        if not event.wait(timeout):
-            raise TimeoutError(f"等待任务 {task_id} 超时")
-
-        with self._lock:
-            del self._task_events[task_id]
-            return self._tasks.get(task_id, {"status": "unknown"})
+            self._progress_callbacks[task_id] = on_progress
+        self._task_events[task_id] = event
+        # 任务可能在调用前已结束
+        if self._tasks.get(task_id, {}).get("status") in ("completed", "failed"):
+            event.set()
+
+        try:
+            if not event.wait(timeout):
+                raise TimeoutError(f"等待任务 {task_id} 超时")
+        finally:
+            self._task_events.pop(task_id, None)
+            self._progress_callbacks.pop(task_id, None)
+
+        return self._tasks.get(task_id, {"status": "unknown"})
 
     def __enter__(self) -> "ExportProgressMonitor":
         self.start()
@@ -38,6 +38,8 @@ setup(
     extras_require={
         "websocket": ["websocket-client>=1.0.0"],
         "async": ["aiohttp>=3.8.0", "websockets>=10.0"],
+        "fast": ["orjson>=3.6.0"],
+        "stream": ["ijson>=3.1.0"],
         "dev": [
             "pytest>=7.0.0",
             "pytest-asyncio>=0.20.0",